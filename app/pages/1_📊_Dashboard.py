@@ -2,8 +2,15 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from pathlib import Path
 from src.analytics.anomaly_detection import AnomalyDetector
+from src.analytics.cascade_engine import CascadeEngine
+from src.analytics.change_points import ChangePointDetector
+from src.analytics.model_registry import ModelRegistry
+from src.memo import compute_cache, memoized
+from src.visualizations.fitness_viz import fitness_scatter_chart
 from src.visualizations.network_graph import ServiceDependencyGraph
+from src.visualizations.timeline import health_timeline_chart, latency_chart
 
 st.set_page_config(page_title="Dashboard", layout="wide")
 st.header("📊 Experiment Dashboard")
@@ -15,6 +22,11 @@ if "exp" not in st.session_state:
 exp = st.session_state["exp"]
 analysis = st.session_state.get("analysis", {})
 
+# Analytics and figures below are memoized on the experiment fingerprint, so widget
+# interactions and page switches re-render without recomputing them. The cache
+# panel is filled in at the end, once this run's lookups are counted.
+cache_panel = st.sidebar.empty()
+
 # ===== EXPERIMENT METADATA =====
 st.subheader("Experiment Overview")
 col1, col2, col3 = st.columns(3)
@@ -24,7 +36,7 @@ with col1:
 with col2:
     st.metric("Total Scenarios", len(exp.scenarios))
 with col3:
-    generations = len(set(f.generation for f in exp.fitness))
+    generations = exp.fitness_frame()["generation"].nunique() if exp.fitness else 0
     st.metric("Generations", generations)
 
 st.divider()
@@ -32,39 +44,35 @@ st.divider()
 # ===== FITNESS VISUALIZATION =====
 st.subheader("🎯 Fitness Score Evolution")
 
-if exp.fitness:
-    df_fitness = pd.DataFrame([
-        {
-            "Generation": f.generation,
-            "Scenario": f.scenario_id,
-            "Fitness": f.fitness_score
-        }
-        for f in exp.fitness
-    ])
-    
-    # Interactive scatter plot
-    fig = px.scatter(
-        df_fitness,
-        x="Generation",
-        y="Fitness",
-        color="Fitness",
-        hover_data=["Scenario"],
-        color_continuous_scale="RdYlGn_r",  # Red = bad, Green = good
-        title="Fitness Scores Across All Scenarios"
-    )
+def build_fitness_view():
+    fitness_frame = exp.fitness_frame()
+    df_fitness = pd.DataFrame({
+        "Generation": fitness_frame["generation"].to_numpy(),
+        "Scenario": fitness_frame["scenario_id"].to_numpy(),
+        "Fitness": fitness_frame["fitness_score"].to_numpy()
+    })
     
-    fig.update_layout(
-        xaxis_title="Generation",
-        yaxis_title="Fitness Score (lower = more effective chaos)",
-        hovermode="closest",
-        template="plotly_white"
-    )
+    # WebGL scatter; large runs collapse into a per-generation min/max envelope
+    fig = fitness_scatter_chart(fitness_frame)
+    return df_fitness, fig, df_fitness.nsmallest(5, "Fitness")
+
+if exp.fitness:
+    fitness_frame = exp.fitness_frame()
+    df_fitness, fig, top_scenarios = memoized("dashboard.fitness_view", exp, build_fitness_view)
     
     st.plotly_chart(fig, use_container_width=True)
     
+    # Generations where average fitness moved to a new level (FitnessAgent change points)
+    avg_regimes = analysis.get("fitness", {}).get("regimes", {}).get("avg", {}).get("regimes", [])
+    if len(avg_regimes) > 1:
+        st.markdown("**Fitness Regime Changes:**")
+        st.dataframe(pd.DataFrame([
+            {"From generation": r["start"], "To generation": r["end"], "Avg fitness": round(r["mean"], 3)}
+            for r in avg_regimes
+        ]), use_container_width=True)
+    
     # Best scenarios table
     st.markdown("**Top 5 Most Effective Scenarios:**")
-    top_scenarios = df_fitness.nsmallest(5, "Fitness")
     st.dataframe(top_scenarios, use_container_width=True)
 
 st.divider()
@@ -72,37 +80,45 @@ st.divider()
 # ===== HEALTH TIMELINE =====
 st.subheader("🏥 Health Check Timeline")
 
+def build_chaos_window():
+    # Chaos injection / recovery detected from latency and error-rate regime changes
+    return ChangePointDetector(max_workers=1).detect_services(exp.health_frame())["chaos_window"]
+
+def build_health_timeline(time_range):
+    # Downsampled server-side: bounded number of WebGL points whatever the experiment size
+    fig_timeline = health_timeline_chart(exp.health_frame(), time_range=time_range)
+    if fig_timeline is None:
+        return None
+    
+    chaos_window = memoized("dashboard.chaos_window", exp, build_chaos_window)
+    for label, ts, color in (("Chaos start", chaos_window["injection_start"], "red"),
+                             ("Recovery", chaos_window["recovery"], "green")):
+        if ts and (time_range is None or time_range[0] <= pd.Timestamp(ts) <= time_range[1]):
+            fig_timeline.add_vline(x=pd.Timestamp(ts).timestamp() * 1000, line_dash="dash", line_color=color,
+                                   annotation_text=label)
+    return fig_timeline
+
 if exp.health_events:
-    df_health = pd.DataFrame([
-        {
-            "Timestamp": e.timestamp,
-            "Service": e.service,
-            "Status": "Healthy" if e.status_code < 400 else "Failed",
-            "Status Code": e.status_code,
-            "Latency (ms)": e.latency_ms or 0
-        }
-        for e in exp.health_events
-    ])
-    
-    # Health status over time
-    fig_timeline = px.scatter(
-        df_health,
-        x="Timestamp",
-        y="Service",
-        color="Status",
-        size="Latency (ms)",
-        hover_data=["Status Code"],
-        color_discrete_map={"Healthy": "green", "Failed": "red"},
-        title="Service Health Over Time"
-    )
+    timestamps = pd.to_datetime(exp.health_frame()["timestamp"]).dropna()
+    time_range = None
+    if len(timestamps) and timestamps.min() < timestamps.max():
+        # Zoom: a narrower range is re-aggregated at a finer resolution
+        selected = st.slider("Time range", min_value=timestamps.min().to_pydatetime(),
+                             max_value=timestamps.max().to_pydatetime(),
+                             value=(timestamps.min().to_pydatetime(), timestamps.max().to_pydatetime()),
+                             format="MM-DD HH:mm:ss")
+        time_range = (pd.Timestamp(selected[0]), pd.Timestamp(selected[1]))
     
-    fig_timeline.update_layout(
-        xaxis_title="Time",
-        yaxis_title="Service",
-        template="plotly_white"
-    )
+    fig_timeline = memoized("dashboard.health_timeline", exp, lambda: build_health_timeline(time_range),
+                            time_range=time_range)
+    if fig_timeline is not None:
+        st.plotly_chart(fig_timeline, use_container_width=True)
     
-    st.plotly_chart(fig_timeline, use_container_width=True)
+    fig_latency = memoized("dashboard.latency_lines", exp,
+                           lambda: latency_chart(exp.health_frame(), time_range=time_range),
+                           time_range=time_range)
+    if fig_latency is not None:
+        st.plotly_chart(fig_latency, use_container_width=True)
 
 st.divider()
 
@@ -111,6 +127,23 @@ st.subheader("🔍 ML-Powered Anomaly Detection")
 
 detector = AnomalyDetector(contamination=0.15)
 
+with st.expander("Anomaly model registry"):
+    corpus_dir = st.text_input("Training corpus (folder of experiment folders)", "data/synthetic")
+    training = st.session_state.get("model_training")
+    if training is not None and training.done():
+        if training.exception():
+            st.error(f"Training failed: {training.exception()}")
+        else:
+            st.success(f"Trained anomaly model v{training.result()}")
+    elif training is not None:
+        st.info("Training in the background…")
+    if st.button("Train on corpus", disabled=training is not None and not training.done()):
+        # Loading the corpus happens on the registry's background thread too, so the page stays responsive
+        n_experiments = sum(1 for p in Path(corpus_dir).glob("*") if p.is_dir())
+        registry = st.session_state.setdefault("model_registry", ModelRegistry())
+        st.session_state["model_training"] = registry.fit_corpus_async(corpus_dir)
+        st.info(f"Training started on {n_experiments} experiments")
+
 # ← INITIALIZE cascade_result BEFORE USE
 cascade_result = {"total_cascade_events": 0, "cascades": []}
 
@@ -120,28 +153,43 @@ with col1:
     st.markdown("**Fitness Score Anomalies**")
     
     if exp.fitness:
-        fitness_scores = [f.fitness_score for f in exp.fitness]
-        generations = [f.generation for f in exp.fitness]
+        fitness_scores = fitness_frame["fitness_score"].tolist()
+        generations = fitness_frame["generation"].tolist()
         
-        anomaly_result = detector.detect_fitness_anomalies(fitness_scores, generations)
+        # Score with the latest persisted model when one exists; otherwise fit on this experiment only
+        registry = st.session_state.setdefault("model_registry", ModelRegistry())
+        model_version = registry.latest()
+        if model_version is not None:
+            anomaly_result = memoized("anomaly.fitness_model", exp, lambda: registry.score(exp, model_version),
+                                      model_version=model_version)
+            st.caption(f"Scored with anomaly model v{anomaly_result['model_version']}")
+        else:
+            anomaly_result = memoized("anomaly.fitness", exp,
+                                      lambda: detector.detect_fitness_anomalies(fitness_scores, generations),
+                                      contamination=detector.contamination)
         
         if anomaly_result.get("anomaly_count", 0) > 0:
             st.warning(f"⚠️ {anomaly_result['anomaly_count']} anomalous scenarios detected")
             
-            # Visualize anomalies
-            df_fitness['is_anomaly'] = False
-            for idx in anomaly_result['anomaly_indices']:
-                if idx < len(df_fitness):  # ← SAFETY CHECK
-                    df_fitness.loc[idx, 'is_anomaly'] = True
-            
-            fig_anomaly = px.scatter(
-                df_fitness,
-                x="Generation",
-                y="Fitness",
-                color="is_anomaly",
-                color_discrete_map={True: "red", False: "lightblue"},
-                title="Anomalous Fitness Scores Highlighted"
-            )
+            # Visualize anomalies (on a copy: df_fitness is shared through the cache)
+            def build_anomaly_figure():
+                df_anomaly = df_fitness.copy()
+                df_anomaly['is_anomaly'] = False
+                for idx in anomaly_result['anomaly_indices']:
+                    if idx < len(df_anomaly):  # ← SAFETY CHECK
+                        df_anomaly.loc[idx, 'is_anomaly'] = True
+                
+                return px.scatter(
+                    df_anomaly,
+                    x="Generation",
+                    y="Fitness",
+                    color="is_anomaly",
+                    color_discrete_map={True: "red", False: "lightblue"},
+                    title="Anomalous Fitness Scores Highlighted",
+                    render_mode="webgl"
+                )
+            fig_anomaly = memoized("dashboard.anomaly_figure", exp, build_anomaly_figure,
+                                   anomalies=anomaly_result['anomaly_indices'])
             st.plotly_chart(fig_anomaly, use_container_width=True)
             
             # Show details
@@ -156,16 +204,10 @@ with col2:
     st.markdown("**Cascade Failure Detection**")
     
     if exp.health_events:
-        health_dicts = [
-            {
-                "timestamp": e.timestamp,
-                "service": e.service,
-                "status_code": e.status_code
-            }
-            for e in exp.health_events
-        ]
+        health_dicts = exp.health_frame()  # shared columnar view, no per-event dicts
         
-        cascade_result = detector.detect_cascade_failures(health_dicts)  # ← NOW DEFINED
+        cascade_result = memoized("anomaly.cascades", exp,
+                                  lambda: detector.detect_cascade_failures(health_dicts, matrix=exp.failure_matrix()))
         
         if cascade_result['total_cascade_events'] > 0:
             st.warning(f"⚠️ {cascade_result['total_cascade_events']} cascade events detected")
@@ -179,7 +221,9 @@ with col2:
 # Slow recovery detection
 st.markdown("**Slow Recovery Detection**")
 if exp.health_events:
-    slow_recoveries = detector.detect_recovery_slowness(health_dicts, threshold_seconds=45.0)
+    slow_recoveries = memoized("anomaly.slow_recoveries", exp,
+                               lambda: detector.detect_recovery_slowness(health_dicts, threshold_seconds=45.0),
+                               threshold_seconds=45.0)
     
     if slow_recoveries:
         st.error(f"🐌 {len(slow_recoveries)} slow recovery incidents")
@@ -191,35 +235,44 @@ if exp.health_events:
         st.success("✅ All services recovered quickly")
 
 # ===== NETWORK GRAPH SECTION - FIXED =====
-if exp.health_events and cascade_result['total_cascade_events'] > 0:
+# Directed edges from lagged failure correlation (10s buckets, up to 1 min lag)
+def build_dependency_network():
+    dependency_graph = CascadeEngine(max_lag=6).graph(exp.failure_matrix("10s"))
+    if dependency_graph.number_of_edges() == 0:
+        return None
+    # Spring layout is the expensive part; the finished figure is cached
+    return ServiceDependencyGraph().build_dependency_graph(exp.health_frame(), graph=dependency_graph)
+
+network_fig = memoized("dashboard.dependency_network", exp, build_dependency_network,
+                       bucket="10s", max_lag=6) if exp.health_events else None
+if network_fig is not None:
     st.divider()
     st.subheader("🕸️ Service Dependency Network")
     
-    graph_builder = ServiceDependencyGraph()
-    network_fig = graph_builder.build_graph_from_cascades(health_dicts, cascade_result['cascades'])
-    
     st.plotly_chart(network_fig, use_container_width=True)
     
-    st.caption("Node size = failure count | Edges = observed cascades | Color intensity = failure severity")
+    st.caption("Node size = failure count | Arrow a → b = b fails shortly after a (width = lagged correlation) | Color intensity = failure severity")
 
 st.divider()
 
 # ===== SCENARIO BREAKDOWN =====
 st.subheader("🔬 Scenario Types Distribution")
 
-if exp.scenarios:
+def build_scenario_pie():
     scenario_types = pd.DataFrame([
         {"Type": s.scenario_type, "Count": 1}
         for s in exp.scenarios
     ]).groupby("Type").sum().reset_index()
     
-    fig_pie = px.pie(
+    return px.pie(
         scenario_types,
         values="Count",
         names="Type",
         title="Chaos Scenario Types"
     )
-    st.plotly_chart(fig_pie, use_container_width=True)
+
+if exp.scenarios:
+    st.plotly_chart(memoized("dashboard.scenario_pie", exp, build_scenario_pie), use_container_width=True)
 
 # ===== RAW DATA EXPLORER =====
 with st.expander("🔍 Raw Data Explorer"):
@@ -231,8 +284,17 @@ with st.expander("🔍 Raw Data Explorer"):
     
     with tab2:
         if exp.fitness:
-            st.dataframe([f.dict() for f in exp.fitness], use_container_width=True)
+            st.dataframe(exp.fitness_frame(), use_container_width=True)
     
     with tab3:
         if exp.health_events:
-            st.dataframe([h.dict() for h in exp.health_events], use_container_width=True)
\ No newline at end of file
+            st.dataframe(exp.health_frame(), use_container_width=True)
+
+with cache_panel.container():
+    with st.expander("⚙️ Compute cache"):
+        cache_stats = compute_cache.stats()
+        st.caption(f"{cache_stats['entries']}/{cache_stats['max_entries']} entries | "
+                   f"hit rate {cache_stats['hit_rate']:.0%}")
+        st.dataframe(compute_cache.stats_frame(), use_container_width=True)
+        if st.button("Clear compute cache"):
+            compute_cache.clear()
@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.graph_objects as go
+from src.memo import compute_cache, memoized
+from src.serialization import dumps_bytes
 from src.visualizations.heatmap import create_failure_correlation_heatmap
 
 st.set_page_config(page_title="AI Analysis", layout="wide")
@@ -17,6 +19,9 @@ if not exp:
 
 analysis = st.session_state["analysis"]
 
+# Filled in at the end, once this run's compute cache lookups are counted
+cache_panel = st.sidebar.empty()
+
 # ===== TOP-LEVEL METRICS =====
 col1, col2, col3, col4 = st.columns(4)
 
@@ -195,8 +200,15 @@ with tab2:
     if mttr:
         st.markdown("**Mean Time To Recovery (MTTR):**")
         import pandas as pd
+        mttr_stats = health_data.get("mttr_stats", {})
         mttr_df = pd.DataFrame([
-            {"Service": svc, "MTTR (seconds)": time}
+            {
+                "Service": svc,
+                "MTTR (seconds)": time,
+                "Median (s)": mttr_stats.get(svc, {}).get("median"),
+                "P95 (s)": mttr_stats.get(svc, {}).get("p95"),
+                "Outages": mttr_stats.get(svc, {}).get("windows", 0),
+            }
             for svc, time in mttr.items()
         ])
         st.dataframe(mttr_df, use_container_width=True)
@@ -209,20 +221,30 @@ with tab2:
             for i, cascade in enumerate(cascades, 1):
                 st.markdown(f"{i}. {' → '.join(cascade)}")
     
+    # Prometheus series that move around failure windows (MetricsAgent)
+    metrics_data = analysis.get("metrics", {})
+    ranked_metrics = metrics_data.get("ranked", [])
+    if ranked_metrics:
+        st.markdown("**Metrics Moving Around Failures:**")
+        import pandas as pd
+        st.dataframe(pd.DataFrame([
+            {
+                "Metric": item["metric"],
+                "Score (|shift|, std devs)": round(item["score"], 2),
+                "Mean Shift": round(item["mean_shift"], 2),
+                "Windows": item["windows"],
+                "Services (|shift| >= 1)": ", ".join(item["services"]),
+            }
+            for item in ranked_metrics
+        ]), use_container_width=True)
+        st.caption(f"Mean during each failure vs the {metrics_data.get('lookback_seconds', 0):.0f}s before it, "
+                   f"over {metrics_data.get('windows', 0)} failure windows")
+    
     # ===== HEATMAP SECTION - FIXED =====
     st.markdown("#### 📊 Failure Correlation Heatmap")
     if exp.health_events:
-        # ← FIXED: Define health_dicts here
-        health_dicts = [
-            {
-                "timestamp": e.timestamp,
-                "service": e.service,
-                "status_code": e.status_code
-            }
-            for e in exp.health_events
-        ]
-        
-        heatmap_fig = create_failure_correlation_heatmap(health_dicts)
+        heatmap_fig = memoized("ai.correlation_heatmap", exp, lambda: create_failure_correlation_heatmap(
+            exp.health_frame(), matrix=exp.failure_matrix()), bucket="30s")
         if heatmap_fig:
             st.plotly_chart(heatmap_fig, use_container_width=True)
             st.caption("Values close to 1.0 = services that often fail together")
@@ -242,7 +264,7 @@ with tab3:
             if v_type == "error_rate":
                 st.markdown(f"**Error Rate:** {v['error_rate']:.1%} (threshold: {v['threshold']:.1%})")
             elif v_type == "latency_p99":
-                st.markdown(f"**P99 Latency:** {v['latency_p99']}ms (threshold: {v['threshold']}ms)")
+                st.markdown(f"**P99 Latency:** {v['latency_p99']:.0f}ms (threshold: {v['threshold']}ms)")
     else:
         st.success("✅ All SLOs passed")
     
@@ -255,16 +277,48 @@ with tab3:
     with col2:
         latency = slo_data.get("latency_p99")
         if latency:
-            st.metric("P99 Latency", f"{latency}ms")
+            st.metric("P99 Latency", f"{latency:.0f}ms")
+    
+    per_service_latency = slo_data.get("per_service_latency", {})
+    if per_service_latency:
+        import pandas as pd
+        st.markdown("**Latency Percentiles by Service (ms, ±1%):**")
+        st.dataframe(pd.DataFrame(per_service_latency).T.round(1), use_container_width=True)
+
+    slo_results = slo_data.get("slo_results")
+    if slo_results:
+        import pandas as pd
+        summary = slo_results["summary"]
+        st.markdown(f"**Per-Service SLOs:** {summary['violated']} violated, "
+                    f"{summary['passed']} passed, {summary['no_data']} without data")
+        st.dataframe(pd.DataFrame([
+            {
+                "SLO": r["name"],
+                "Service": r["service"],
+                "URL": r["url"] or "",
+                "Status": r["status"],
+                "Events": r["events"],
+                "Error Rate": r.get("error_rate"),
+                "Latency (ms)": (r.get("latency") or {}).get("value"),
+                "Max Burn Rate": (r.get("burn_rate") or {}).get("max"),
+            }
+            for r in slo_results["slos"]
+        ]), use_container_width=True)
 
 st.divider()
 
 # Export button
 if st.button("📥 Export Full Analysis as JSON"):
-    import json
     st.download_button(
         "Download JSON",
-        data=json.dumps(analysis, indent=2),
+        data=dumps_bytes(analysis, indent=True),
         file_name="krkn_analysis.json",
         mime="application/json"
-    )
\ No newline at end of file
+    )
+
+with cache_panel.container():
+    with st.expander("⚙️ Compute cache"):
+        cache_stats = compute_cache.stats()
+        st.caption(f"{cache_stats['entries']}/{cache_stats['max_entries']} entries | "
+                   f"hit rate {cache_stats['hit_rate']:.0%}")
+        st.dataframe(compute_cache.stats_frame(), use_container_width=True)
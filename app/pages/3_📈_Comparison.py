@@ -1,108 +1,91 @@
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
 from pathlib import Path
-from src.loaders.krkn_loader import KrknResultsLoader
-from src.orchestrator import Orchestrator
+from src.analytics.comparison import ComparisonEngine, analysis_digest, comparison_to_dict, load_analyses
+from src.serialization import dumps_bytes
 
 st.set_page_config(page_title="Comparison", layout="wide")
 st.header("📈 Multi-Experiment Comparison")
 
-# Allow loading second experiment
-st.sidebar.header("Load Second Experiment")
-exp2_path = st.sidebar.text_input("Experiment 2 path", "data/synthetic/experiment_2")
-
-if st.sidebar.button("Load Experiment 2"):
-    if Path(exp2_path).exists():
-        loader2 = KrknResultsLoader(exp2_path)
-        exp2 = loader2.load()
-        orchestrator = Orchestrator()
-        analysis2 = orchestrator.analyze_experiment(exp2)
-        
-        st.session_state["exp2"] = exp2
-        st.session_state["analysis2"] = analysis2
-        st.success(f"Loaded {exp2.metadata.experiment_id}")
-    else:
-        st.error(f"Path not found: {exp2_path}")
+# Load any number of experiments to compare against the main one
+st.sidebar.header("Add Experiments")
+paths_text = st.sidebar.text_area("Experiment folders or JSON reports (one per line)", "data/synthetic/experiment_2")
 
-# Check if both experiments loaded
+if st.sidebar.button("Load Experiments"):
+    paths = [line.strip() for line in paths_text.splitlines() if line.strip()]
+    missing = [p for p in paths if not Path(p).exists()]
+    if missing:
+        st.error(f"Path not found: {', '.join(missing)}")
+    else:
+        # Directories are analyzed in parallel worker processes; reports are only parsed
+        with st.spinner(f"Analyzing {len(paths)} experiments…"):
+            loaded = load_analyses(paths)
+        st.session_state.setdefault("comparison_analyses", {}).update(loaded)
+        failed = {name: a["load_error"] for name, a in loaded.items() if "load_error" in a}
+        ok = [name for name in loaded if name not in failed]
+        if ok:
+            st.success(f"Loaded {', '.join(ok)}")
+        for name, error in failed.items():
+            st.warning(f"Could not load {name}: {error}")
+
+# Check if enough experiments loaded
 if "exp" not in st.session_state:
     st.warning("Load Experiment 1 from main page first")
     st.stop()
 
-exp1 = st.session_state["exp"]
-analysis1 = st.session_state.get("analysis", {})
+analyses = {st.session_state["exp"].metadata.experiment_id: st.session_state.get("analysis", {})}
+if "exp2" in st.session_state:
+    analyses[st.session_state["exp2"].metadata.experiment_id] = st.session_state["analysis2"]
+analyses.update(st.session_state.get("comparison_analyses", {}))
 
-if "exp2" not in st.session_state:
-    st.info("👈 Load a second experiment from the sidebar to compare")
+if len(analyses) < 2:
+    st.info("👈 Load more experiments from the sidebar to compare")
     st.stop()
 
-exp2 = st.session_state["exp2"]
-analysis2 = st.session_state["analysis2"]
-
-# ===== SIDE-BY-SIDE METRICS =====
-st.subheader("⚖️ Head-to-Head Comparison")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown(f"### 🔵 {exp1.metadata.experiment_id}")
-    fitness1 = analysis1.get("fitness", {})
-    best1 = fitness1.get("best_overall", {}).get("fitness_score", 1.0)
-    st.metric("Best Fitness", f"{best1:.3f}")
-    
-    health1 = analysis1.get("health", {})
-    failures1 = sum(health1.get("failure_counts", {}).values())
-    st.metric("Total Failures", failures1)
-    
-    slo1 = analysis1.get("slo", {})
-    st.metric("SLO Status", slo1.get("status", "unknown").upper())
-
-with col2:
-    st.markdown(f"### 🟢 {exp2.metadata.experiment_id}")
-    fitness2 = analysis2.get("fitness", {})
-    best2 = fitness2.get("best_overall", {}).get("fitness_score", 1.0)
-    delta = best2 - best1
-    st.metric("Best Fitness", f"{best2:.3f}", delta=f"{delta:+.3f}", delta_color="inverse")
-    
-    health2 = analysis2.get("health", {})
-    failures2 = sum(health2.get("failure_counts", {}).values())
-    delta_f = failures2 - failures1
-    st.metric("Total Failures", failures2, delta=f"{delta_f:+d}", delta_color="inverse")
-    
-    slo2 = analysis2.get("slo", {})
-    st.metric("SLO Status", slo2.get("status", "unknown").upper())
+if st.sidebar.button("Clear loaded experiments"):
+    st.session_state.pop("comparison_analyses", None)
+    st.rerun()
 
-st.divider()
+baseline = st.sidebar.selectbox("Baseline", list(analyses))
 
-# ===== FITNESS EVOLUTION COMPARISON =====
-st.subheader("📊 Fitness Evolution Comparison")
+# Recompute only when the set of analyses or the baseline changes, not on every rerun
+signature = (baseline, tuple((exp_id, analysis_digest(analysis)) for exp_id, analysis in analyses.items()))
+cached = st.session_state.get("comparison")
+if cached is None or cached[0] != signature:
+    st.session_state["comparison"] = (signature, ComparisonEngine(baseline=baseline).compare(analyses))
+result = st.session_state["comparison"][1]
+metrics, ranks = result["metrics"], result["ranks"]
+baseline = result["baseline"]  # the engine falls back to the first loaded experiment
 
-df1 = pd.DataFrame([
-    {"Generation": f.generation, "Fitness": f.fitness_score, "Experiment": exp1.metadata.experiment_id}
-    for f in exp1.fitness
-])
+# ===== RANKING =====
+st.subheader(f"🏆 Ranking ({len(analyses)} experiments, baseline {baseline})")
 
-df2 = pd.DataFrame([
-    {"Generation": f.generation, "Fitness": f.fitness_score, "Experiment": exp2.metadata.experiment_id}
-    for f in exp2.fitness
-])
+ranking = metrics.loc[ranks.index].copy()
+ranking.insert(0, "Overall Rank", ranks["overall"].round(2))
+st.dataframe(ranking, use_container_width=True)
 
-df_combined = pd.concat([df1, df2])
+st.divider()
 
-# Group by generation and experiment
-df_agg = df_combined.groupby(["Generation", "Experiment"])["Fitness"].mean().reset_index()
+# ===== FITNESS EVOLUTION COMPARISON =====
+st.subheader("📊 Fitness Evolution Comparison")
+
+top_n = st.slider("Experiments to plot (best ranked)", 1, len(analyses), min(len(analyses), 10)) \
+    if len(analyses) > 2 else len(analyses)
+shown = list(ranks.index[:top_n])
+if baseline not in shown:
+    shown.append(baseline)
 
 fig = go.Figure()
 
-for exp_name in df_agg["Experiment"].unique():
-    exp_data = df_agg[df_agg["Experiment"] == exp_name]
+fitness_avg = result["fitness_avg"]
+for exp_name in shown:
+    series = fitness_avg[exp_name].dropna()
     fig.add_trace(go.Scatter(
-        x=exp_data["Generation"],
-        y=exp_data["Fitness"],
+        x=series.index,
+        y=series.to_numpy(),
         mode='lines+markers',
         name=exp_name,
-        line=dict(width=3)
+        line=dict(width=4 if exp_name == baseline else 2)
     ))
 
 fig.update_layout(
@@ -122,59 +105,25 @@ st.subheader("🏆 Winner Analysis")
 
 col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.markdown("**Best Overall Fitness**")
-    winner = exp1.metadata.experiment_id if best1 < best2 else exp2.metadata.experiment_id
-    st.success(f"🏆 {winner}")
-    st.caption(f"{best1:.3f} vs {best2:.3f}")
-
-with col2:
-    st.markdown("**Fewer Failures**")
-    winner = exp1.metadata.experiment_id if failures1 < failures2 else exp2.metadata.experiment_id
-    st.success(f"🏆 {winner}")
-    st.caption(f"{failures1} vs {failures2}")
-
-with col3:
-    st.markdown("**Faster Convergence**")
-    gens1 = len(fitness1.get("per_generation", {}))
-    gens2 = len(fitness2.get("per_generation", {}))
-    winner = exp1.metadata.experiment_id if gens1 < gens2 else exp2.metadata.experiment_id
-    st.success(f"🏆 {winner}")
-    st.caption(f"{gens1} vs {gens2} generations")
+for col, title, metric, fmt in ((col1, "Best Overall Fitness", "best_fitness", "{:.3f}"),
+                                (col2, "Fewer Failures", "failures", "{:.0f}"),
+                                (col3, "Faster Convergence", "generations", "{:.0f} generations")):
+    with col:
+        st.markdown(f"**{title}**")
+        winner = ranks[metric].idxmin()
+        st.success(f"🏆 {winner}")
+        st.caption(f"{fmt.format(metrics.loc[winner, metric])} vs baseline {fmt.format(metrics.loc[baseline, metric])}")
 
 st.divider()
 
-# ===== DETAILED COMPARISON TABLE =====
-st.subheader("📋 Detailed Metrics Comparison")
-
-comparison_data = {
-    "Metric": [
-        "Best Fitness Score",
-        "Average Fitness Score",
-        "Total Scenarios Tested",
-        "Generations",
-        "Health Failures",
-        "SLO Violations",
-        "MTTR (avg seconds)"
-    ],
-    exp1.metadata.experiment_id: [
-        f"{best1:.3f}",
-        f"{fitness1.get('per_generation', {}).get(0, {}).get('avg', 0):.3f}",
-        len(exp1.scenarios),
-        len(fitness1.get("per_generation", {})),
-        failures1,
-        len(slo1.get("violations", [])),
-        f"{sum(health1.get('mttr_seconds', {}).values()) / max(len(health1.get('mttr_seconds', {})), 1):.1f}"
-    ],
-    exp2.metadata.experiment_id: [
-        f"{best2:.3f}",
-        f"{fitness2.get('per_generation', {}).get(0, {}).get('avg', 0):.3f}",
-        len(exp2.scenarios),
-        len(fitness2.get("per_generation", {})),
-        failures2,
-        len(slo2.get("violations", [])),
-        f"{sum(health2.get('mttr_seconds', {}).values()) / max(len(health2.get('mttr_seconds', {})), 1):.1f}"
-    ]
-}
-
-st.table(pd.DataFrame(comparison_data))
\ No newline at end of file
+# ===== DELTAS VS BASELINE =====
+st.subheader(f"📋 Deltas vs {baseline}")
+st.caption("Negative = lower than the baseline (better for fitness, failures, MTTR, violations)")
+st.dataframe(result["deltas"].loc[ranks.index].round(3), use_container_width=True)
+
+st.download_button(
+    label="Download Comparison JSON",
+    data=dumps_bytes(comparison_to_dict(result), indent=True),
+    file_name="krkn_ai_comparison.json",
+    mime="application/json"
+)
@@ -1,5 +1,5 @@
 import streamlit as st
-import json
+from src.serialization import dumps_bytes
 
 st.header("📋 Export Report")
 
@@ -12,9 +12,11 @@ report = {
     "analysis": st.session_state["analysis"]
 }
 
+compress = st.checkbox("Gzip-compress (recommended for large reports)", value=False)
+
 st.download_button(
     label="Download JSON Report",
-    data=json.dumps(report, indent=2),
-    file_name="krkn_ai_analysis_report.json",
-    mime="application/json"
+    data=dumps_bytes(report, indent=True, compress=compress),
+    file_name="krkn_ai_analysis_report.json" + (".gz" if compress else ""),
+    mime="application/gzip" if compress else "application/json"
 )
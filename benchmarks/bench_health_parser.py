@@ -0,0 +1,97 @@
+"""
+Benchmark: columnar HealthParser vs the original per-row iterrows loop.
+
+    python benchmarks/bench_health_parser.py --sizes 10000 1000000 10000000
+
+The legacy loop is very slow at 10M rows; pass --legacy-max-rows to skip it
+above a given size.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.experiment import HealthEvent
+from src.parsers.health_parser import HealthParser
+
+
+def legacy_parse(csv_path: Path):
+    """The pre-columnar HealthParser.parse loop, kept here as the baseline."""
+    df = pd.read_csv(csv_path, parse_dates=["timestamp"])
+    events = []
+    for _, row in df.iterrows():
+        def clean_value(val, default=""):
+            if pd.isna(val):
+                return default
+            return str(val)
+
+        he = HealthEvent(
+            timestamp=row["timestamp"].isoformat() if hasattr(row["timestamp"], "isoformat") else str(row["timestamp"]),
+            service=clean_value(row.get("application") or row.get("service")),
+            url=clean_value(row.get("url")),
+            status_code=int(row["status_code"]) if pd.notna(row.get("status_code")) else None,
+            latency_ms=float(row["latency_ms"]) if pd.notna(row.get("latency_ms")) else None,
+            healthy=bool(row["healthy"]) if pd.notna(row.get("healthy")) else True,
+            error=clean_value(row.get("error")) or None,
+        )
+        events.append(he)
+    return events
+
+
+def write_synthetic_csv(path: Path, rows: int, services: int = 20, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"svc-{i}" for i in range(services)])
+    svc_idx = rng.integers(0, services, rows)
+    failed = rng.random(rows) < 0.05
+    df = pd.DataFrame({
+        "timestamp": pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(rows), unit="s"),
+        "application": names[svc_idx],
+        "url": np.char.add("/health/", names[svc_idx]),
+        "status_code": np.where(failed, 503, 200),
+        "response_time_ms": rng.gamma(2.0, 40.0, rows).round(1),
+        "error_message": np.where(failed, "timeout", ""),
+    })
+    df.to_csv(path, index=False)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    ap.add_argument("--legacy-max-rows", type=int, default=None,
+                    help="Skip the legacy loop for sizes above this many rows")
+    args = ap.parse_args()
+
+    parser = HealthParser()
+    print(f"{'rows':>12} {'legacy (s)':>12} {'columnar (s)':>14} {'+events (s)':>12} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            csv_path = Path(tmp) / f"health_{rows}.csv"
+            write_synthetic_csv(csv_path, rows)
+
+            t_col, table = timed(parser.parse, csv_path)
+            t_events, _ = timed(table.to_events)
+
+            if args.legacy_max_rows is None or rows <= args.legacy_max_rows:
+                t_legacy, _ = timed(legacy_parse, csv_path)
+                legacy = f"{t_legacy:12.3f}"
+                speedup = f"{t_legacy / t_col:8.1f}x"
+            else:
+                legacy, speedup = f"{'skipped':>12}", f"{'-':>9}"
+            print(f"{rows:>12,} {legacy} {t_col:14.3f} {t_events:12.3f} {speedup}")
+            csv_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
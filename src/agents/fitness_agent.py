@@ -1,22 +1,32 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import numpy as np
+from ..analytics.change_points import ChangePointDetector
 from ..schema import ExperimentResult
 
 class FitnessAgent:
     """
     Analyzes fitness evolution and returns a compact summary dict.
+
+    `regimes` holds the change points of the per-generation best and average
+    fitness (ChangePointDetector.detect_fitness), i.e. the generations where
+    the search moved to a clearly different fitness level.
     """
+    name = "fitness"
+    depends_on = ()
+
+    def __init__(self, change_points: Optional[ChangePointDetector] = None):
+        self.change_points = change_points or ChangePointDetector(max_workers=1)
 
     def analyze(self, exp: ExperimentResult) -> Dict[str, Any]:
         # Aggregate best/avg/worst per generation
-        gen_map = {}
-        for f in exp.fitness:
-            gen_map.setdefault(f.generation, []).append(f.fitness_score)
+        df = exp.fitness_frame()
+        gen_map = df.groupby("generation", sort=False)["fitness_score"]
 
         results = {"per_generation": {}, "best_overall": None}
         best = (None, 1.0)  # (scenario_id, score)
-        for gen, scores in gen_map.items():
-            arr = np.array(scores)
+        for gen, scores in gen_map:
+            gen = int(gen)
+            arr = scores.to_numpy()
             results["per_generation"][gen] = {
                 "best": float(arr.min()),
                 "avg": float(arr.mean()),
@@ -39,4 +49,5 @@ class FitnessAgent:
         else:
             results["trend"] = "insufficient_data"
             results["slope"] = 0.0
+        results["regimes"] = self.change_points.detect_fitness(results)
         return results
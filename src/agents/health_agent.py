@@ -1,36 +1,47 @@
-from typing import Dict, Any
-import pandas as pd
+from typing import Dict, Any, Optional
 from ..schema import ExperimentResult
+from ..analytics.health_aggregators import HealthAggregator
+from ..analytics.health_stream import stream_health_csv, streams_health
 
 class HealthAgent:
     """
     Correlates health events to produce MTTR, failure counts, and cascade hints.
+
+    With `chunksize`, an experiment loaded without in-memory health events
+    (KrknResultsLoader(stream_health=True)) is analyzed by streaming the
+    health CSV in chunks; the result is identical to the in-memory path.
     """
+    name = "health"
+    depends_on = ()
+
+    def __init__(self, chunksize: Optional[int] = None):
+        self.chunksize = chunksize
 
     def analyze(self, exp: ExperimentResult) -> Dict[str, Any]:
-        if not exp.health_events:
+        if exp.health_events:
+            # Shared, read-only frame and the experiment's cached failure matrix
+            stream = _HealthStream(HealthAggregator(matrix=exp.failure_matrix()))
+            stream.update(exp.health_frame())
+        elif self.chunksize and streams_health(exp):
+            stream = self.stream_consumer(exp)
+            stream_health_csv(exp.raw_files["health_check_report.csv"], self.chunksize, [stream])
+        else:
+            return {"error": "no_health_data"}
+        return stream.result()
+
+    def stream_consumer(self, exp: ExperimentResult) -> "_HealthStream":
+        """Chunk consumer for a shared pass over the health CSV (see analyze_health_csv)."""
+        return _HealthStream(HealthAggregator())
+
+
+class _HealthStream:
+    def __init__(self, agg: HealthAggregator):
+        self.agg = agg
+
+    def update(self, df):
+        self.agg.update(df)
+
+    def result(self) -> Dict[str, Any]:
+        if not self.agg.services:
             return {"error": "no_health_data"}
-        df = pd.DataFrame([e.dict() for e in exp.health_events])
-        summary = {}
-        # Failure counts by service
-        fail_df = df[df["status_code"] >= 400]
-        counts = fail_df.groupby("service").size().to_dict()
-        summary["failure_counts"] = counts
-        # Simple MTTR per service: compute contiguous failure windows (naive)
-        mttr = {}
-        for svc, group in df.groupby("service"):
-            service_fail = group[group["status_code"] >= 400]
-            if service_fail.empty:
-                mttr[svc] = 0.0
-                continue
-            # assume timestamp strings parseable by pandas
-            times = pd.to_datetime(service_fail["timestamp"])
-            durations = (times.max() - times.min()).total_seconds()
-            mttr[svc] = durations
-        summary["mttr_seconds"] = mttr
-        # Simple cascade hint: services that fail within the same time bucket
-        df["ts"] = pd.to_datetime(df["timestamp"]).dt.floor("30s")
-        buckets = df[df["status_code"] >= 400].groupby("ts")["service"].unique().apply(list).to_dict()
-        cascades = [v for v in buckets.values() if len(v) > 1]
-        summary["cascade_samples"] = cascades[:10]
-        return summary
+        return self.agg.summary()
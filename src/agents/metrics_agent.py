@@ -0,0 +1,77 @@
+from typing import Dict, Any, Optional
+import pandas as pd
+from ..schema import ExperimentResult
+from ..analytics.failure_windows import failure_windows
+from ..analytics.metric_correlation import correlate_metrics_with_failures
+from ..analytics.health_stream import stream_health_csv, streams_health
+
+class MetricsAgent:
+    """
+    Connects Prometheus series to health failures.
+
+    Per-service failure windows are joined as-of against every Prometheus
+    series (see correlate_metrics_with_failures) and the series are ranked
+    by how far they move from their pre-failure level. With `chunksize`,
+    windows of a streamed health CSV are built chunk by chunk.
+    """
+    name = "metrics"
+    depends_on = ()
+
+    def __init__(self, lookback: str = "5m", min_during: str = "1m", top_n: int = 20,
+                 chunksize: Optional[int] = None):
+        self.lookback = lookback
+        self.min_during = min_during
+        self.top_n = top_n
+        self.chunksize = chunksize
+
+    def analyze(self, exp: ExperimentResult) -> Dict[str, Any]:
+        table = exp.prometheus_table()
+        if table is None or len(table) == 0:
+            return {"error": "no_prometheus_data"}
+        if exp.health_events:
+            df = exp.health_frame()
+            windows, last_seen = failure_windows(df), df["timestamp"].max()
+        elif self.chunksize and streams_health(exp):
+            stream = self.stream_consumer(exp)
+            stream_health_csv(exp.raw_files["health_check_report.csv"], self.chunksize, [stream])
+            return stream.result()
+        else:
+            return {"error": "no_health_data", "series": table.n_series}
+        return self._correlate(table, windows, last_seen)
+
+    def stream_consumer(self, exp: ExperimentResult) -> "_WindowStream":
+        """Chunk consumer for a shared pass over the health CSV, building failure windows chunk by chunk."""
+        table = exp.prometheus_table()
+        return _WindowStream(self, table if table is not None and len(table) else None)
+
+    def _correlate(self, table, windows: pd.DataFrame, last_seen) -> Dict[str, Any]:
+        return correlate_metrics_with_failures(table, windows, lookback=self.lookback, min_during=self.min_during,
+                                               end_fill=last_seen, top_n=self.top_n)
+
+
+class _WindowStream:
+    """Failure windows of a health CSV fed in chunks, carrying windows still open across chunks."""
+
+    def __init__(self, agent: MetricsAgent, table):
+        self.agent = agent
+        self.table = table
+        self.parts = []
+        self.open_since = {}
+        self.last_seen = None
+
+    def update(self, df: pd.DataFrame):
+        if self.table is None or len(df) == 0:
+            return
+        windows = failure_windows(df, self.open_since)
+        is_open = windows["end"].isna().to_numpy()
+        self.open_since = dict(zip(windows["service"][is_open], windows["start"][is_open]))
+        self.parts.append(windows[~is_open])
+        chunk_last = df["timestamp"].max()
+        self.last_seen = chunk_last if self.last_seen is None else max(self.last_seen, chunk_last)
+
+    def result(self) -> Dict[str, Any]:
+        if self.table is None:
+            return {"error": "no_prometheus_data"}
+        # Still-open windows are kept (end = NaT) and closed at the last health check
+        windows = pd.concat(self.parts + [failure_windows(pd.DataFrame(), self.open_since)], ignore_index=True)
+        return self.agent._correlate(self.table, windows, self.last_seen)
@@ -0,0 +1,152 @@
+"""
+Token-budgeted compaction of the RootCauseAgent prompt.
+
+Fitness and health summaries grow with the run (one `per_generation` entry
+per generation, one cascade per bucket in which services failed together),
+so a verbatim prompt for a long run can exceed the model's context and cost.
+`PromptCompactor` ranks that evidence by salience and keeps the top of each
+list, tightening the limits until the rendered prompt fits the budget:
+
+- generations: lowest best fitness first (most effective chaos); the first
+  and last generation are always kept so the trend stays readable
+- services: most failed checks first, with MTTR, open failures, metric shifts
+  and health_check_report.csv row ranges kept only for the retained services
+- cascades: most services involved, then most failed checks among them
+
+Kept generations are keyed `generation_<n>` like best_scenarios.json and
+service row ranges stay attached to their service, so everything left in the
+prompt can still be cited. Token counts are a local estimate, not a tokenizer.
+"""
+import os
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("KRKN_RCA_TOKEN_BUDGET", "6000"))
+# Items kept per ranked list at each compaction level (level 0 is the verbatim prompt)
+LEVEL_LIMITS = (50, 20, 10, 5, 3, 1)
+
+_WORDS = re.compile(r"[A-Za-z]+")
+_DIGITS = re.compile(r"[0-9]+")
+_SYMBOLS = re.compile(r"[^A-Za-z0-9\s]|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count (llama-3 / GPT style): one token per 4 letters
+    of a word, per 3 digits of a number, and per symbol or line break. Runs a
+    little high on JSON, which is the safe side for a budget.
+    """
+    return (sum((len(w) + 3) // 4 for w in _WORDS.findall(text))
+            + sum((len(d) + 2) // 3 for d in _DIGITS.findall(text))
+            + len(_SYMBOLS.findall(text)))
+
+
+def _generation_key(key) -> str:
+    key = str(key)
+    return key if key.startswith("generation_") else f"generation_{key}"
+
+
+def _generation_number(key) -> float:
+    try:
+        return float(str(key).rsplit("_", 1)[-1])
+    except ValueError:
+        return float("inf")
+
+
+class PromptCompactor:
+    """
+    Salience-ranked views of the RootCauseAgent inputs at a given list limit.
+
+    Rankings are computed once in the constructor; `health`, `fitness` and
+    `metrics` then only slice them, so trying every level stays cheap.
+    """
+
+    def __init__(self, health_summary: Dict, fitness_summary: Dict, metrics_summary: Optional[Dict] = None):
+        self.health_summary = health_summary or {}
+        self.fitness_summary = fitness_summary or {}
+        self.metrics_summary = metrics_summary or {}
+
+        counts = self.health_summary.get("failure_counts") or {}
+        mttr = self.health_summary.get("mttr_seconds") or {}
+        self.services = sorted(counts, key=lambda svc: (-counts[svc], -(mttr.get(svc) or 0.0), str(svc)))
+
+        unique = {}
+        for cascade in self.health_summary.get("cascade_samples") or []:
+            unique.setdefault(frozenset(cascade), list(cascade))
+        self.cascades = sorted(unique.values(),
+                               key=lambda c: (-len(c), -sum(counts.get(svc, 0) for svc in c)))
+
+        per_generation = self.fitness_summary.get("per_generation") or {}
+        self.generation_order = sorted(per_generation, key=_generation_number)
+        self.generations = sorted(per_generation, key=lambda g: (per_generation[g].get("best", float("inf")),
+                                                                 _generation_number(g)))
+
+    def health(self, limit: int) -> Dict[str, Any]:
+        if not self.health_summary or "error" in self.health_summary:
+            return self.health_summary
+        kept = self.services[:limit]
+        out = {
+            "failure_counts": {svc: self.health_summary["failure_counts"][svc] for svc in kept},
+        }
+        for key in ("mttr_seconds", "mttr_stats", "open_failures", "failed_rows"):
+            values = self.health_summary.get(key) or {}
+            out[key] = {svc: values[svc] for svc in kept if svc in values}
+        out["cascade_samples"] = self.cascades[:limit]
+        omitted = {"services": len(self.services) - len(kept), "cascades": len(self.cascades) - len(out["cascade_samples"])}
+        if any(omitted.values()):
+            out["omitted"] = omitted
+        return out
+
+    def fitness(self, limit: int) -> Dict[str, Any]:
+        per_generation = self.fitness_summary.get("per_generation")
+        if not per_generation:
+            return self.fitness_summary
+        kept = set(self.generations[:max(limit - 2, 1)])
+        kept.update(self.generation_order[:1] + self.generation_order[-1:])
+        out = {key: value for key, value in self.fitness_summary.items() if key != "per_generation"}
+        out["per_generation"] = {
+            _generation_key(g): per_generation[g] for g in self.generation_order if g in kept
+        }
+        if len(kept) < len(per_generation):
+            out["omitted"] = {"generations": len(per_generation) - len(kept)}
+        return out
+
+    def metrics(self, limit: int) -> Dict[str, Any]:
+        if not self.metrics_summary.get("ranked"):
+            return self.metrics_summary
+        kept = set(self.services[:limit])
+        per_service = self.metrics_summary.get("per_service") or {}
+        return {
+            **self.metrics_summary,
+            "ranked": self.metrics_summary["ranked"][:limit],
+            "per_service": {svc: per_service[svc] for svc in per_service if svc in kept},
+        }
+
+
+def fit_to_budget(render: Callable[..., str], health_summary: Dict, fitness_summary: Dict,
+                  metrics_summary: Optional[Dict], budget: Optional[int]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Render the prompt verbatim, then at successive LEVEL_LIMITS, until it fits
+    `budget` tokens (None disables compaction). `render(health, fitness,
+    metrics, indent)` builds the prompt text. Returns (prompt, stats);
+    `compaction_ratio` is original / final estimated tokens.
+    """
+    prompt = render(health_summary, fitness_summary, metrics_summary, True)
+    original = tokens = estimate_tokens(prompt)
+    level = 0
+    if budget is not None and tokens > budget:
+        compactor = PromptCompactor(health_summary, fitness_summary, metrics_summary)
+        for level, limit in enumerate(LEVEL_LIMITS, start=1):
+            prompt = render(compactor.health(limit), compactor.fitness(limit), compactor.metrics(limit), False)
+            tokens = estimate_tokens(prompt)
+            if tokens <= budget:
+                break
+    return prompt, {
+        "tokens_estimate": tokens,
+        "original_tokens": original,
+        "compaction_ratio": round(original / tokens, 2) if tokens else 1.0,
+        "budget": budget,
+        "level": level,
+        "within_budget": budget is None or tokens <= budget,
+        "chars": len(prompt),
+    }
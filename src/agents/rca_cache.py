@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class RCACache:
+    """
+    Persistent, content-addressed cache of RootCauseAgent results.
+
+    Entries are keyed on sha256(model name + prompt) and stored in SQLite with
+    a TTL and LRU eviction bounded by entry count and total payload bytes.
+    Hit/miss counters are kept per instance and exposed via `stats()`.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024):
+        self.path = Path(path or os.getenv("KRKN_RCA_CACHE", ".cache/rca_cache.sqlite"))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @staticmethod
+    def key(prompt: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if not self._ready:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            try:
+                if not self._ready:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS rca_cache ("
+                        "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                        "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS rca_cache_lru ON rca_cache(last_access)")
+                    self._ready = True
+                with conn:  # commit on success, rollback on error
+                    yield conn
+            finally:
+                conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._get(key)
+        except sqlite3.Error as e:
+            print(f"Warning: RCA cache lookup failed: {e}")
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        try:
+            self._put(key, value)
+        except sqlite3.Error as e:
+            print(f"Warning: RCA cache write failed: {e}")
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM rca_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM rca_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE rca_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def _put(self, key: str, value: Dict[str, Any]):
+        payload = json.dumps(value)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rca_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            conn.execute("DELETE FROM rca_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            # LRU eviction: keep the most recently used entries within both bounds
+            evicted = conn.execute(
+                "DELETE FROM rca_cache WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key, ROW_NUMBER() OVER w AS n, SUM(size) OVER w AS running"
+                "  FROM rca_cache WINDOW w AS (ORDER BY last_access DESC, created_at DESC)"
+                " ) WHERE n > ? OR running > ?)",
+                (self.max_entries, self.max_bytes)
+            ).rowcount
+            self.evictions += max(evicted, 0)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rca_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM rca_cache").fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
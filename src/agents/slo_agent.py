@@ -1,58 +1,92 @@
-from typing import Dict, Any, List
-from ..schema import ExperimentResult
+from typing import Dict, Any, List, Optional, Union
+from ..schema import ExperimentResult, SLODefinition
+from ..analytics.health_aggregators import SLOAggregator
+from ..analytics.slo_engine import SLOEngine, load_slo_definitions
+from ..analytics.health_stream import stream_health_csv, streams_health
 
 class SLOAgent:
     """
     Validates experiment results against SLO thresholds.
+
+    Besides the global thresholds, per-service / per-endpoint SLOs are
+    evaluated by SLOEngine when `slo_definitions` (a list or a YAML path) is
+    given or the experiment ships a `slos.yaml`.
+
+    A check counts as an error when `status_code >= 400` or `healthy` is
+    false (slo_engine.bad_event_mask), for the global error rate as for the
+    per-SLO results. Error responses count even if the CSV has no `healthy`
+    column; those reports previously showed an error rate of 0.
     """
+    name = "slo"
+    depends_on = ()
     
-    def __init__(self, error_rate_threshold: float = 0.01, latency_p99_threshold: float = 500.0):
+    def __init__(self, error_rate_threshold: float = 0.01, latency_p99_threshold: float = 500.0,
+                 chunksize: Optional[int] = None,
+                 slo_definitions: Optional[Union[str, List[SLODefinition]]] = None):
         self.error_rate_threshold = error_rate_threshold
         self.latency_p99_threshold = latency_p99_threshold
+        self.chunksize = chunksize
+        if isinstance(slo_definitions, str):
+            slo_definitions = load_slo_definitions(slo_definitions)
+        self.slo_definitions = slo_definitions
 
     def analyze(self, exp: ExperimentResult) -> Dict[str, Any]:
         """Analyze experiment against SLO thresholds."""
-        violations: List[Dict[str, Any]] = []
-        
-        health_events = exp.health_events or []
-        
-        if not health_events:
-            return {
-                "violations": [],
-                "error_rate": 0.0,
-                "status": "no_data"
-            }
-        
-        # Calculate error rate
-        total = len(health_events)
-        failures = sum(1 for e in health_events if not e.healthy)
-        error_rate = failures / total if total > 0 else 0.0
-        
-        if error_rate > self.error_rate_threshold:
-            violations.append({
-                "type": "error_rate",
-                "error_rate": error_rate,
-                "threshold": self.error_rate_threshold
-            })
-        
-        # Calculate latency stats if available
-        latencies = [e.latency_ms for e in health_events if e.latency_ms is not None]
-        latency_p99 = None
-        if latencies:
-            latencies_sorted = sorted(latencies)
-            p99_idx = int(len(latencies_sorted) * 0.99)
-            latency_p99 = latencies_sorted[min(p99_idx, len(latencies_sorted) - 1)]
-            
-            if latency_p99 > self.latency_p99_threshold:
-                violations.append({
-                    "type": "latency_p99",
-                    "latency_p99": latency_p99,
-                    "threshold": self.latency_p99_threshold
-                })
-        
-        return {
-            "violations": violations,
-            "error_rate": error_rate,
-            "latency_p99": latency_p99,
-            "status": "violated" if violations else "passed"
-        }
+        agg = SLOAggregator()
+        per_slo = None
+        if exp.health_events:
+            agg.update(exp.health_frame())
+            definitions = self._definitions(exp)
+            if definitions:
+                per_slo = SLOEngine(definitions).evaluate(exp.health_frame())
+        elif self.chunksize and streams_health(exp):
+            stream = self.stream_consumer(exp)
+            stream_health_csv(exp.raw_files["health_check_report.csv"], self.chunksize, [stream])
+            return stream.result()
+        result = self.evaluate(agg)
+        if per_slo is not None:
+            result["slo_results"] = per_slo
+        return result
+
+    def stream_consumer(self, exp: ExperimentResult) -> "_SLOStream":
+        """
+        Chunk consumer for a shared pass over the health CSV: bounded memory,
+        same result as the in-memory path (per-SLO latency quantiles come
+        from DDSketches, within 1%).
+        """
+        definitions = self._definitions(exp)
+        return _SLOStream(self, SLOEngine(definitions).accumulator() if definitions else None)
+
+    def _definitions(self, exp: ExperimentResult) -> Optional[List[SLODefinition]]:
+        if self.slo_definitions is not None:
+            return self.slo_definitions
+        path = (exp.raw_files or {}).get("slos.yaml")
+        if not path:
+            return None
+        try:
+            return load_slo_definitions(path)
+        except Exception as e:
+            print(f"Warning: could not load SLO definitions from {path}: {e}")
+            return None
+
+    def evaluate(self, agg: SLOAggregator) -> Dict[str, Any]:
+        """Turn accumulated SLO state into violations and pass/fail status."""
+        return agg.summary(self.error_rate_threshold, self.latency_p99_threshold)
+
+
+class _SLOStream:
+    def __init__(self, agent: SLOAgent, slo_acc=None):
+        self.agent = agent
+        self.agg = SLOAggregator()
+        self.slo_acc = slo_acc
+
+    def update(self, df):
+        self.agg.update(df)
+        if self.slo_acc is not None:
+            self.slo_acc.update(df)
+
+    def result(self) -> Dict[str, Any]:
+        result = self.agent.evaluate(self.agg)
+        if self.slo_acc is not None:
+            result["slo_results"] = self.slo_acc.result()
+        return result
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional
+from .prompt_budget import estimate_tokens
+
+
+class StubResponse:
+    """Minimal stand-in for a langchain AIMessage"""
+
+    def __init__(self, content: str, model_name: str, total_tokens: int):
+        self.content = content
+        self.response_metadata = {"model_name": model_name}
+        self.usage_metadata = {"total_tokens": total_tokens}
+
+
+class StubLLM:
+    """
+    Offline LLM for RootCauseAgent: returns a fixed structured RCA after
+    `latency_seconds`, optionally failing the first `fail_times` calls.
+    Supports both `invoke` and `ainvoke` like ChatGroq.
+    """
+
+    model_name = "stub-llm"
+
+    def __init__(self, latency_seconds: float = 0.0, response: Optional[Dict[str, Any]] = None, fail_times: int = 0):
+        self.latency_seconds = latency_seconds
+        self.response = response or {
+            "hypothesis": "Stub hypothesis: chaos injection degraded the targeted service",
+            "confidence": 0.5,
+            "affected_components": [],
+            "evidence": [{"file": "best_scenarios.json", "line": None, "detail": "Stub evidence"}],
+            "remediations": [{"step": "Review stub output", "impact": "low", "rationale": "Offline stub LLM"}],
+            "missing_data": ["Real LLM inference"]
+        }
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def _respond(self, prompt: str) -> StubResponse:
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError(f"Stub LLM failure {self.calls}/{self.fail_times}")
+        return StubResponse(json.dumps(self.response), self.model_name, estimate_tokens(prompt))
+
+    def invoke(self, prompt: str) -> StubResponse:
+        time.sleep(self.latency_seconds)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> StubResponse:
+        await asyncio.sleep(self.latency_seconds)
+        return self._respond(prompt)
@@ -1,7 +1,12 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
+import pandas as pd
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
+from ..models.health_table import as_health_frame
+from .failure_matrix import FailureMatrix
+from .failure_windows import failure_windows
+from .sparse_cascades import detect_sparse_cascades
 
 class AnomalyDetector:
     """ML-based anomaly detection for chaos experiments"""
@@ -33,43 +38,43 @@ class AnomalyDetector:
             "anomalous_generations": [generations[i] for i in anomaly_indices]
         }
     
-    def detect_cascade_failures(self, health_events: List[Dict]) -> Dict[str, Any]:
-        """Identify temporal correlation in service failures"""
-        from collections import defaultdict
-        import pandas as pd
-        
-        if not health_events:
+    def detect_cascade_failures(self, health_events: Union[List[Dict], pd.DataFrame],
+                                matrix: Optional[FailureMatrix] = None, method: str = "auto",
+                                dense_service_limit: int = 200) -> Dict[str, Any]:
+        """
+        Identify temporal correlation in service failures (30-second buckets).
+
+        `method="sparse"` (or "auto" with more than `dense_service_limit`
+        services) works from failure events only and reports co-failure
+        counts instead of a dense correlation matrix.
+        """
+        if health_events is None or len(health_events) == 0:
             return {"cascades": [], "correlation_matrix": None}
         
-        # Convert to DataFrame
-        df = pd.DataFrame(health_events)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['failed'] = df['status_code'] >= 400
+        events = as_health_frame(health_events)
+        if method == "auto":
+            n_services = len(matrix.services) if matrix is not None else events["service"].nunique()
+            method = "sparse" if n_services > dense_service_limit else "dense"
+        if method == "sparse":
+            result = detect_sparse_cascades(events, window="30s")
+            result["correlation_matrix"] = None
+            return result
         
-        # Time-window based correlation (30-second windows)
-        df['time_bucket'] = df['timestamp'].dt.floor('30s')
+        # Pass the experiment's cached matrix (ExperimentResult.failure_matrix()) to avoid rebuilding it
+        if matrix is None:
+            matrix = FailureMatrix.from_frame(events)
         
         # Find concurrent failures
-        cascades = []
-        for bucket, group in df[df['failed']].groupby('time_bucket'):
-            services = group['service'].unique().tolist()
-            if len(services) > 1:  # Multiple services failed together
-                cascades.append({
-                    "timestamp": str(bucket),
-                    "services": services,
-                    "count": len(services)
-                })
+        cascades = [
+            {
+                "timestamp": str(bucket),
+                "services": services,
+                "count": len(services)
+            }
+            for bucket, services in matrix.cascades(min_services=2)
+        ]
         
-        # Build correlation matrix
-        pivot = df.pivot_table(
-            index='time_bucket', 
-            columns='service', 
-            values='failed', 
-            aggfunc='max',
-            fill_value=0
-        )
-        
-        correlation_matrix = pivot.corr().to_dict() if len(pivot.columns) > 1 else {}
+        correlation_matrix = matrix.correlation().to_dict() if len(matrix.services) > 1 else {}
         
         return {
             "cascades": cascades,
@@ -77,41 +82,23 @@ class AnomalyDetector:
             "total_cascade_events": len(cascades)
         }
     
-    def detect_recovery_slowness(self, health_events: List[Dict], threshold_seconds: float = 60.0) -> List[Dict]:
+    def detect_recovery_slowness(self, health_events: Union[List[Dict], pd.DataFrame], threshold_seconds: float = 60.0) -> List[Dict]:
         """Identify services with slow recovery times"""
-        import pandas as pd
-        
-        if not health_events:
+        if health_events is None or len(health_events) == 0:
             return []
         
-        df = pd.DataFrame(health_events)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['failed'] = df['status_code'] >= 400
-        
-        slow_recoveries = []
-        
-        for service, group in df.groupby('service'):
-            group = group.sort_values('timestamp')
-            
-            # Find failure windows
-            in_failure = False
-            failure_start = None
-            
-            for idx, row in group.iterrows():
-                if row['failed'] and not in_failure:
-                    # Failure starts
-                    in_failure = True
-                    failure_start = row['timestamp']
-                elif not row['failed'] and in_failure:
-                    # Recovery detected
-                    recovery_time = (row['timestamp'] - failure_start).total_seconds()
-                    if recovery_time > threshold_seconds:
-                        slow_recoveries.append({
-                            "service": service,
-                            "failure_start": str(failure_start),
-                            "recovery_time_seconds": recovery_time,
-                            "severity": "critical" if recovery_time > 120 else "warning"
-                        })
-                    in_failure = False
-        
-        return slow_recoveries
\ No newline at end of file
+        # Every recovered failure window, from the shared run-length segmentation
+        windows = failure_windows(as_health_frame(health_events))
+        slow = windows[windows["duration_seconds"] > threshold_seconds].sort_values(["service", "start"], kind="stable")
+        
+        return [
+            {
+                "service": service,
+                "failure_start": str(start),
+                "recovery_time_seconds": float(duration),
+                "severity": "critical" if duration > 120 else "warning"
+            }
+            for service, start, duration in zip(
+                slow["service"].tolist(), slow["start"], slow["duration_seconds"].tolist()
+            )
+        ]
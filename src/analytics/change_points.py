@@ -0,0 +1,232 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import ruptures as rpt
+from ..models.health_table import as_health_frame
+
+SEARCH_METHODS = {"pelt": rpt.Pelt, "binseg": rpt.Binseg, "bottomup": rpt.BottomUp}
+METHODS = ("auto", "fast") + tuple(SEARCH_METHODS)
+AUTO_FAST_LENGTH = 500
+
+
+def _binseg_l2(signal: np.ndarray, penalty: float, min_size: int) -> List[int]:
+    """Binary segmentation under the l2 cost; every split is scored in one vectorized pass via cumsums."""
+    cs = np.concatenate([[0.0], np.cumsum(signal)])
+    cs2 = np.concatenate([[0.0], np.cumsum(signal ** 2)])
+
+    def cost(a, b):
+        return cs2[b] - cs2[a] - (cs[b] - cs[a]) ** 2 / (b - a)
+
+    breakpoints = []
+    stack = [(0, signal.size)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2 * min_size:
+            continue
+        k = np.arange(a + min_size, b - min_size + 1)
+        gain = cost(a, b) - cost(a, k) - cost(k, b)
+        best = int(np.argmax(gain))
+        if gain[best] > penalty:
+            breakpoints.append(int(k[best]))
+            stack.extend([(a, int(k[best])), (int(k[best]), b)])
+    return sorted(breakpoints)
+
+
+def segment_series(values: np.ndarray, method: str = "auto", model: str = "l2", penalty: Optional[float] = None,
+                   penalty_scale: float = 3.0, min_size: int = 2, jump: int = 1) -> List[int]:
+    """
+    Change points of a 1-D series, as the indices where a new regime starts.
+
+    Without an explicit `penalty`, a BIC-style one is used:
+    `penalty_scale * log(n) * sigma^2`, with the noise level sigma estimated
+    robustly from the median absolute first difference.
+
+    `fast` is a cumsum-based binary segmentation (l2 only, O(n log n));
+    `pelt` / `binseg` / `bottomup` use ruptures with any of its cost models
+    but are much slower on long series. `auto` picks `fast` for l2 series
+    longer than AUTO_FAST_LENGTH, else `pelt`.
+    """
+    signal = np.asarray(values, dtype=float)
+    if signal.size < 2 * min_size:
+        return []
+    if penalty is None:
+        diffs = np.diff(signal)
+        sigma = 1.4826 * np.median(np.abs(diffs - np.median(diffs))) / math.sqrt(2)
+        if sigma == 0:
+            sigma = diffs.std() / math.sqrt(2)
+        if sigma == 0:
+            return []  # constant series
+        penalty = penalty_scale * math.log(signal.size) * sigma ** 2
+    if method == "auto":
+        method = "fast" if model == "l2" and signal.size > AUTO_FAST_LENGTH else "pelt"
+    if method == "fast":
+        if model != "l2":
+            raise ValueError("The fast change-point method only supports the l2 model")
+        return _binseg_l2(signal, penalty, min_size)
+    algo = SEARCH_METHODS[method](model=model, min_size=min_size, jump=jump).fit(signal)
+    return [int(b) for b in algo.predict(pen=penalty)[:-1]]  # last breakpoint is always len(signal)
+
+
+def _segment_task(task: Tuple[str, str, np.ndarray, Dict[str, Any]]) -> Tuple[str, str, List[int]]:
+    key, metric, values, options = task
+    return key, metric, segment_series(values, **options)
+
+
+def _label(value):
+    return int(value) if isinstance(value, (int, np.integer)) else str(value)
+
+
+def _regimes(values: np.ndarray, breakpoints: List[int], index) -> List[Dict[str, Any]]:
+    bounds = [0] + breakpoints + [len(values)]
+    return [
+        {
+            "start": _label(index[lo]),
+            "end": _label(index[hi - 1]),
+            "mean": float(np.nanmean(values[lo:hi])),
+            "points": int(hi - lo),
+        }
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+class ChangePointDetector:
+    """
+    Segments health and fitness series into regimes with `ruptures`.
+
+    Per-service latency (mean per bucket) and error-rate series are built
+    with one vectorized pass over the health events, then segmented; with
+    many series in a ruptures mode the work is spread over a process pool. Chaos injection
+    start and recovery are read off the regimes: the first regime clearly
+    worse than the baseline (first) regime, and the next one back near it.
+    """
+
+    def __init__(self, method: str = "auto", model: str = "l2", penalty: Optional[float] = None,
+                 penalty_scale: float = 3.0, min_size: int = 2, bucket: str = "10s",
+                 error_rate_jump: float = 0.1, latency_ratio: float = 1.5,
+                 max_workers: Optional[int] = None, parallel_threshold: int = 16):
+        if method not in METHODS:
+            raise ValueError(f"Unknown change-point method {method!r}; expected one of {list(METHODS)}")
+        self.options = {"method": method, "model": model, "penalty": penalty,
+                        "penalty_scale": penalty_scale, "min_size": min_size}
+        self.bucket = bucket
+        self.error_rate_jump = error_rate_jump
+        self.latency_ratio = latency_ratio
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+
+    def segment(self, values, index=None) -> Dict[str, Any]:
+        """Breakpoints and per-regime means of a single series."""
+        values = np.asarray(values, dtype=float)
+        index = index if index is not None else np.arange(values.size)
+        breakpoints = segment_series(values, **self.options)
+        return {
+            "breakpoints": [_label(index[b]) for b in breakpoints],
+            "regimes": _regimes(values, breakpoints, index) if values.size else [],
+        }
+
+    def service_series(self, health_events) -> Tuple[pd.DatetimeIndex, List[str], np.ndarray, np.ndarray]:
+        """(buckets, services, latency[bucket, service], error_rate[bucket, service]); gaps are filled forward."""
+        df = as_health_frame(health_events)
+        ts = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]")
+        valid = ~np.isnat(ts)
+        codes, names = pd.factorize(df["service"], use_na_sentinel=False)
+        step = pd.Timedelta(self.bucket).value
+        bucket = ts[valid].astype(np.int64) // step
+        if bucket.size == 0:
+            return pd.DatetimeIndex([]), [], np.zeros((0, 0)), np.zeros((0, 0))
+        origin = bucket.min()
+        rows = bucket - origin
+        shape = (int(rows.max()) + 1, len(names))
+        cell = rows * shape[1] + codes[valid]
+
+        failed = (df["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)[valid]
+        latency = df["latency_ms"].to_numpy(dtype=float, na_value=np.nan)[valid]
+        has_latency = ~np.isnan(latency)
+        total = np.bincount(cell, minlength=shape[0] * shape[1]).reshape(shape)
+        bad = np.bincount(cell, weights=failed, minlength=total.size).reshape(shape)
+        lat_sum = np.bincount(cell[has_latency], weights=latency[has_latency], minlength=total.size).reshape(shape)
+        lat_n = np.bincount(cell[has_latency], minlength=total.size).reshape(shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            error_rate = pd.DataFrame(np.where(total > 0, bad / total, np.nan)).ffill().bfill().to_numpy()
+            latency_mean = pd.DataFrame(np.where(lat_n > 0, lat_sum / lat_n, np.nan)).ffill().bfill().to_numpy()
+        index = pd.DatetimeIndex(((origin + np.arange(shape[0])) * step).astype("datetime64[ns]"))
+        return index, [str(n) for n in names], latency_mean, error_rate
+
+    def _segment_many(self, series: Dict[Tuple[str, str], np.ndarray]) -> Dict[Tuple[str, str], List[int]]:
+        tasks = [(key, metric, values, self.options) for (key, metric), values in series.items()]
+        workers = self.max_workers or os.cpu_count() or 1
+        # The cumsum-based fast mode is cheaper than shipping series to worker processes
+        longest = max((values.size for values in series.values()), default=0)
+        inline = self.options["method"] == "fast" or (
+            self.options["method"] == "auto" and self.options["model"] == "l2" and longest > AUTO_FAST_LENGTH)
+        if inline or len(tasks) < self.parallel_threshold or workers == 1:
+            results = map(_segment_task, tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_segment_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        return {(key, metric): breakpoints for key, metric, breakpoints in results}
+
+    def detect_services(self, health_events) -> Dict[str, Any]:
+        """Latency and error-rate regimes per service, plus detected chaos injection/recovery."""
+        index, services, latency, error_rate = self.service_series(health_events)
+        series = {}
+        for col, svc in enumerate(services):
+            if not np.isnan(latency[:, col]).all():
+                series[(svc, "latency")] = latency[:, col]
+            series[(svc, "error_rate")] = error_rate[:, col]
+        breakpoints = self._segment_many(series)
+
+        per_service: Dict[str, Any] = {}
+        for svc in services:
+            out = {}
+            for metric in ("latency", "error_rate"):
+                if (svc, metric) in series:
+                    values, bps = series[(svc, metric)], breakpoints[(svc, metric)]
+                    out[metric] = {"breakpoints": [_label(index[b]) for b in bps],
+                                   "regimes": _regimes(values, bps, index)}
+            out["chaos"] = self._chaos_window(out)
+            per_service[svc] = out
+
+        starts = [s["chaos"]["injection_start"] for s in per_service.values() if s["chaos"]["injection_start"]]
+        recoveries = [s["chaos"]["recovery"] for s in per_service.values() if s["chaos"]["recovery"]]
+        return {
+            "bucket": self.bucket,
+            "services": per_service,
+            "chaos_window": {
+                "injection_start": min(starts) if starts else None,
+                "recovery": max(recoveries) if recoveries else None,
+            },
+        }
+
+    def _chaos_window(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """First regime clearly worse than the baseline, and the next one back near baseline."""
+        checks = [
+            ("error_rate", lambda base, m: m > base + self.error_rate_jump,
+             lambda base, m: m <= base + self.error_rate_jump / 2),
+            ("latency", lambda base, m: m > base * self.latency_ratio,
+             lambda base, m: m <= base * (1 + (self.latency_ratio - 1) / 2)),
+        ]
+        for metric, degraded, recovered in checks:
+            regimes = metrics.get(metric, {}).get("regimes", [])
+            if len(regimes) < 2:
+                continue
+            base = regimes[0]["mean"]
+            for i, regime in enumerate(regimes[1:], 1):
+                if degraded(base, regime["mean"]):
+                    recovery = next((r["start"] for r in regimes[i + 1:] if recovered(base, r["mean"])), None)
+                    return {"injection_start": regime["start"], "recovery": recovery, "signal": metric}
+        return {"injection_start": None, "recovery": None, "signal": None}
+
+    def detect_fitness(self, fitness_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Regimes of the per-generation best and average fitness from FitnessAgent."""
+        per_generation = fitness_summary.get("per_generation") or {}
+        # Keys are ints from FitnessAgent but strings once a report went through JSON
+        generations = sorted(per_generation, key=int)
+        return {
+            metric: self.segment([per_generation[g][metric] for g in generations],
+                                 index=[int(g) for g in generations])
+            for metric in ("best", "avg")
+        }
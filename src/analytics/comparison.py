@@ -0,0 +1,212 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..agents.root_cause_agent import RootCauseAgent
+from ..agents.stub_llm import StubLLM
+from ..loaders.krkn_loader import KrknResultsLoader
+from ..orchestrator import Orchestrator
+from ..serialization import dumps_bytes, load
+
+# Comparable per-experiment metrics -> True when lower is better (used for ranking)
+METRICS = {
+    "best_fitness": True,      # lower fitness = more effective chaos
+    "avg_fitness": True,
+    "scenarios": False,
+    "generations": True,       # fewer generations = faster convergence
+    "failures": True,
+    "failing_services": True,
+    "mttr_seconds": True,
+    "slo_violations": True,
+    "error_rate": True,
+    "latency_p99": True,
+}
+RANKED = ("best_fitness", "failures", "mttr_seconds", "slo_violations", "generations")
+
+
+def _load_error(path: str, e: Exception) -> Tuple[str, Dict[str, Any]]:
+    """Stand-in analysis for an input that could not be loaded; compared as a row of missing metrics."""
+    return Path(path).name, {"load_error": f"{type(e).__name__}: {e}", "path": path}
+
+
+def _analyze_path(path: str, stub_llm: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """
+    Load and analyze one experiment directory (runs in a worker process).
+    A missing directory, or one without scenario, fitness or health data, is
+    a load error rather than an empty experiment that would rank first.
+    """
+    try:
+        if not Path(path).is_dir():
+            raise FileNotFoundError(f"No experiment directory at {path}")
+        root_agent = RootCauseAgent(llm=StubLLM()) if stub_llm else None
+        exp = KrknResultsLoader(path).load()
+        if not (exp.scenarios or len(exp.fitness) or len(exp.health_events)
+                or "health_check_report.csv" in exp.raw_files):
+            raise FileNotFoundError(f"No best_scenarios.json, fitness or health data in {path}")
+        return exp.metadata.experiment_id, Orchestrator(root_agent=root_agent).analyze_experiment(exp)
+    except Exception as e:
+        return _load_error(path, e)
+
+
+def _read_report(path: str) -> Tuple[str, Dict[str, Any]]:
+    try:
+        report = load(path)
+        return report["metadata"]["experiment_id"], report["analysis"]
+    except Exception as e:
+        return _load_error(path, e)
+
+
+def load_analyses(paths: Iterable[str], workers: Optional[int] = None,
+                  stub_llm: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    {experiment_id: analysis} for experiment directories and/or JSON reports.
+
+    Directories are loaded and analyzed on a process pool; report files
+    (Reports page exports or `src.batch` output) are only parsed, on a
+    thread pool. Results keep the order of `paths`. An input that fails to
+    load is returned as {"load_error": ..., "path": ...} under its file name
+    instead of aborting the others.
+    """
+    paths = [str(p) for p in paths]
+    reports = [p for p in paths if Path(p).is_file()]
+    dirs = [p for p in paths if not Path(p).is_file()]
+    out: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    if reports:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            out.update(zip(reports, pool.map(_read_report, reports)))
+    if len(dirs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            out.update(zip(dirs, pool.map(_analyze_path, dirs, [stub_llm] * len(dirs))))
+    else:
+        out.update((p, _analyze_path(p, stub_llm)) for p in dirs)
+    analyses = dict(out[p] for p in paths)
+    if len(analyses) < len(paths):
+        print(f"Warning: {len(paths) - len(analyses)} inputs share an experiment id with another; keeping the last")
+    return analyses
+
+
+def analysis_digest(analysis: Dict[str, Any]) -> str:
+    """Content hash of an analysis, for detecting changed inputs without relying on object identity."""
+    return hashlib.sha256(dumps_bytes(analysis, sort_keys=True)).hexdigest()
+
+
+class ComparisonEngine:
+    """
+    Compares any number of analyzed experiments in one pass.
+
+    Per-generation fitness stats of all experiments are stacked into a
+    single long table (experiment, generation, best, avg, worst, count),
+    from which generation-aligned matrices and per-experiment aggregates are
+    derived with groupby/pivot. Scalar health/SLO metrics form one row per
+    experiment; deltas are taken against `baseline` (default: the first
+    experiment) and every metric is ranked (1 = best) with an overall rank
+    averaged over RANKED. Inputs that failed to load (see load_analyses)
+    are kept as rows with missing metrics and their `load_error`, ranked last.
+    """
+
+    def __init__(self, baseline: Optional[str] = None):
+        self.baseline = baseline
+
+    @staticmethod
+    def generation_table(analyses: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        rows = [
+            (exp_id, int(gen), stats["best"], stats["avg"], stats["worst"], stats["count"])
+            for exp_id, analysis in analyses.items()
+            for gen, stats in (analysis.get("fitness", {}).get("per_generation") or {}).items()
+        ]
+        table = pd.DataFrame(rows, columns=["experiment", "generation", "best", "avg", "worst", "count"])
+        table["experiment"] = pd.Categorical(table["experiment"], categories=list(analyses))
+        return table.sort_values(["experiment", "generation"], kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _scalar_metrics(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        health = analysis.get("health", {})
+        slo = analysis.get("slo", {})
+        failure_counts = health.get("failure_counts") or {}
+        return {
+            "failures": sum(failure_counts.values()),
+            "failing_services": sum(1 for c in failure_counts.values() if c),
+            "mttr_seconds": ComparisonEngine._mttr(health, failure_counts),
+            "slo_violations": len(slo.get("violations") or []),
+            "error_rate": slo.get("error_rate", np.nan),
+            "latency_p99": slo.get("latency_p99", np.nan),
+            "slo_status": slo.get("status", "unknown"),
+        }
+
+    @staticmethod
+    def _mttr(health: Dict[str, Any], failure_counts: Dict[str, int]) -> float:
+        """
+        Mean time to recovery over every recovered outage, so services that
+        never failed (MTTR 0) do not pull the average down. 0.0 without any
+        failures, NaN when nothing recovered.
+        """
+        stats = health.get("mttr_stats") or {}
+        windows = sum(s.get("windows", 0) for s in stats.values())
+        if windows:
+            return sum(s["mean"] * s.get("windows", 0) for s in stats.values()) / windows
+        recovered = [m for m in (health.get("mttr_seconds") or {}).values() if m]  # reports without mttr_stats
+        if recovered:
+            return float(np.mean(recovered))
+        return np.nan if sum(failure_counts.values()) else 0.0
+
+    def compare(self, analyses: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        if not analyses:
+            raise ValueError("Nothing to compare")
+        ids = list(analyses)
+        failed = [i for i in ids if "load_error" in analyses[i]]
+        loaded = [i for i in ids if i not in failed]
+        if not loaded:
+            raise ValueError("Nothing to compare: every input failed to load")
+        baseline = self.baseline if self.baseline in loaded else loaded[0]
+        generations = self.generation_table(analyses)
+
+        weighted = generations.assign(total=generations["avg"] * generations["count"])
+        per_exp = weighted.groupby("experiment", observed=False).agg(
+            best_fitness=("best", "min"), total=("total", "sum"), scenarios=("count", "sum"),
+            generations=("generation", "nunique"))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_exp["avg_fitness"] = per_exp["total"] / per_exp["scenarios"]
+        scalars = pd.DataFrame.from_dict({i: self._scalar_metrics(analyses[i]) for i in ids}, orient="index")
+        metrics = per_exp.drop(columns="total").join(scalars)
+        metrics.index = pd.Index(ids, name="experiment")
+        metrics = metrics[list(METRICS) + ["slo_status"]]
+        metrics["load_error"] = [analyses[i].get("load_error") for i in ids]
+        metrics.loc[failed, list(METRICS)] = np.nan
+        metrics.loc[failed, "slo_status"] = "load_error"
+
+        numeric = metrics[list(METRICS)].astype(float)
+        deltas = numeric - numeric.loc[baseline]
+        ranks = pd.DataFrame({
+            m: numeric[m].rank(ascending=lower, method="min", na_option="bottom")
+            for m, lower in METRICS.items()
+        }).astype(int)
+        ranks["overall"] = ranks[list(RANKED)].mean(axis=1)
+        ranks = ranks.sort_values("overall", kind="stable")
+
+        return {
+            "baseline": baseline,
+            "metrics": metrics,
+            "deltas": deltas,
+            "ranks": ranks,
+            "generations": generations,
+            "fitness_avg": generations.pivot(index="generation", columns="experiment", values="avg").reindex(columns=ids),
+            "fitness_best": generations.pivot(index="generation", columns="experiment", values="best").reindex(columns=ids),
+        }
+
+
+def comparison_to_dict(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-ready form of a `ComparisonEngine.compare` result (NaN -> None)."""
+    def records(frame: pd.DataFrame, orient: str) -> Any:
+        frame = frame.astype(object).where(frame.notna(), None)
+        return frame.to_dict(orient=orient)
+
+    return {
+        "baseline": result["baseline"],
+        "ranking": list(result["ranks"].index),
+        "metrics": records(result["metrics"], "index"),
+        "deltas": records(result["deltas"], "index"),
+        "ranks": records(result["ranks"], "index"),
+        "generations": records(result["generations"].astype({"experiment": str}), "records"),
+    }
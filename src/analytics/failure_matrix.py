@@ -0,0 +1,131 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class FailureMatrix:
+    """
+    Service x time-bucket failure matrix shared by cascade detection, the
+    correlation heatmap and HealthAgent.
+
+    Rows are the time buckets that contain any health check, columns the
+    services (sorted by name); a cell holds the number of failed checks
+    (`status_code >= 400`) of that service in that bucket. `update` folds in
+    DataFrame chunks as (bucket, service) cell counts, so memory follows the
+    number of non-empty cells; the matrix itself is built once on first use.
+    Use `ExperimentResult.failure_matrix()` for the per-experiment cached copy.
+    """
+
+    def __init__(self, bucket: str = "30s"):
+        self.bucket = bucket
+        self._step = pd.Timedelta(bucket).value
+        self._service_index: Dict[str, int] = {}
+        self._parts: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._built: Optional[Tuple[pd.DatetimeIndex, List[str], np.ndarray]] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, bucket: str = "30s") -> "FailureMatrix":
+        matrix = cls(bucket)
+        matrix.update(df)
+        return matrix
+
+    def update(self, df: pd.DataFrame):
+        if len(df) == 0:
+            return
+        ts = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]")
+        valid = ~np.isnat(ts)
+        codes, names = pd.factorize(df["service"], use_na_sentinel=False)
+        remap = np.array([self._service_index.setdefault(str(n), len(self._service_index)) for n in names],
+                         dtype=np.int64)
+        failed = (df["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+
+        bucket = ts[valid].astype(np.int64) // self._step
+        service = remap[codes[valid]]
+        # Collapse the chunk to unique (bucket, service) cells with their failure counts
+        n_services = len(self._service_index)
+        cells, inverse = np.unique(bucket * n_services + service, return_inverse=True)
+        counts = np.bincount(inverse, weights=failed[valid], minlength=cells.size)
+        self._parts.append(((cells // n_services) * self._step, cells % n_services, counts.astype(np.int64)))
+        self._built = None
+
+    def _build(self) -> Tuple[pd.DatetimeIndex, List[str], np.ndarray]:
+        if self._built is None:
+            names = list(self._service_index)
+            order = sorted(range(len(names)), key=names.__getitem__)
+            column = np.empty(len(names), dtype=np.int64)
+            column[order] = np.arange(len(names))
+            if self._parts:
+                bucket_ns = np.concatenate([p[0] for p in self._parts])
+                service = np.concatenate([p[1] for p in self._parts])
+                counts = np.concatenate([p[2] for p in self._parts])
+            else:
+                bucket_ns = service = counts = np.zeros(0, dtype=np.int64)
+            buckets, row = np.unique(bucket_ns, return_inverse=True)
+            matrix = np.zeros((buckets.size, len(names)), dtype=np.int32)
+            np.add.at(matrix, (row, column[service]), counts)
+            self._built = (pd.DatetimeIndex(buckets.astype("datetime64[ns]"), name="time_bucket"),
+                           [names[i] for i in order], matrix)
+        return self._built
+
+    @property
+    def step_seconds(self) -> float:
+        return self._step / 1e9
+
+    @property
+    def buckets(self) -> pd.DatetimeIndex:
+        return self._build()[0]
+
+    @property
+    def services(self) -> List[str]:
+        return self._build()[1]
+
+    def counts(self, sparse: bool = False):
+        """Failed-check counts per (bucket, service); a scipy CSR matrix when `sparse`."""
+        matrix = self._build()[2]
+        if sparse:
+            from scipy.sparse import csr_matrix
+            return csr_matrix(matrix)
+        return matrix
+
+    def failed(self) -> np.ndarray:
+        """0/1 matrix: did the service fail at least once in the bucket."""
+        return (self._build()[2] > 0).astype(np.int8)
+
+    def timeline(self) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """0/1 matrix on a regular grid from the first to the last bucket (gaps filled with 0)."""
+        buckets, _, _ = self._build()
+        failed = self.failed()
+        if len(buckets) == 0:
+            return buckets, failed
+        ns = buckets.asi8
+        rows = (ns - ns[0]) // self._step
+        grid = np.zeros((int(rows[-1]) + 1, failed.shape[1]), dtype=np.int8)
+        grid[rows] = failed
+        index = pd.DatetimeIndex((ns[0] + np.arange(grid.shape[0]) * self._step).astype("datetime64[ns]"),
+                                 name="time_bucket")
+        return index, grid
+
+    def to_frame(self) -> pd.DataFrame:
+        """The 0/1 matrix as a DataFrame (index time_bucket, one column per service)."""
+        buckets, services, _ = self._build()
+        return pd.DataFrame(self.failed(), index=buckets, columns=pd.Index(services, name="service"))
+
+    def cascades(self, min_services: int = 2) -> List[Tuple[pd.Timestamp, List[str]]]:
+        """Buckets in which at least `min_services` services failed, in time order."""
+        buckets, services, _ = self._build()
+        failed = self.failed()
+        rows = np.flatnonzero(failed.sum(axis=1) >= min_services)
+        return [(buckets[r], [services[c] for c in np.flatnonzero(failed[r])]) for r in rows]
+
+    def correlation(self) -> pd.DataFrame:
+        """Pearson correlation of the 0/1 failure series of every service pair (one matrix product)."""
+        buckets, services, _ = self._build()
+        x = self.failed().astype(np.float64)
+        centered = x - x.mean(axis=0) if len(buckets) else x
+        cov = centered.T @ centered
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        corr[np.outer(std, std) == 0] = np.nan  # constant series have no correlation, as in DataFrame.corr
+        index = pd.Index(services, name="service")
+        return pd.DataFrame(corr, index=index, columns=index)
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+def failure_windows(df: pd.DataFrame, open_since: Optional[Dict[str, pd.Timestamp]] = None) -> pd.DataFrame:
+    """
+    Run-length segmentation of health status into failure windows.
+
+    Events are ordered by (service, timestamp) and split into runs of equal
+    status with diff/cumsum; every failing run becomes a window from its first
+    failed check to the next healthy check of the same service (`end`), or an
+    open window (`end` = NaT) when the service never recovers. A check fails
+    when `status_code >= 400`.
+
+    `open_since` carries failure windows still open from an earlier chunk
+    (service -> start) so chunked input segments like the concatenated frame.
+    Cost is a single sort, which is linear when events are already time ordered.
+    """
+    if len(df):
+        codes, names = pd.factorize(df["service"], use_na_sentinel=False)
+        ts = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]")
+        failed = (df["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+    else:
+        codes, names = np.zeros(0, dtype=np.intp), []
+        ts, failed = np.array([], dtype="datetime64[ns]"), np.zeros(0, dtype=bool)
+    names = [str(n) for n in names]
+    valid = ~np.isnat(ts)
+    codes, ts, failed = codes[valid], ts[valid], failed[valid]
+
+    if open_since:
+        # A carried-over window behaves like a failed check at its start time
+        index = {svc: i for i, svc in enumerate(names)}
+        for svc in open_since:
+            index.setdefault(svc, len(names))
+            if len(names) < len(index):
+                names.append(svc)
+        codes = np.concatenate([np.array([index[svc] for svc in open_since], dtype=codes.dtype), codes])
+        ts = np.concatenate([np.asarray(list(open_since.values()), dtype="datetime64[ns]"), ts])
+        failed = np.concatenate([np.ones(len(open_since), dtype=bool), failed])
+    if ts.size == 0:
+        return pd.DataFrame({
+            "service": pd.Series(dtype=object),
+            "start": pd.Series(dtype="datetime64[ns]"),
+            "end": pd.Series(dtype="datetime64[ns]"),
+            "duration_seconds": pd.Series(dtype=float),
+        })
+
+    ts_ns = ts.astype(np.int64)
+    if np.all(ts_ns[1:] >= ts_ns[:-1]):
+        order = np.argsort(codes, kind="stable")  # already time ordered: stable sort by service only
+    else:
+        order = np.lexsort((ts_ns, codes))
+    codes, ts_ns, failed = codes[order], ts_ns[order], failed[order]
+
+    # A new run starts at the first row, at every service change and at every status change
+    run_start = np.ones(codes.size, dtype=bool)
+    run_start[1:] = (codes[1:] != codes[:-1]) | (failed[1:] != failed[:-1])
+    starts = np.flatnonzero(run_start & failed)
+    run_id = np.cumsum(run_start)
+    run_len = np.bincount(run_id)[run_id[starts]]
+    after = starts + run_len  # first row after each failing run
+    recovered = after < codes.size
+    recovered[recovered] = codes[after[recovered]] == codes[starts[recovered]]
+
+    end = np.full(starts.size, np.iinfo(np.int64).min, dtype=np.int64)  # NaT
+    end[recovered] = ts_ns[after[recovered]]
+    duration = np.where(recovered, (end - ts_ns[starts]) / 1e9, np.nan)
+    return pd.DataFrame({
+        "service": np.asarray(names, dtype=object)[codes[starts]],
+        "start": ts_ns[starts].astype("datetime64[ns]"),
+        "end": end.astype("datetime64[ns]"),
+        "duration_seconds": duration,
+    })
+
+
+def mttr_stats(windows: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Per-service recovery statistics over closed failure windows."""
+    closed = windows[windows["end"].notna()]
+    stats: Dict[str, Dict[str, Any]] = {}
+    for svc, durations in closed.groupby("service", sort=True)["duration_seconds"]:
+        values = durations.to_numpy()
+        stats[svc] = {
+            "windows": int(values.size),
+            "mean": float(values.mean()),
+            "median": float(np.median(values)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+    return stats
@@ -0,0 +1,160 @@
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from .failure_matrix import FailureMatrix
+from .failure_windows import failure_windows, mttr_stats
+from .quantile_sketch import DDSketch
+from .slo_engine import bad_event_mask
+
+LATENCY_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}
+
+
+class HealthAggregator:
+    """
+    Incremental state behind HealthAgent: failure counts, per-service failure
+    windows (MTTR), and services failing together per time bucket (read from
+    a FailureMatrix; pass the experiment's cached one as `matrix` to reuse it).
+
+    Feed it DataFrame chunks with `update`; memory grows with the number of
+    services, failure windows and non-empty (bucket, service) cells, not with
+    the number of rows. Failure windows spanning chunks are carried over, which assumes
+    each service's checks arrive in time order across chunks (as in a
+    health-check log).
+    """
+
+    def __init__(self, bucket: str = "30s", max_cascades: int = 10, matrix: Optional[FailureMatrix] = None):
+        self.bucket = bucket
+        self.max_cascades = max_cascades
+        self.matrix = matrix if matrix is not None else FailureMatrix(bucket)
+        self._owns_matrix = matrix is None
+        self.services: Dict[str, None] = {}
+        self.failure_counts: Dict[str, int] = {}
+        self.windows: List[pd.DataFrame] = []
+        self.open_failures: Dict[str, pd.Timestamp] = {}
+        # First/last failed check per service as health_check_report.csv rows (header = row 1)
+        self.failed_rows: Dict[str, List[int]] = {}
+        self.rows_seen = 0
+
+    def update(self, df: pd.DataFrame):
+        if len(df) == 0:
+            return
+        offset, self.rows_seen = self.rows_seen, self.rows_seen + len(df)
+        for svc in pd.unique(df["service"]):
+            self.services.setdefault(svc, None)
+        if self._owns_matrix:
+            self.matrix.update(df)
+
+        windows = failure_windows(df, self.open_failures)
+        is_open = windows["end"].isna().to_numpy()
+        self.open_failures = dict(zip(windows["service"][is_open], windows["start"][is_open]))
+        if not is_open.all():
+            self.windows.append(windows[~is_open])
+
+        failed = (df["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+        fail_df = df[failed]
+        if fail_df.empty:
+            return
+        counts = fail_df["service"].value_counts(sort=False)
+        for svc, n in counts[counts > 0].items():
+            self.failure_counts[svc] = self.failure_counts.get(svc, 0) + int(n)
+        rows = pd.Series(np.flatnonzero(failed) + offset + 2).groupby(fail_df["service"].to_numpy()).agg(["min", "max"])
+        for svc, first, last in rows.itertuples():
+            span = self.failed_rows.setdefault(svc, [int(first), int(last)])
+            span[1] = int(last)
+
+    def summary(self) -> Dict[str, Any]:
+        windows = pd.concat(self.windows, ignore_index=True) if self.windows else failure_windows(pd.DataFrame())
+        stats = mttr_stats(windows)
+        # Mean time from first failed check to the next healthy one, over every outage
+        mttr = {svc: stats[svc]["mean"] if svc in stats else 0.0 for svc in sorted(self.services)}
+        cascades = [services for _, services in self.matrix.cascades(min_services=2)]
+        return {
+            "failure_counts": {svc: self.failure_counts[svc] for svc in sorted(self.failure_counts)},
+            "mttr_seconds": mttr,
+            "mttr_stats": stats,
+            "open_failures": {svc: str(self.open_failures[svc]) for svc in sorted(self.open_failures)},
+            "cascade_samples": cascades[:self.max_cascades],
+            "failed_rows": {svc: f"rows {first}-{last}" if last > first else f"row {first}"
+                            for svc, (first, last) in sorted(self.failed_rows.items())},
+        }
+
+
+class SLOAggregator:
+    """
+    Incremental state behind SLOAgent: row and bad-event counts plus global
+    and per-service latency DDSketches. Memory is bounded regardless of row
+    count, and aggregators merge across chunks, files and experiments.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.total = 0
+        self.failures = 0
+        self.latency_sketch = DDSketch(relative_accuracy)
+        self.service_sketches: Dict[str, DDSketch] = {}
+
+    def update(self, df: pd.DataFrame):
+        self.total += len(df)
+        self.failures += int(bad_event_mask(df).sum())  # same rule as SLOEngine
+        lat = df["latency_ms"].to_numpy(dtype=float, na_value=np.nan)
+        has_latency = ~np.isnan(lat)
+        if not has_latency.any():
+            return
+        self.latency_sketch.add(lat[has_latency])
+        codes, services = pd.factorize(df["service"].to_numpy()[has_latency])
+        values = lat[has_latency]
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        for svc_idx, part in zip(np.unique(codes), np.split(values[order], bounds)):
+            sketch = self.service_sketches.setdefault(services[svc_idx], DDSketch(self.relative_accuracy))
+            sketch.add(part)
+
+    def merge(self, other: "SLOAggregator"):
+        """Fold another aggregator (another chunk, file or experiment) into this one."""
+        self.total += other.total
+        self.failures += other.failures
+        self.latency_sketch.merge(other.latency_sketch)
+        for svc, sketch in other.service_sketches.items():
+            self.service_sketches.setdefault(svc, DDSketch(self.relative_accuracy)).merge(sketch)
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.total if self.total > 0 else 0.0
+
+    def latency_quantile(self, q: float):
+        """Nearest-rank quantile estimate within the sketch's relative accuracy."""
+        return self.latency_sketch.quantile(q)
+
+    def summary(self, error_rate_threshold: float, latency_p99_threshold: float) -> Dict[str, Any]:
+        if self.total == 0:
+            return {
+                "violations": [],
+                "error_rate": 0.0,
+                "status": "no_data"
+            }
+        violations: List[Dict[str, Any]] = []
+        error_rate = self.error_rate
+        if error_rate > error_rate_threshold:
+            violations.append({
+                "type": "error_rate",
+                "error_rate": error_rate,
+                "threshold": error_rate_threshold
+            })
+        latency_p99 = self.latency_quantile(0.99)
+        if latency_p99 is not None and latency_p99 > latency_p99_threshold:
+            violations.append({
+                "type": "latency_p99",
+                "latency_p99": latency_p99,
+                "threshold": latency_p99_threshold
+            })
+        return {
+            "violations": violations,
+            "error_rate": error_rate,
+            "latency_p99": latency_p99,
+            "latency_quantiles": self.latency_sketch.quantiles(LATENCY_QUANTILES),
+            "per_service_latency": {
+                svc: self.service_sketches[svc].quantiles(LATENCY_QUANTILES)
+                for svc in sorted(self.service_sketches)
+            },
+            "status": "violated" if violations else "passed"
+        }
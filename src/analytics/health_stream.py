@@ -0,0 +1,31 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+from ..parsers.health_parser import HealthParser
+from ..schema import ExperimentResult
+
+HEALTH_CSV = "health_check_report.csv"
+
+
+def streams_health(exp: ExperimentResult) -> bool:
+    """True when the experiment's health CSV was registered but not loaded (stream_health=True)."""
+    return not exp.health_events and bool((exp.raw_files or {}).get(HEALTH_CSV))
+
+
+def stream_health_csv(csv_path: Union[str, Path], chunksize: int, consumers: Iterable) -> None:
+    """Read the health CSV once in chunks of `chunksize` rows, handing every chunk to each consumer's `update`."""
+    consumers = list(consumers)
+    for table in HealthParser().iter_chunks(csv_path, chunksize):
+        for consumer in consumers:
+            consumer.update(table.frame)
+
+
+def analyze_health_csv(exp: ExperimentResult, agents: Iterable, chunksize: int = 250_000) -> Dict[str, Any]:
+    """
+    Single streaming pass over an experiment's health CSV feeding every agent
+    that consumes it (HealthAgent, SLOAgent, MetricsAgent), so the file is
+    read once however many agents need it. Peak memory is bounded by
+    `chunksize`, not file size. Returns {agent name: result}.
+    """
+    consumers = {agent.name: agent.stream_consumer(exp) for agent in agents}
+    stream_health_csv(exp.raw_files[HEALTH_CSV], chunksize, consumers.values())
+    return {name: consumer.result() for name, consumer in consumers.items()}
@@ -0,0 +1,182 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import IsolationForest
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from ..schema import ExperimentResult
+from .failure_windows import failure_windows, mttr_stats
+
+CATEGORICAL_FEATURES = ["scenario_type"]
+BASE_NUMERIC_FEATURES = [
+    "generation", "fitness_score",
+    "health_error_rate", "health_failing_services", "health_latency_p99", "health_mttr_seconds",
+]
+MODEL_FILE = re.compile(r"^anomaly-v(\d+)\.joblib$")
+
+
+def scenario_features(exp: ExperimentResult) -> pd.DataFrame:
+    """
+    One feature row per fitness record: scenario type, numeric config
+    parameters (`cfg_<key>`), the scenario's generation and fitness score,
+    and the experiment's health impact (error rate, failing services, p99
+    latency, mean MTTR). Health events are not attributed to individual
+    scenarios, so the health columns are shared by an experiment's rows.
+    """
+    fitness = exp.fitness_frame()
+    scenarios = {s.id: s for s in exp.scenarios}
+    rows = []
+    for scenario_id in fitness["scenario_id"].astype(str):
+        scenario = scenarios.get(scenario_id)
+        row = {"scenario_type": scenario.scenario_type if scenario else "unknown"}
+        for key, value in (scenario.raw_config if scenario else {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                row[f"cfg_{key}"] = float(value)
+        rows.append(row)
+    features = pd.DataFrame(rows, index=fitness.index)
+    features["generation"] = fitness["generation"].astype(float)
+    features["fitness_score"] = fitness["fitness_score"].astype(float)
+
+    health = exp.health_frame() if exp.health_events else None
+    if health is not None and len(health):
+        failed = (health["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+        latency = health["latency_ms"].to_numpy(dtype=float, na_value=np.nan)
+        stats = mttr_stats(failure_windows(health))
+        features["health_error_rate"] = float(failed.mean())
+        features["health_failing_services"] = float(health["service"][failed].nunique())
+        features["health_latency_p99"] = float(np.nanpercentile(latency, 99)) if (~np.isnan(latency)).any() else np.nan
+        features["health_mttr_seconds"] = float(np.mean([s["mean"] for s in stats.values()])) if stats else 0.0
+    else:
+        for column in BASE_NUMERIC_FEATURES[2:]:
+            features[column] = np.nan
+    return features
+
+
+class ModelRegistry:
+    """
+    Versioned, on-disk registry of fitness anomaly models.
+
+    `fit` trains a scaler/one-hot + IsolationForest pipeline on the scenario
+    features of a corpus of experiments and saves it as
+    `anomaly-v<N>.joblib` plus a JSON manifest; `fit_async` runs the same job
+    on a background thread. `score` loads a version once (kept in memory) and
+    only calls `predict`, so scoring a new experiment does not refit anything.
+    """
+
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-registry")
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or os.getenv("KRKN_MODEL_REGISTRY", ".cache/models"))
+        self._loaded: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def versions(self) -> List[int]:
+        if not self.root.exists():
+            return []
+        return sorted(int(m.group(1)) for m in (MODEL_FILE.match(p.name) for p in self.root.iterdir()) if m)
+
+    def latest(self) -> Optional[int]:
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def manifest(self, version: int) -> Dict[str, Any]:
+        return json.loads((self.root / f"anomaly-v{version}.json").read_text())
+
+    def fit(self, experiments: Iterable[ExperimentResult], contamination: float = 0.1,
+            n_estimators: int = 200, n_jobs: int = -1, random_state: int = 42) -> int:
+        """Train on every scenario of `experiments`, persist as a new version and return it."""
+        experiments = list(experiments)
+        frames = [scenario_features(exp) for exp in experiments if len(exp.fitness)]
+        if not frames:
+            raise ValueError("No fitness records to train on")
+        features = pd.concat(frames, ignore_index=True)
+        config_columns = sorted(c for c in features.columns if c.startswith("cfg_"))
+        numeric = BASE_NUMERIC_FEATURES + config_columns
+        # Columns that are entirely missing cannot be imputed; keep them out of the model
+        numeric = [c for c in numeric if features[c].notna().any()]
+
+        pipeline = Pipeline([
+            ("features", ColumnTransformer([
+                ("numeric", Pipeline([("impute", SimpleImputer(strategy="median")), ("scale", StandardScaler())]),
+                 numeric),
+                ("categorical", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+            ])),
+            ("model", IsolationForest(n_estimators=n_estimators, contamination=contamination,
+                                      n_jobs=n_jobs, random_state=random_state)),
+        ])
+        pipeline.fit(features[numeric + CATEGORICAL_FEATURES])
+
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            version = (self.latest() or 0) + 1
+            path = self.root / f"anomaly-v{version}.joblib"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            joblib.dump({"pipeline": pipeline, "numeric": numeric}, tmp)
+            os.replace(tmp, path)
+            (self.root / f"anomaly-v{version}.json").write_text(json.dumps({
+                "version": version,
+                "created_at": time.time(),
+                "samples": int(len(features)),
+                "experiments": [exp.metadata.experiment_id for exp in experiments],
+                "numeric_features": numeric,
+                "categorical_features": CATEGORICAL_FEATURES,
+                "contamination": contamination,
+                "sklearn_version": sklearn.__version__,
+            }, indent=2))
+        return version
+
+    def fit_async(self, experiments: Iterable[ExperimentResult], **kwargs) -> Future:
+        """Run `fit` on the registry's background thread; the future resolves to the new version."""
+        return self._executor.submit(self.fit, list(experiments), **kwargs)
+
+    def fit_corpus_async(self, corpus_dir: str, **kwargs) -> Future:
+        """Load every experiment folder under `corpus_dir` and `fit` on them, both on the background thread."""
+        return self._executor.submit(self._fit_corpus, Path(corpus_dir), kwargs)
+
+    def _fit_corpus(self, corpus_dir: Path, kwargs: Dict[str, Any]) -> int:
+        from ..loaders.krkn_loader import KrknResultsLoader
+        dirs = sorted(p for p in corpus_dir.glob("*") if p.is_dir())
+        return self.fit([KrknResultsLoader(str(p)).load() for p in dirs], **kwargs)
+
+    def load(self, version: Optional[int] = None) -> Dict[str, Any]:
+        version = version or self.latest()
+        if version is None:
+            raise FileNotFoundError(f"No anomaly models in {self.root}")
+        if version not in self._loaded:
+            model = joblib.load(self.root / f"anomaly-v{version}.joblib")
+            # Scoring one experiment is tiny; thread fan-out across trees only adds overhead
+            model["pipeline"].set_params(model__n_jobs=1)
+            self._loaded[version] = model
+        return self._loaded[version]
+
+    def score(self, exp: ExperimentResult, version: Optional[int] = None) -> Dict[str, Any]:
+        """Anomalous scenarios of `exp` under a trained model (same keys as detect_fitness_anomalies)."""
+        version = version or self.latest()
+        model = self.load(version)
+        features = scenario_features(exp)
+        for column in model["numeric"]:
+            if column not in features:
+                features[column] = np.nan
+        X = features[model["numeric"] + CATEGORICAL_FEATURES]
+        decision = model["pipeline"].decision_function(X)  # < 0 means anomalous, as in predict()
+        fitness = exp.fitness_frame()
+        anomaly_indices = [int(i) for i in np.flatnonzero(decision < 0)]
+        return {
+            "anomaly_indices": anomaly_indices,
+            "anomaly_count": len(anomaly_indices),
+            "anomalous_scores": fitness["fitness_score"].to_numpy()[anomaly_indices].tolist(),
+            "anomalous_generations": fitness["generation"].to_numpy()[anomaly_indices].tolist(),
+            "anomaly_scores": decision.tolist(),
+            "model_version": version,
+        }
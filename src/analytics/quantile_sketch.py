@@ -0,0 +1,118 @@
+import math
+from typing import Dict, Any, Iterable
+import numpy as np
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    Positive values are counted in logarithmic bins so any quantile is
+    returned within `relative_accuracy` of the true value. Memory is bounded
+    by `max_bins`; when exceeded the lowest bins are collapsed, which keeps
+    the high quantiles (p99, p999) accurate. Values <= 0 are counted in a
+    dedicated zero bin.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = 0  # key of counts[0]
+        self._counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def _add_counts(self, key_min: int, counts: np.ndarray):
+        """Add a dense count vector starting at `key_min`, growing/collapsing bins as needed."""
+        if self._counts.size == 0:
+            lo, hi = key_min, key_min + counts.size - 1
+        else:
+            lo = min(self._offset, key_min)
+            hi = max(self._offset + self._counts.size - 1, key_min + counts.size - 1)
+        merged = np.zeros(hi - lo + 1, dtype=np.int64)
+        if self._counts.size:
+            merged[self._offset - lo:self._offset - lo + self._counts.size] += self._counts
+        merged[key_min - lo:key_min - lo + counts.size] += counts
+        if merged.size > self.max_bins:
+            # Collapse the lowest bins into the first retained one
+            cut = merged.size - self.max_bins
+            merged[cut] += merged[:cut].sum()
+            merged = merged[cut:]
+            lo += cut
+        self._offset, self._counts = lo, merged
+
+    def add(self, values: Iterable[float]):
+        """Add a batch of values (vectorized; NaN values are ignored)."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+        self.count += int(arr.size)
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+        positive = arr[arr > 0]
+        self.zero_count += int(arr.size - positive.size)
+        if positive.size:
+            keys = self._keys(positive)
+            key_min = int(keys.min())
+            self._add_counts(key_min, np.bincount(keys - key_min))
+
+    def merge(self, other: "DDSketch"):
+        """Fold another sketch (same relative accuracy) into this one."""
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other._counts.size:
+            self._add_counts(other._offset, other._counts)
+
+    def quantile(self, q: float):
+        """Nearest-rank quantile estimate (rank int(count*q)), or None when empty."""
+        if self.count == 0:
+            return None
+        rank = min(int(self.count * q), self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cum = np.cumsum(self._counts)
+        idx = int(np.searchsorted(cum, rank - self.zero_count, side="right"))
+        value = 2 * self.gamma ** (self._offset + idx) / (self.gamma + 1)
+        return float(min(max(value, self.min), self.max))
+
+    def quantiles(self, qs: Dict[str, float]) -> Dict[str, Any]:
+        return {name: self.quantile(q) for name, q in qs.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "offset": self._offset,
+            "counts": self._counts.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch._offset = data["offset"]
+        sketch._counts = np.asarray(data["counts"], dtype=np.int64)
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
@@ -0,0 +1,339 @@
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import yaml
+from ..schema import SLODefinition
+from .quantile_sketch import DDSketch
+
+WILDCARD = "*"
+
+
+def bad_event_mask(df: pd.DataFrame) -> np.ndarray:
+    """Events that count against an SLO: `status_code >= 400` or `healthy` false."""
+    if len(df) == 0:
+        return np.zeros(0, dtype=bool)
+    bad = (df["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+    if "healthy" in df.columns:
+        bad = bad | ~df["healthy"].to_numpy(dtype=bool)
+    return bad
+
+
+def load_slo_definitions(path: Union[str, Path]) -> List[SLODefinition]:
+    """
+    Read SLO definitions from YAML:
+
+        defaults: {window: 5m, latency_quantile: 0.99}
+        slos:
+          - {service: cart, url: /cart/add, error_rate: 0.01, latency_ms: 300}
+          - {service: "*", availability: 0.999, window: 10m}
+
+    Keys under `defaults` apply to every entry that does not set them.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        doc = yaml.safe_load(f) or {}
+    if isinstance(doc, list):
+        doc = {"slos": doc}
+    defaults = doc.get("defaults") or {}
+    return [SLODefinition(**{**defaults, **entry}) for entry in doc.get("slos") or []]
+
+
+class SLOEngine:
+    """
+    Evaluates many per-service / per-endpoint SLOs over health events at once.
+
+    Events are grouped once per level (service, service + url) with
+    factorize/bincount, and latency quantiles come from a single lexsort per
+    level, so the cost is independent of the number of SLOs. Burn rate is the
+    bad-event fraction over a sliding `window` divided by the error budget,
+    computed from cumulative per-bucket counts.
+    """
+
+    def __init__(self, definitions: Iterable[SLODefinition], bucket: str = "30s"):
+        self.definitions = list(definitions)
+        self.bucket = bucket
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path], bucket: str = "30s") -> "SLOEngine":
+        return cls(load_slo_definitions(path), bucket=bucket)
+
+    def expand(self, endpoints: List[Tuple[str, str]]) -> List[SLODefinition]:
+        """Resolve '*' services/urls against the (service, url) pairs seen in the data."""
+        services = list(dict.fromkeys(svc for svc, _ in endpoints))
+        expanded = []
+        for slo in self.definitions:
+            svcs = services if slo.service == WILDCARD else [slo.service]
+            for svc in svcs:
+                if slo.url == WILDCARD:
+                    urls = [url for s, url in endpoints if s == svc]
+                else:
+                    urls = [slo.url]
+                for url in urls:
+                    target = f"{svc}{url or ''}"
+                    if not slo.name:
+                        name = target
+                    elif len(svcs) > 1 or len(urls) > 1 or WILDCARD in (slo.service, slo.url):
+                        name = f"{slo.name}:{target}"
+                    else:
+                        name = slo.name
+                    expanded.append(slo.model_copy(update={"service": svc, "url": url, "name": name}))
+        return expanded
+
+    def evaluate(self, df: pd.DataFrame) -> Dict[str, Any]:
+        # Factorizing the (categorical) columns directly avoids materializing strings per row
+        svc_codes, svc_names = pd.factorize(df["service"], use_na_sentinel=False)
+        url_codes, url_names = pd.factorize(df["url"], use_na_sentinel=False)
+        n_urls = max(len(url_names), 1)
+        ep_codes, ep_keys = pd.factorize(svc_codes.astype(np.int64) * n_urls + url_codes)
+        svc_names = [str(s) for s in svc_names]
+        endpoints = [(svc_names[k // n_urls], str(url_names[k % n_urls])) for k in ep_keys]
+
+        bad = bad_event_mask(df)
+        latency = df["latency_ms"].to_numpy(dtype=float, na_value=np.nan) if len(df) else np.zeros(0)
+        buckets = self._bucket_index(df)
+
+        levels = {
+            "service": _GroupStats(svc_codes, len(svc_names), bad, latency, buckets),
+            "endpoint": _GroupStats(ep_codes, len(ep_keys), bad, latency, buckets),
+        }
+        return self._report(endpoints, svc_names, levels)
+
+    def accumulator(self, relative_accuracy: float = 0.01) -> "SLOAccumulator":
+        """Chunk-by-chunk evaluation for health CSVs streamed in chunks (see SLOAccumulator)."""
+        return SLOAccumulator(self, relative_accuracy)
+
+    def _report(self, endpoints: List[Tuple[str, str]], svc_names: List[str], levels: Dict[str, "_GroupStats"]) -> Dict[str, Any]:
+        svc_index = {svc: i for i, svc in enumerate(svc_names)}
+        ep_index = {ep: i for i, ep in enumerate(endpoints)}
+
+        results = []
+        for slo in self.expand(endpoints):
+            if slo.url is None:
+                level, group = levels["service"], svc_index.get(slo.service)
+            else:
+                level, group = levels["endpoint"], ep_index.get((slo.service, slo.url))
+            results.append(self._evaluate_slo(slo, level, group))
+
+        statuses = [r["status"] for r in results]
+        return {
+            "slos": results,
+            "summary": {
+                "total": len(results),
+                "violated": statuses.count("violated"),
+                "passed": statuses.count("passed"),
+                "no_data": statuses.count("no_data"),
+            },
+        }
+
+    def _bucket_index(self, df: pd.DataFrame) -> np.ndarray:
+        """Time bucket of each event relative to the first one (-1 for missing timestamps)."""
+        if len(df) == 0:
+            return np.zeros(0, dtype=np.int64)
+        ts = pd.to_datetime(df["timestamp"])
+        valid = ts.notna().to_numpy()
+        ns = ts.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        out = np.full(len(df), -1, dtype=np.int64)
+        if valid.any():
+            step = pd.Timedelta(self.bucket).value
+            origin = ns[valid].min() // step
+            out[valid] = ns[valid] // step - origin
+        return out
+
+    def _evaluate_slo(self, slo: SLODefinition, level: "_GroupStats", group: Optional[int]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "name": slo.name,
+            "service": slo.service,
+            "url": slo.url,
+            "events": 0,
+            "bad_events": 0,
+            "violations": [],
+        }
+        if group is None or level.total[group] == 0:
+            result["status"] = "no_data"
+            return result
+
+        total, bad_events = int(level.total[group]), int(level.bad[group])
+        error_rate = bad_events / total
+        result.update({"events": total, "bad_events": bad_events, "error_rate": error_rate,
+                       "availability": 1.0 - error_rate})
+        violations = result["violations"]
+        if slo.error_rate is not None and error_rate > slo.error_rate:
+            violations.append({"type": "error_rate", "error_rate": error_rate, "threshold": slo.error_rate})
+        if slo.availability is not None and 1.0 - error_rate < slo.availability:
+            violations.append({"type": "availability", "availability": 1.0 - error_rate,
+                               "threshold": slo.availability})
+        if slo.latency_ms is not None:
+            value = level.quantile(group, slo.latency_quantile)
+            result["latency"] = {"quantile": slo.latency_quantile, "value": value, "threshold": slo.latency_ms}
+            if value is not None and value > slo.latency_ms:
+                violations.append({"type": "latency", "quantile": slo.latency_quantile,
+                                   "latency_ms": value, "threshold": slo.latency_ms})
+
+        target = slo.availability if slo.availability is not None else (
+            1.0 - slo.error_rate if slo.error_rate is not None else None)
+        if target is not None and target < 1.0:
+            window_buckets = max(1, math.ceil(pd.Timedelta(slo.window) / pd.Timedelta(self.bucket)))
+            burn = level.window_bad_fraction(group, window_buckets) / (1.0 - target)
+            result["burn_rate"] = {
+                "window": slo.window,
+                "max": float(burn.max()) if burn.size else 0.0,
+                "windows_over_budget": int((burn > 1.0).sum()),
+                "windows": int(burn.size),
+            }
+        result["status"] = "violated" if violations else "passed"
+        return result
+
+
+class SLOAccumulator:
+    """
+    SLOEngine.evaluate over a health CSV fed in chunks with `update`.
+
+    Event and bad-event counts are summed per (service, url) endpoint and per
+    (endpoint, time bucket), so counts, error rates and burn rates equal the
+    in-memory result. Latencies go into per-endpoint DDSketches, so quantiles
+    are within `relative_accuracy` of the exact values. Memory follows the
+    number of endpoints and time buckets, not rows.
+    """
+
+    def __init__(self, engine: SLOEngine, relative_accuracy: float = 0.01):
+        self.engine = engine
+        self.relative_accuracy = relative_accuracy
+        self.endpoints: Dict[Tuple[str, str], int] = {}
+        self.total = np.zeros(0, dtype=np.int64)
+        self.bad = np.zeros(0, dtype=np.int64)
+        self.sketches: List[DDSketch] = []
+        self.cells: List[pd.DataFrame] = []  # per-chunk (endpoint, absolute bucket) -> total, bad
+
+    def update(self, df: pd.DataFrame):
+        if len(df) == 0:
+            return
+        svc_codes, svc_names = pd.factorize(df["service"], use_na_sentinel=False)
+        url_codes, url_names = pd.factorize(df["url"], use_na_sentinel=False)
+        n_urls = max(len(url_names), 1)
+        local_codes, keys = pd.factorize(svc_codes.astype(np.int64) * n_urls + url_codes)
+        to_global = np.array([
+            self.endpoints.setdefault((str(svc_names[k // n_urls]), str(url_names[k % n_urls])), len(self.endpoints))
+            for k in keys
+        ], dtype=np.int64)
+        codes = to_global[local_codes]
+        n = len(self.endpoints)
+        bad = bad_event_mask(df)
+        self.total = np.pad(self.total, (0, n - self.total.size)) + np.bincount(codes, minlength=n)
+        self.bad = np.pad(self.bad, (0, n - self.bad.size)) + np.bincount(codes[bad], minlength=n)
+
+        self.sketches.extend(DDSketch(self.relative_accuracy) for _ in range(n - len(self.sketches)))
+        latency = df["latency_ms"].to_numpy(dtype=float, na_value=np.nan)
+        has_latency = ~np.isnan(latency)
+        lat_codes, values = codes[has_latency], latency[has_latency]
+        order = np.argsort(lat_codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(lat_codes[order])) + 1
+        for group, part in zip(np.unique(lat_codes), np.split(values[order], bounds)):
+            self.sketches[group].add(part)
+
+        ts = pd.to_datetime(df["timestamp"])
+        valid = ts.notna().to_numpy()
+        buckets = ts.to_numpy(dtype="datetime64[ns]").astype(np.int64)[valid] // pd.Timedelta(self.engine.bucket).value
+        cells = pd.DataFrame({"endpoint": codes[valid], "bucket": buckets, "bad": bad[valid].astype(np.int64)})
+        self.cells.append(cells.groupby(["endpoint", "bucket"], sort=False)["bad"].agg(["size", "sum"]).reset_index())
+
+    def result(self) -> Dict[str, Any]:
+        endpoints = list(self.endpoints)
+        svc_names = list(dict.fromkeys(svc for svc, _ in endpoints))
+        svc_index = {svc: i for i, svc in enumerate(svc_names)}
+        svc_of = np.array([svc_index[svc] for svc, _ in endpoints], dtype=np.int64)
+
+        cells = pd.concat(self.cells, ignore_index=True) if self.cells else pd.DataFrame(
+            {"endpoint": [], "bucket": [], "size": [], "sum": []}, dtype=np.int64)
+        cells = cells.groupby(["endpoint", "bucket"], sort=False)[["size", "sum"]].sum().reset_index()
+        buckets = cells["bucket"].to_numpy(dtype=np.int64)
+        buckets = buckets - buckets.min() if buckets.size else buckets
+        n_buckets = int(buckets.max()) + 1 if buckets.size else 0
+        ep_codes = cells["endpoint"].to_numpy(dtype=np.int64)
+
+        def timeline(groups: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+            cell = groups * n_buckets + buckets
+            shape, size = (n_groups, n_buckets), n_groups * n_buckets
+            return (np.bincount(cell, weights=cells["size"], minlength=size).reshape(shape),
+                    np.bincount(cell, weights=cells["sum"], minlength=size).reshape(shape))
+
+        svc_sketches = [DDSketch(self.relative_accuracy) for _ in svc_names]
+        for ep, sketch in enumerate(self.sketches):
+            svc_sketches[svc_of[ep]].merge(sketch)
+        levels = {
+            "service": _SketchStats(np.bincount(svc_of, weights=self.total, minlength=len(svc_names)),
+                                    np.bincount(svc_of, weights=self.bad, minlength=len(svc_names)),
+                                    svc_sketches, timeline(svc_of[ep_codes], len(svc_names))),
+            "endpoint": _SketchStats(self.total, self.bad, self.sketches, timeline(ep_codes, len(endpoints))),
+        }
+        return self.engine._report(endpoints, svc_names, levels)
+
+
+class _GroupStats:
+    """Per-group counts, sorted latencies and lazily built per-bucket counts for one grouping level."""
+
+    def __init__(self, codes: np.ndarray, n_groups: int, bad: np.ndarray, latency: np.ndarray, buckets: np.ndarray):
+        self.codes = codes
+        self.n_groups = n_groups
+        self.bad_mask = bad
+        self.buckets = buckets
+        self.total = np.bincount(codes, minlength=n_groups)
+        self.bad = np.bincount(codes, weights=bad, minlength=n_groups).astype(np.int64)
+
+        has_latency = ~np.isnan(latency)
+        lat_codes, lat_values = codes[has_latency], latency[has_latency]
+        order = np.lexsort((lat_values, lat_codes))
+        self.sorted_latency = lat_values[order]
+        self.latency_count = np.bincount(lat_codes, minlength=n_groups)
+        self.latency_start = np.cumsum(self.latency_count) - self.latency_count
+        self._timeline: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._windows: Dict[int, np.ndarray] = {}
+
+    def quantile(self, group: int, q: float) -> Optional[float]:
+        """Exact nearest-rank quantile (rank int(count*q)) of the group's latencies."""
+        count = int(self.latency_count[group])
+        if count == 0:
+            return None
+        return float(self.sorted_latency[self.latency_start[group] + min(int(count * q), count - 1)])
+
+    def _bucket_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._timeline is None:
+            valid = self.buckets >= 0
+            n_buckets = int(self.buckets[valid].max()) + 1 if valid.any() else 0
+            cell = self.codes[valid].astype(np.int64) * n_buckets + self.buckets[valid]
+            size = self.n_groups * n_buckets
+            total = np.bincount(cell, minlength=size).reshape(self.n_groups, n_buckets)
+            bad = np.bincount(cell, weights=self.bad_mask[valid], minlength=size).reshape(self.n_groups, n_buckets)
+            self._timeline = (total, bad)
+        return self._timeline
+
+    def window_bad_fraction(self, group: int, window_buckets: int) -> np.ndarray:
+        """Bad-event fraction over every sliding window of `window_buckets` buckets that has events."""
+        if window_buckets not in self._windows:
+            total, bad = self._bucket_counts()
+            w = min(window_buckets, max(total.shape[1], 1))
+            zero = np.zeros((self.n_groups, 1))
+            total_cum = np.hstack([zero, np.cumsum(total, axis=1)])
+            bad_cum = np.hstack([zero, np.cumsum(bad, axis=1)])
+            win_total = total_cum[:, w:] - total_cum[:, :-w]
+            win_bad = bad_cum[:, w:] - bad_cum[:, :-w]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self._windows[window_buckets] = np.where(win_total > 0, win_bad / win_total, np.nan)
+        fractions = self._windows[window_buckets][group]
+        return fractions[~np.isnan(fractions)]
+
+
+class _SketchStats(_GroupStats):
+    """_GroupStats built from merged chunk counts, with DDSketch latency quantiles."""
+
+    def __init__(self, total: np.ndarray, bad: np.ndarray, sketches: List[DDSketch],
+                 timeline: Tuple[np.ndarray, np.ndarray]):
+        self.n_groups = len(total)
+        self.total = np.asarray(total, dtype=np.int64)
+        self.bad = np.asarray(bad, dtype=np.int64)
+        self.sketches = sketches
+        self._timeline = timeline
+        self._windows: Dict[int, np.ndarray] = {}
+
+    def quantile(self, group: int, q: float) -> Optional[float]:
+        return self.sketches[group].quantile(q)
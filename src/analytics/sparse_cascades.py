@@ -0,0 +1,95 @@
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+
+def _pairs_within_groups(group_end: np.ndarray):
+    """All (i, j), i < j, index pairs of elements in the same contiguous group (`group_end` per element)."""
+    n_partners = group_end - np.arange(group_end.size) - 1
+    left = np.repeat(np.arange(group_end.size), n_partners)
+    offsets = np.arange(left.size) - np.repeat(np.cumsum(n_partners) - n_partners, n_partners)
+    return left, left + 1 + offsets
+
+
+def detect_sparse_cascades(health_events: pd.DataFrame, window: str = "30s", min_services: int = 2,
+                           top_pairs: int = 50) -> Dict[str, Any]:
+    """
+    Event-driven cascade detection that only touches failed checks.
+
+    Failures are sorted by time and joined into windows anchored at a failure:
+    a window opens at the first failure not yet covered and collects every
+    failure within `window` after it. Windows with at least `min_services`
+    distinct services are cascades; every pair of services in a cascade adds
+    one co-failure. Memory is proportional to the number of failures (plus
+    co-failing pairs), not services x time buckets.
+
+    Windows are greedy and do not overlap, so grouping differs from the
+    dense FailureMatrix buckets at the edges: a burst that crosses a 30s
+    bucket boundary is still one cascade here, but a failure just after a
+    window's end opens the next window, even when it is seconds away from
+    the last failure of the previous one. Anchors are found with one
+    searchsorted jump per window, not per failure.
+    """
+    failed = (health_events["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+    failures = health_events[failed]
+    ts = pd.to_datetime(failures["timestamp"]).to_numpy(dtype="datetime64[ns]")
+    valid = ~np.isnat(ts)
+    codes, names = pd.factorize(failures["service"], use_na_sentinel=False)
+    ts, codes = ts[valid].astype(np.int64), codes[valid]
+    names = [str(n) for n in names]
+    empty = {"cascades": [], "co_failures": [], "total_cascade_events": 0, "failures": int(ts.size)}
+    if ts.size == 0:
+        return empty
+
+    order = np.argsort(ts, kind="stable")
+    ts, codes = ts[order], codes[order]
+
+    # Anchored sliding windows: jump from each window's first failure past its end
+    width = pd.Timedelta(window).value
+    anchors = []
+    i = 0
+    while i < ts.size:
+        anchors.append(i)
+        i = int(np.searchsorted(ts, ts[i] + width, side="right"))
+    anchors = np.asarray(anchors)
+    window_of = np.searchsorted(anchors, np.arange(ts.size), side="right") - 1
+
+    # Distinct (window, service) members; return_index keeps each service's first failure in the window
+    n_services = len(names)
+    member_keys, first = np.unique(window_of * n_services + codes, return_index=True)
+    member_window, member_service = member_keys // n_services, member_keys % n_services
+    size = np.bincount(member_window, minlength=anchors.size)
+    is_cascade = size >= min_services
+    if not is_cascade.any():
+        return empty
+
+    keep = is_cascade[member_window]
+    member_window, member_service, first = member_window[keep], member_service[keep], first[keep]
+    cascade_size = size[is_cascade]
+    bounds = np.concatenate([[0], np.cumsum(cascade_size)])
+
+    cascades: List[Dict[str, Any]] = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        by_first = np.argsort(first[start:end], kind="stable")  # services in order of first failure
+        services = [names[s] for s in member_service[start:end][by_first]]
+        cascades.append({
+            "timestamp": str(pd.Timestamp(ts[anchors[member_window[start]]])),
+            "services": services,
+            "count": len(services),
+        })
+
+    group_end = np.repeat(bounds[1:], cascade_size)
+    left, right = _pairs_within_groups(group_end)
+    a, b = member_service[left], member_service[right]
+    pair_keys, pair_counts = np.unique(np.minimum(a, b) * n_services + np.maximum(a, b), return_counts=True)
+    top = np.argsort(-pair_counts, kind="stable")[:top_pairs]
+    co_failures = [
+        {"services": sorted([names[k // n_services], names[k % n_services]]), "count": int(c)}
+        for k, c in zip(pair_keys[top], pair_counts[top])
+    ]
+    return {
+        "cascades": cascades,
+        "co_failures": co_failures,
+        "total_cascade_events": len(cascades),
+        "failures": int(ts.size),
+    }
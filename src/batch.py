@@ -0,0 +1,214 @@
+"""
+Headless batch analysis: load + analyze every experiment directory under a root.
+
+    python -m src.batch data/ --out reports/ --workers 8
+
+Each experiment gets `<out>/<name>.json` (`.json.gz` with --gzip; the same
+{metadata, analysis} document the Reports page exports) and
+`<out>/index.json` lists every experiment with its input fingerprint,
+status and headline numbers.
+Experiments whose input files are unchanged since their last successful
+report are skipped, so an interrupted or nightly run picks up where it left
+off; pass --force to re-analyze everything.
+
+Parsed inputs are not kept in the loader cache unless --cache-dir is given
+(each experiment is read once per run, and unchanged ones are skipped
+anyway); root cause results use the RCA cache, placed under --cache-dir when
+given and disabled with --no-cache.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .agents.rca_cache import RCACache
+from .agents.root_cause_agent import RootCauseAgent
+from .agents.stub_llm import StubLLM
+from .loaders.krkn_loader import KrknResultsLoader
+from .loaders.load_cache import LoadCache
+from .orchestrator import Orchestrator
+from .serialization import dump, load
+
+# Files whose presence marks a directory as a Krkn-AI experiment
+EXPERIMENT_MARKERS = ("best_scenarios.json", "health_check_report.csv", "prometheus_metrics.json")
+INDEX_FILE = "index.json"
+# Bump when the report layout changes so existing reports are regenerated
+REPORT_VERSION = 2
+
+
+def discover_experiments(root: Path) -> List[Path]:
+    """Experiment directories under `root` (including `root` itself); their subdirectories are not searched."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if any(marker in filenames for marker in EXPERIMENT_MARKERS):
+            found.append(Path(dirpath))
+            dirnames[:] = []
+        else:
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+    return sorted(found)
+
+
+def input_fingerprint(exp_dir: Path) -> str:
+    """Path/size/mtime hash of every file in the experiment directory."""
+    return LoadCache.fingerprint(p for p in exp_dir.rglob("*") if p.is_file())
+
+
+def report_name(exp_dir: Path, root: Path) -> str:
+    rel = exp_dir.resolve().relative_to(root.resolve())
+    return "__".join(rel.parts) or exp_dir.resolve().name
+
+
+def _headline(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """The few numbers the index keeps per experiment, for triage without opening reports."""
+    slo = analysis.get("slo", {})
+    health = analysis.get("health", {})
+    return {
+        "best_fitness": analysis.get("fitness", {}).get("best_overall", {}).get("fitness_score"),
+        "slo_status": slo.get("status"),
+        "error_rate": slo.get("error_rate"),
+        "failing_services": len(health.get("failure_counts", {})),
+        "hypothesis": analysis.get("root_cause", {}).get("hypothesis"),
+    }
+
+
+def analyze_one(exp_dir: str, report_path: str, fingerprint: str, stream_chunksize: Optional[int] = None,
+                stub_llm: bool = False, cache_dir: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Load and analyze one experiment in a worker process and write its report; returns its index entry.
+    The loader cache is only used under `cache_dir`; `use_cache=False` also disables the RCA cache.
+    """
+    start = time.perf_counter()
+    entry = {"path": exp_dir, "fingerprint": fingerprint, "report": Path(report_path).name}
+    try:
+        cache = LoadCache(str(Path(cache_dir) / "loader")) if cache_dir and use_cache else None
+        exp = KrknResultsLoader(exp_dir, cache=cache, use_cache=cache is not None,
+                                stream_health=stream_chunksize is not None).load()
+        rca_cache = RCACache(str(Path(cache_dir) / "rca_cache.sqlite")) if cache_dir and use_cache else None
+        root_agent = RootCauseAgent(llm=StubLLM() if stub_llm else None, cache=rca_cache, use_cache=use_cache)
+        analysis = Orchestrator(root_agent=root_agent, stream_chunksize=stream_chunksize).analyze_experiment(exp)
+        report = {"metadata": exp.metadata.model_dump(), "analysis": analysis}
+        tmp = Path(f"{report_path}.{os.getpid()}.tmp")
+        dump(report, tmp, indent=True, compress=report_path.endswith(".gz"))
+        os.replace(tmp, report_path)
+        entry.update(experiment_id=exp.metadata.experiment_id, status="ok", summary=_headline(analysis))
+    except Exception as e:
+        entry.update(experiment_id=Path(exp_dir).name, status="error", error=f"{type(e).__name__}: {e}")
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+class BatchRunner:
+    """
+    Runs `analyze_one` for every discovered experiment on a process pool.
+
+    The index is rewritten after every finished experiment, so a crash or
+    Ctrl-C loses at most the experiments in flight. Failed experiments are
+    recorded with their error and retried on the next run.
+    """
+
+    def __init__(self, root: str, out_dir: str, workers: Optional[int] = None, force: bool = False,
+                 stream_chunksize: Optional[int] = None, stub_llm: bool = False, gzip: bool = False,
+                 cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.root = Path(root)
+        self.out_dir = Path(out_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.force = force
+        self.stream_chunksize = stream_chunksize
+        self.stub_llm = stub_llm
+        self.suffix = ".json.gz" if gzip else ".json"
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+
+    def load_index(self) -> Dict[str, Any]:
+        path = self.out_dir / INDEX_FILE
+        if path.exists():
+            try:
+                index = load(path)
+                if index.get("version") == REPORT_VERSION:
+                    return index
+            except Exception as e:
+                print(f"Warning: ignoring unreadable batch index {path}: {e}")
+        return {"version": REPORT_VERSION, "experiments": {}}
+
+    def save_index(self, index: Dict[str, Any]):
+        index["updated_at"] = time.time()
+        path = self.out_dir / INDEX_FILE
+        tmp = path.with_suffix(".tmp")
+        dump(index, tmp, indent=True)
+        os.replace(tmp, path)
+
+    def _up_to_date(self, entry: Optional[Dict[str, Any]], fingerprint: str) -> bool:
+        return (not self.force and entry is not None and entry.get("status") == "ok"
+                and entry.get("fingerprint") == fingerprint and entry["report"].endswith(self.suffix)
+                and (self.out_dir / entry["report"]).exists())
+
+    def run(self) -> Dict[str, Any]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        index = self.load_index()
+        experiments = index["experiments"]
+
+        todo, skipped = [], 0
+        for exp_dir in discover_experiments(self.root):
+            name = report_name(exp_dir, self.root)
+            fingerprint = input_fingerprint(exp_dir)
+            if self._up_to_date(experiments.get(name), fingerprint):
+                skipped += 1
+            else:
+                todo.append((name, str(exp_dir), str(self.out_dir / f"{name}{self.suffix}"), fingerprint))
+
+        start = time.perf_counter()
+        failed = 0
+        with ProcessPoolExecutor(max_workers=min(self.workers, max(len(todo), 1))) as pool:
+            futures = {
+                pool.submit(analyze_one, exp_dir, report_path, fingerprint, self.stream_chunksize, self.stub_llm,
+                            self.cache_dir, self.use_cache): name
+                for name, exp_dir, report_path, fingerprint in todo
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                entry = future.result()
+                experiments[name] = entry
+                failed += entry["status"] != "ok"
+                self.save_index(index)
+                print(f"[{done}/{len(todo)}] {name}: {entry['status']} ({entry['seconds']:.2f}s)"
+                      + (f" - {entry['error']}" if entry["status"] != "ok" else ""))
+
+        elapsed = time.perf_counter() - start
+        index["last_run"] = {
+            "analyzed": len(todo) - failed,
+            "failed": failed,
+            "skipped": skipped,
+            "workers": self.workers,
+            "wall_seconds": elapsed,
+            "experiments_per_second": len(todo) / elapsed if todo and elapsed > 0 else 0.0,
+        }
+        self.save_index(index)
+        return index
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("root", help="Directory to search for experiment directories")
+    ap.add_argument("--out", default="reports", help="Output directory for reports and index.json")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="Re-analyze experiments even if unchanged")
+    ap.add_argument("--stream-chunksize", type=int, default=None,
+                    help="Stream health CSVs in chunks of this many rows instead of loading them")
+    ap.add_argument("--stub-llm", action="store_true", help="Use the offline StubLLM for root cause analysis")
+    ap.add_argument("--gzip", action="store_true", help="Write gzip-compressed reports (<name>.json.gz)")
+    ap.add_argument("--cache-dir", default=None,
+                    help="Keep the loader cache and RCA cache here (default: no loader cache, default RCA cache)")
+    ap.add_argument("--no-cache", action="store_true", help="Disable the loader and RCA caches")
+    args = ap.parse_args()
+
+    index = BatchRunner(args.root, args.out, workers=args.workers, force=args.force,
+                        stream_chunksize=args.stream_chunksize, stub_llm=args.stub_llm, gzip=args.gzip,
+                        cache_dir=args.cache_dir, use_cache=not args.no_cache).run()
+    run = index["last_run"]
+    print(f"Analyzed {run['analyzed']}, failed {run['failed']}, skipped {run['skipped']} unchanged "
+          f"in {run['wall_seconds']:.2f}s ({run['experiments_per_second']:.2f} experiments/sec)")
+
+
+if __name__ == "__main__":
+    main()
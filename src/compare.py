@@ -0,0 +1,54 @@
+"""
+Compare any number of experiments and export the result.
+
+    python -m src.compare data/synthetic/experiment_1 data/synthetic/experiment_2 --out comparison.json
+    python -m src.compare --index reports/index.json --baseline experiment_1 --csv comparison/
+
+Inputs are experiment directories (loaded and analyzed in parallel) and/or
+JSON reports (.json or .json.gz); --index adds every successful report of a `src.batch` run.
+"""
+import argparse
+from pathlib import Path
+from .analytics.comparison import ComparisonEngine, comparison_to_dict, load_analyses
+from .serialization import dump, load
+
+
+def index_reports(index_path: Path):
+    index = load(index_path)
+    return [str(index_path.parent / entry["report"])
+            for entry in index.get("experiments", {}).values() if entry.get("status") == "ok"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("inputs", nargs="*", help="Experiment directories or JSON reports")
+    ap.add_argument("--index", type=Path, default=None, help="index.json written by src.batch")
+    ap.add_argument("--baseline", default=None, help="Experiment id deltas are taken against (default: first)")
+    ap.add_argument("--out", default="comparison.json", help="JSON output path (gzip-compressed if it ends in .gz)")
+    ap.add_argument("--csv", type=Path, default=None, help="Also write metrics/deltas/ranks/generations CSVs here")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes for experiment directories")
+    ap.add_argument("--stub-llm", action="store_true", help="Use the offline StubLLM for root cause analysis")
+    args = ap.parse_args()
+
+    inputs = list(args.inputs) + (index_reports(args.index) if args.index else [])
+    if not inputs:
+        ap.error("no experiments given")
+    analyses = load_analyses(inputs, workers=args.workers, stub_llm=args.stub_llm)
+    for name, analysis in analyses.items():
+        if "load_error" in analysis:
+            print(f"Warning: could not load {analysis['path']}: {analysis['load_error']}")
+    result = ComparisonEngine(baseline=args.baseline).compare(analyses)
+
+    dump(comparison_to_dict(result), args.out, indent=True)
+    if args.csv:
+        args.csv.mkdir(parents=True, exist_ok=True)
+        for name in ("metrics", "deltas", "ranks"):
+            result[name].to_csv(args.csv / f"{name}.csv")
+        result["generations"].to_csv(args.csv / "generations.csv", index=False)
+
+    print(f"Compared {len(analyses)} experiments against {result['baseline']} -> {args.out}")
+    print(result["ranks"][["overall"]].head(10).to_string())
+
+
+if __name__ == "__main__":
+    main()
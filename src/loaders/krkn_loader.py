@@ -1,4 +1,3 @@
-import json
 import yaml
 import csv
 from pathlib import Path
@@ -6,19 +5,34 @@ from typing import Optional, Dict, Any
 from ..parsers.scenario_parser import ScenarioParser
 from ..parsers.health_parser import HealthParser
 from ..parsers.fitness_parser import FitnessParser
+from ..parsers.prometheus_parser import PrometheusParser
+from .load_cache import LoadCache
 from ..schema import ExperimentResult, ExperimentMetadata
 
 class KrknResultsLoader:
     """
     Auto-detects a directory containing Krkn-AI output (or synthetic)
     and returns a canonical ExperimentResult.
+
+    Parsed artifacts are cached on disk (see LoadCache) and only re-parsed
+    when their files change, unless `use_cache` is False. With `stream_health`
+    the health CSV is only registered in `raw_files`, for agents to stream.
     """
 
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, cache: Optional[LoadCache] = None, use_cache: bool = True,
+                 stream_health: bool = False):
         self.base = Path(base_dir)
+        self.stream_health = stream_health
         self.scenario_parser = ScenarioParser()
         self.health_parser = HealthParser()
         self.fitness_parser = FitnessParser()
+        self.prometheus_parser = PrometheusParser()
+        self.cache = cache if cache is not None else (LoadCache() if use_cache else None)
+
+    def _cached(self, artifact: Path, kind: str, sources, parse):
+        if self.cache is None:
+            return parse()
+        return self.cache.get_or_parse(artifact, kind, sources, parse)
 
     def auto_detect_format(self) -> Dict[str, bool]:
         found = {
@@ -36,22 +50,33 @@ class KrknResultsLoader:
         bs = self.base / "best_scenarios.json"
         if bs.exists():
             result.raw_files["best_scenarios.json"] = str(bs)
-            result.scenarios, result.fitness = self.scenario_parser.parse_best_scenarios(bs)
+            result.scenarios, result.fitness = self._cached(
+                bs, "best_scenarios", [bs], lambda: self.scenario_parser.parse_best_scenarios(bs)
+            )
         # Health checks
         hc = self.base / "health_check_report.csv"
         if hc.exists():
             result.raw_files["health_check_report.csv"] = str(hc)
-            result.health_events = self.health_parser.parse(hc)
+        if hc.exists() and not self.stream_health:
+            result.health_events = self._cached(hc, "health", [hc], lambda: self.health_parser.parse(hc))
         # Prometheus
         prom = self.base / "prometheus_metrics.json"
         if prom.exists():
             result.raw_files["prometheus_metrics.json"] = str(prom)
-            with open(prom) as f:
-                result.prometheus_metrics = json.load(f)
+            result.prometheus_metrics = self._cached(
+                prom, "prometheus_table", [prom], lambda: self.prometheus_parser.parse(prom)
+            )
+        # Per-service SLO definitions (evaluated by SLOAgent)
+        slos = self.base / "slos.yaml"
+        if slos.exists():
+            result.raw_files["slos.yaml"] = str(slos)
         # Also parse per-scenario YAMLs if present
         yaml_root = self.base / "yaml"
         if yaml_root.exists():
-            scenario_list = self.scenario_parser.parse_generation_dir(yaml_root)
+            yaml_files = list(yaml_root.glob("generation_*/*.yaml"))
+            scenario_list = self._cached(
+                yaml_root, "yaml_tree", yaml_files, lambda: self.scenario_parser.parse_generation_dir(yaml_root)
+            )
             # merge unique scenarios
             existing_ids = {s.id for s in result.scenarios}
             for s in scenario_list:
@@ -0,0 +1,116 @@
+import gc
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Part of every cache slot name. Bump whenever a cached type (HealthTable,
+# FitnessTable, PrometheusTable, Scenario, ...) or its parser changes, so
+# pickles written by older code are never unpickled into the new classes.
+CACHE_FORMAT_VERSION = 2
+
+class LoadCache:
+    """
+    On-disk cache of parsed experiment artifacts.
+
+    Each artifact (e.g. the health CSV, or the whole YAML tree) gets one slot,
+    stored as a pickle together with a fingerprint of its source files
+    (resolved path, size, mtime). A slot is reused only while the fingerprint
+    matches, so unchanged files are never re-parsed and changed ones are.
+    Slots are namespaced by CACHE_FORMAT_VERSION, and an entry that fails to
+    unpickle is treated as a miss and rewritten.
+
+    The directory is bounded LRU-style by slot count and total bytes: a hit
+    touches the slot's mtime, and every write drops the artifact's slots from
+    older format versions, then the least recently used slots over either bound.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 256,
+                 max_bytes: int = 2 * 1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir or os.getenv("KRKN_LOAD_CACHE", ".cache/loader"))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(paths: Iterable[Path]) -> str:
+        h = hashlib.sha256()
+        for p in sorted(Path(p).resolve() for p in paths):
+            st = p.stat()
+            h.update(f"{p}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def _slot(self, artifact: Path, kind: str) -> Path:
+        name = hashlib.sha256(f"{Path(artifact).resolve()}|{kind}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{name}.v{CACHE_FORMAT_VERSION}.pkl"
+
+    def _slots(self) -> List[Tuple[int, int, Path]]:
+        """(mtime_ns, size, path) of every slot, least recently used first."""
+        slots = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue  # removed by a concurrent loader
+            slots.append((st.st_mtime_ns, st.st_size, path))
+        return sorted(slots)
+
+    def _evict(self, keep: Path):
+        """Drop `keep`'s slots from other format versions, then LRU slots beyond max_entries / max_bytes."""
+        stale = set(self.cache_dir.glob(f"{keep.name.split('.', 1)[0]}.v*.pkl")) - {keep}
+        slots = [s for s in self._slots() if s[2] not in stale]
+        count, total = len(slots), sum(size for _, size, _ in slots)
+        for _, size, path in slots:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            if path != keep:
+                stale.add(path)
+                count, total = count - 1, total - size
+        for path in stale:
+            try:
+                path.unlink()
+                self.evictions += 1
+            except OSError:
+                pass
+
+    def get_or_parse(self, artifact: Path, kind: str, sources: Iterable[Path], parse: Callable[[], Any]) -> Any:
+        """Return the cached value for `artifact` if `sources` are unchanged, else `parse()` and store it."""
+        fp = self.fingerprint(sources)
+        slot = self._slot(artifact, kind)
+        if slot.exists():
+            gc_enabled = gc.isenabled()
+            gc.disable()  # large object graphs (e.g. scenario lists) unpickle several times faster without GC passes
+            try:
+                with open(slot, "rb") as f:
+                    cached_fp, value = pickle.load(f)
+                if cached_fp == fp:
+                    self.hits += 1
+                    try:
+                        os.utime(slot)  # mark as recently used for eviction
+                    except OSError:
+                        pass
+                    return value
+            except Exception as e:
+                print(f"Warning: ignoring unreadable load cache entry {slot}: {e}")
+            finally:
+                if gc_enabled:
+                    gc.enable()
+
+        self.misses += 1
+        value = parse()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = slot.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((fp, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, slot)  # atomic, so concurrent loaders never see partial files
+            self._evict(slot)
+        except OSError as e:
+            print(f"Warning: could not write load cache entry {slot}: {e}")
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
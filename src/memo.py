@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+import pandas as pd
+from .schema import ExperimentResult
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a parameter value (dicts/lists/sets by content, everything else by repr)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        return tuple(_freeze(v) for v in items)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class ComputeCache:
+    """
+    Process-wide LRU memo for analytics results and figures.
+
+    Entries are keyed on (name, experiment fingerprint, parameters), so
+    Streamlit reruns and page switches reuse results until the experiment's
+    source files change. At most `max_entries` values are kept; the least
+    recently used one is evicted first. Per-name hits, misses and compute
+    time are recorded for the debug panel. Cached values are shared: callers
+    must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, exp: ExperimentResult, compute: Callable[[], Any], **params) -> Any:
+        key = (name, exp.fingerprint(), _freeze(params))
+        with self._lock:
+            stats = self._stats.setdefault(name, {"hits": 0, "misses": 0, "compute_seconds": 0.0,
+                                                  "last_compute_seconds": 0.0})
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                return self._entries[key]
+            stats["misses"] += 1
+
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            stats["compute_seconds"] += elapsed
+            stats["last_compute_seconds"] = elapsed
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = sum(s["hits"] for s in self._stats.values())
+            misses = sum(s["misses"] for s in self._stats.values())
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "per_name": {name: dict(s) for name, s in sorted(self._stats.items())},
+            }
+
+    def stats_frame(self) -> pd.DataFrame:
+        """Per-name stats as a table for the Streamlit debug panel."""
+        per_name = self.stats()["per_name"]
+        return pd.DataFrame.from_dict(per_name, orient="index",
+                                      columns=["hits", "misses", "compute_seconds", "last_compute_seconds"])
+
+
+compute_cache = ComputeCache()
+
+
+def memoized(name: str, exp: ExperimentResult, compute: Callable[[], Any], **params) -> Any:
+    """`compute()` through the shared cache, keyed on `name`, the experiment and `params`."""
+    return compute_cache.get_or_compute(name, exp, compute, **params)
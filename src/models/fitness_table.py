@@ -0,0 +1,85 @@
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Iterator, List
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from src.schema import FitnessRecord  # src.schema imports this module for its field types
+
+
+class FitnessTable(Sequence):
+    """
+    Columnar fitness records (generation / scenario_id / fitness_score arrays).
+
+    Like HealthTable, it is a read-only sequence of FitnessRecord that only
+    builds records on access; `frame` is the shared DataFrame view.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    @classmethod
+    def from_columns(cls, generation, scenario_id, fitness_score) -> "FitnessTable":
+        return cls(pd.DataFrame({
+            "generation": np.asarray(generation, dtype=np.int32),
+            "scenario_id": pd.Categorical(scenario_id),
+            "fitness_score": np.asarray(fitness_score, dtype=np.float64),
+        }))
+
+    @classmethod
+    def concat(cls, tables: List["FitnessTable"]) -> "FitnessTable":
+        """One table from consecutive chunks (e.g. ScenarioParser.iter_best_scenarios)."""
+        if len(tables) == 1:
+            return tables[0]
+        frames = [t.frame for t in tables]
+        return cls.from_columns(
+            np.concatenate([f["generation"].to_numpy() for f in frames]) if frames else [],
+            np.concatenate([f["scenario_id"].to_numpy(dtype=object) for f in frames]) if frames else [],
+            np.concatenate([f["fitness_score"].to_numpy() for f in frames]) if frames else [],
+        )
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self._materialize(self.frame.iloc[idx])
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("FitnessTable index out of range")
+        return self._materialize(self.frame.iloc[idx:idx + 1])[0]
+
+    def __iter__(self) -> Iterator["FitnessRecord"]:
+        return iter(self.to_records())
+
+    def to_records(self) -> List["FitnessRecord"]:
+        """Materialize every row as a FitnessRecord."""
+        return self._materialize(self.frame)
+
+    @staticmethod
+    def _materialize(part: pd.DataFrame) -> List["FitnessRecord"]:
+        from src.schema import FitnessRecord
+        return [
+            FitnessRecord.model_construct(generation=int(gen), scenario_id=sid, fitness_score=float(score))
+            for gen, sid, score in zip(
+                part["generation"].tolist(),
+                part["scenario_id"].tolist(),
+                part["fitness_score"].tolist(),
+            )
+        ]
+
+
+def as_fitness_frame(fitness_records) -> pd.DataFrame:
+    """Shared DataFrame view of fitness records (FitnessTable, DataFrame or list)."""
+    if isinstance(fitness_records, pd.DataFrame):
+        return fitness_records
+    frame = getattr(fitness_records, "frame", None)
+    if frame is not None:
+        return frame
+    records = list(fitness_records or [])
+    return pd.DataFrame({
+        "generation": np.array([f.generation for f in records], dtype=np.int32),
+        "scenario_id": [f.scenario_id for f in records],
+        "fitness_score": np.array([f.fitness_score for f in records], dtype=np.float64),
+    })
@@ -0,0 +1,154 @@
+from collections.abc import Sequence
+from typing import Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from src.models.experiment import HealthEvent
+
+# Canonical column -> accepted aliases in health_check_report.csv (first match wins)
+COLUMN_ALIASES = {
+    "service": ["application", "service"],
+    "url": ["url"],
+    "status_code": ["status_code"],
+    "latency_ms": ["response_time_ms", "latency_ms"],
+    "healthy": ["healthy"],
+    "error": ["error_message", "error"],
+}
+
+
+def _coalesce(raw: pd.DataFrame, aliases: List[str]) -> Optional[pd.Series]:
+    """Return the first alias column, filling its gaps from the later ones."""
+    out = None
+    for name in aliases:
+        if name not in raw.columns:
+            continue
+        out = raw[name] if out is None else out.fillna(raw[name])
+    return out
+
+
+class HealthTable(Sequence):
+    """
+    Columnar health check table (one typed array per field).
+
+    Behaves as a read-only sequence of HealthEvent so existing consumers keep
+    working, but events are only materialized when indexed or iterated.
+    Use `frame` for vectorized access.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    @classmethod
+    def from_raw(cls, raw: pd.DataFrame) -> "HealthTable":
+        """Normalize a raw health report DataFrame into canonical typed columns."""
+        n = len(raw)
+
+        ts = raw["timestamp"] if "timestamp" in raw.columns else pd.Series([None] * n, index=raw.index)
+        if not pd.api.types.is_datetime64_any_dtype(ts):
+            try:
+                ts = pd.to_datetime(ts, format="ISO8601")
+            except (ValueError, TypeError):
+                ts = ts.astype(object)
+
+        service = _coalesce(raw, COLUMN_ALIASES["service"])
+        service = service.fillna("").astype(str) if service is not None else pd.Series([""] * n, index=raw.index)
+
+        url = _coalesce(raw, COLUMN_ALIASES["url"])
+        url = url.fillna("").astype(str) if url is not None else pd.Series([""] * n, index=raw.index)
+
+        status = _coalesce(raw, COLUMN_ALIASES["status_code"])
+        status = pd.to_numeric(status, errors="coerce") if status is not None else pd.Series(np.nan, index=raw.index)
+        status = np.trunc(status.astype("float64"))
+
+        latency = _coalesce(raw, COLUMN_ALIASES["latency_ms"])
+        latency = pd.to_numeric(latency, errors="coerce") if latency is not None else pd.Series(np.nan, index=raw.index)
+
+        healthy = _coalesce(raw, COLUMN_ALIASES["healthy"])
+        if healthy is None:
+            healthy = pd.Series(True, index=raw.index)
+        else:
+            healthy = healthy.astype(object).where(healthy.notna(), True).astype(bool)
+
+        error = _coalesce(raw, COLUMN_ALIASES["error"])
+        if error is None:
+            error = pd.Series([None] * n, index=raw.index, dtype=object)
+        else:
+            text = error.astype(str)
+            error = text.astype(object).where(error.notna() & (text != ""), None)
+
+        frame = pd.DataFrame({
+            "timestamp": ts.array,
+            "service": pd.Categorical(service.to_numpy()),
+            "url": pd.Categorical(url.to_numpy()),
+            "status_code": status.astype("Int16").array,
+            "latency_ms": latency.astype("float64").to_numpy(),
+            "healthy": healthy.to_numpy(dtype=bool),
+            "error": pd.Categorical(error.to_numpy()),
+        })
+        return cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self._materialize(self.frame.iloc[idx])
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("HealthTable index out of range")
+        return self._materialize(self.frame.iloc[idx:idx + 1])[0]
+
+    def __iter__(self) -> Iterator[HealthEvent]:
+        chunk = 10_000
+        for start in range(0, len(self), chunk):
+            yield from self._materialize(self.frame.iloc[start:start + chunk])
+
+    def to_events(self) -> List[HealthEvent]:
+        """Materialize every row as a HealthEvent."""
+        return self._materialize(self.frame)
+
+    @staticmethod
+    def _materialize(part: pd.DataFrame) -> List[HealthEvent]:
+        timestamps = [
+            t.isoformat() if hasattr(t, "isoformat") else str(t)
+            for t in part["timestamp"].tolist()
+        ]
+        status = part["status_code"].astype("float64").to_numpy()
+        latency = part["latency_ms"].to_numpy()
+        errors = part["error"].astype(object).where(part["error"].notna(), None).tolist()
+        # Columns are already normalized, so skip pydantic validation
+        return [
+            HealthEvent.model_construct(
+                timestamp=ts,
+                service=svc,
+                url=url,
+                status_code=None if np.isnan(sc) else int(sc),
+                latency_ms=None if np.isnan(lat) else float(lat),
+                healthy=bool(ok),
+                error=err,
+            )
+            for ts, svc, url, sc, lat, ok, err in zip(
+                timestamps,
+                part["service"].tolist(),
+                part["url"].tolist(),
+                status,
+                latency,
+                part["healthy"].tolist(),
+                errors,
+            )
+        ]
+
+
+def as_health_frame(health_events) -> pd.DataFrame:
+    """
+    Shared DataFrame view of health events.
+
+    Accepts a HealthTable (returned as-is, zero-copy), a DataFrame, or a list of
+    HealthEvent models / dicts. Callers must treat the result as read-only.
+    """
+    if isinstance(health_events, pd.DataFrame):
+        return health_events
+    if isinstance(health_events, HealthTable):
+        return health_events.frame
+    rows = [e if isinstance(e, dict) else e.model_dump() for e in (health_events or [])]
+    return pd.DataFrame(rows)
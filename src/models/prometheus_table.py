@@ -0,0 +1,328 @@
+import json
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+NS_PER_MS = 1_000_000
+
+
+def is_sample(item: Any) -> bool:
+    return isinstance(item, dict) and "timestamp" in item and "value" in item and not isinstance(item["value"], list)
+
+
+def collect_samples(data: Any, query: Optional[str], samples: List[Dict], results: List[Tuple]):
+    """Split flat sample records from Prometheus API results (matrix / vector entries)."""
+    if isinstance(data, list):
+        if data and all(is_sample(item) for item in data):
+            samples.extend(data)
+            return
+        for item in data:
+            collect_samples(item, query, samples, results)
+    elif isinstance(data, dict):
+        query = data.get("query", query)
+        if isinstance(data.get("data"), dict):
+            collect_samples(data["data"].get("result", []), query, samples, results)
+        elif isinstance(data.get("result"), list):
+            collect_samples(data["result"], query, samples, results)
+        elif "values" in data or isinstance(data.get("value"), list):
+            results.append((query, data.get("metric") or {}, data.get("values") or [data["value"]]))
+        elif is_sample(data):
+            samples.append(data)
+
+
+def _to_ns(timestamps) -> np.ndarray:
+    """Unix seconds or ISO strings -> int64 UTC nanoseconds (NaT as int64 min)."""
+    ts = pd.Series(timestamps)
+    numeric = pd.to_numeric(ts, errors="coerce")
+    if numeric.notna().all():
+        return (numeric.to_numpy(dtype=float) * 1e9).astype(np.int64)
+    parsed = pd.to_datetime(ts, utc=True, format="ISO8601", errors="coerce")
+    return parsed.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+class PrometheusTable(Sequence):
+    """
+    Columnar store of Prometheus samples, one time series per (name, query, labels).
+
+    All samples live in three flat arrays sorted by (series, time), with
+    `offsets[s]:offsets[s + 1]` delimiting series s, so a series is a zero-copy
+    slice. Series are looked up through inverted indexes on metric name,
+    query and every label pair (`select`), never by scanning samples.
+    Window functions (`over_time`, `rate`, `increase`, `resample`) evaluate
+    every grid point of every selected series with a single vectorized
+    searchsorted over the (series, time) key.
+
+    Behaves as a read-only sequence of {"query", "timestamp", "value",
+    "labels"} dicts, like the raw JSON it replaces.
+    """
+
+    def __init__(self, series: List[Dict[str, Any]], offsets: np.ndarray, timestamps: np.ndarray,
+                 values: np.ndarray):
+        self.series_info = series
+        self.offsets = offsets
+        self.timestamps = timestamps  # int64 UTC ns, sorted within each series
+        self.values = values
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_query: Dict[str, List[int]] = {}
+        self._by_label: Dict[Tuple[str, str], List[int]] = {}
+        for sid, info in enumerate(series):
+            self._by_name.setdefault(info["name"], []).append(sid)
+            self._by_query.setdefault(info["query"], []).append(sid)
+            for pair in info["labels"].items():
+                self._by_label.setdefault(pair, []).append(sid)
+
+    @classmethod
+    def from_json(cls, data: Any) -> "PrometheusTable":
+        """
+        Build from parsed prometheus_metrics.json: flat {"query", "timestamp",
+        "value"[, "labels"]} records, a Prometheus query_range / query API
+        response, or a list of responses each tagged with its "query".
+        """
+        samples, results = [], []
+        collect_samples(data, None, samples, results)
+        builder = PrometheusTableBuilder()
+        builder.add(samples, results)
+        return builder.build()
+
+    @classmethod
+    def from_arrays(cls, series: List[Dict[str, Any]], codes: np.ndarray, timestamps: np.ndarray,
+                    values: np.ndarray) -> "PrometheusTable":
+        """Build from parallel (series id, int64 ns timestamp, value) arrays in any order."""
+        valid = timestamps != np.iinfo(np.int64).min  # NaT
+        codes, timestamps, values = codes[valid], timestamps[valid], values[valid]
+        order = np.lexsort((timestamps, codes))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(series)))])
+        return cls(series, offsets, timestamps[order], values[order])
+
+    # ----- lookup -----
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("PrometheusTable index out of range")
+        info = self.series_info[int(np.searchsorted(self.offsets, idx, side="right")) - 1]
+        return {
+            "query": info["query"],
+            "timestamp": pd.Timestamp(self.timestamps[idx], tz="UTC").isoformat(),
+            "value": float(self.values[idx]),
+            "labels": info["labels"],
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def n_series(self) -> int:
+        return len(self.series_info)
+
+    def names(self) -> List[str]:
+        return sorted(self._by_name)
+
+    def label(self, sid: int) -> str:
+        info = self.series_info[sid]
+        labels = ",".join(f'{k}="{v}"' for k, v in sorted(info["labels"].items()))
+        return f"{info['name']}{{{labels}}}" if labels else info["name"]
+
+    def select(self, name: Optional[str] = None, query: Optional[str] = None, **labels: str) -> np.ndarray:
+        """Ids of the series matching every given name / query / label value (all series if none given)."""
+        candidates = [self._by_name.get(name, []) if name is not None else None,
+                      self._by_query.get(query, []) if query is not None else None]
+        candidates += [self._by_label.get((k, str(v)), []) for k, v in labels.items()]
+        candidates = [np.asarray(c, dtype=np.int64) for c in candidates if c is not None]
+        if not candidates:
+            return np.arange(self.n_series)
+        out = candidates[0]
+        for c in candidates[1:]:
+            out = np.intersect1d(out, c, assume_unique=True)
+        return out
+
+    def series(self, sid: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(datetime64[ns] timestamps, values) of one series, as views."""
+        lo, hi = self.offsets[sid], self.offsets[sid + 1]
+        return self.timestamps[lo:hi].view("datetime64[ns]"), self.values[lo:hi]
+
+    def to_frame(self, sids: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Long (series, timestamp, value) DataFrame of the selected series (all by default)."""
+        sids = np.arange(self.n_series) if sids is None else np.asarray(sids, dtype=np.int64)
+        positions, owner = self._positions(sids)
+        return pd.DataFrame({
+            "series": pd.Categorical.from_codes(owner, [self.label(s) for s in sids]) if len(sids) else [],
+            "timestamp": self.timestamps[positions].view("datetime64[ns]"),
+            "value": self.values[positions],
+        })
+
+    def _positions(self, sids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat sample positions of `sids` (in selection order) and the selection rank owning each."""
+        lengths = self.offsets[sids + 1] - self.offsets[sids]
+        owner = np.repeat(np.arange(sids.size), lengths)
+        within = np.arange(owner.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.offsets[sids][owner] + within, owner
+
+    # ----- window functions -----
+
+    def _windows(self, sids, window: str, step: str, start=None, end=None):
+        """Grid and per (grid point, series) bounds [lo, hi) into the selected samples for (t - window, t]."""
+        sids = np.atleast_1d(np.asarray(sids, dtype=np.int64))
+        positions, owner = self._positions(sids)
+        ts_ms = self.timestamps[positions] // NS_PER_MS
+        step_ms = pd.Timedelta(step).value // NS_PER_MS
+        window_ms = pd.Timedelta(window).value // NS_PER_MS
+        if ts_ms.size == 0:
+            empty = np.zeros((0, sids.size), dtype=np.int64)
+            return sids, positions, owner, pd.DatetimeIndex([]), empty, empty
+        first = pd.Timestamp(start).value // NS_PER_MS if start is not None else ts_ms.min()
+        last = pd.Timestamp(end).value // NS_PER_MS if end is not None else ts_ms.max()
+        grid = np.arange(-(-first // step_ms) * step_ms, -(-last // step_ms) * step_ms + 1, step_ms)
+
+        origin = min(ts_ms.min(), grid[0] - window_ms) if grid.size else ts_ms.min()
+        stride = max(ts_ms.max(), grid[-1] if grid.size else 0) - origin + 1
+        if sids.size * stride >= 2 ** 62:
+            raise ValueError("Time range x series count too large for a single window query; select fewer series")
+        # (series rank, time) folded into one sorted int64 key, so one searchsorted covers all series
+        keys = owner * stride + (ts_ms - origin)
+        base = np.arange(sids.size)[None, :] * stride
+        hi = np.searchsorted(keys, base + (grid - origin)[:, None], side="right")
+        lo = np.searchsorted(keys, base + (grid - window_ms - origin)[:, None], side="right")
+        return sids, positions, owner, pd.DatetimeIndex(grid * NS_PER_MS), lo, hi
+
+    def _frame_of(self, sids, grid, matrix) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=grid, columns=[self.label(s) for s in sids])
+
+    def over_time(self, sids, func: str = "avg", window: str = "1m", step: str = "30s",
+                  start=None, end=None) -> pd.DataFrame:
+        """`<func>_over_time(series[window])` evaluated every `step`: avg, sum, count, min, max or last."""
+        sids, positions, _, grid, lo, hi = self._windows(sids, window, step, start, end)
+        values = self.values[positions]
+        count = hi - lo
+        if func in ("avg", "sum", "count"):
+            valid = ~np.isnan(values)
+            csum = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+            cvalid = np.concatenate([[0], np.cumsum(valid)])
+            n = cvalid[hi] - cvalid[lo]
+            if func == "count":
+                return self._frame_of(sids, grid, n.astype(float))
+            total = csum[hi] - csum[lo]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out = np.where(n > 0, total if func == "sum" else total / n, np.nan)
+        elif func in ("min", "max"):
+            ufunc = np.fmin if func == "min" else np.fmax
+            padded = np.append(values, np.nan)  # reduceat needs every bound < len
+            bounds = np.stack([lo.ravel(), hi.ravel()], axis=1).ravel()
+            reduced = ufunc.reduceat(padded, bounds)[::2].reshape(lo.shape) if bounds.size else lo.astype(float)
+            out = np.where(count > 0, reduced, np.nan)
+        elif func == "last":
+            out = np.where(count > 0, values[np.maximum(hi - 1, 0)] if values.size else 0.0, np.nan)
+        else:
+            raise ValueError(f"Unknown over_time function {func!r}")
+        return self._frame_of(sids, grid, out)
+
+    def resample(self, sids, step: str = "30s", how: str = "last", start=None, end=None,
+                 fill: bool = False) -> pd.DataFrame:
+        """Series aligned on a common `step` grid; each point aggregates the samples of (t - step, t]."""
+        frame = self.over_time(sids, how, window=step, step=step, start=start, end=end)
+        return frame.ffill() if fill else frame
+
+    def increase(self, sids, window: str = "5m", step: str = "30s", start=None, end=None,
+                 per_second: bool = False) -> pd.DataFrame:
+        """
+        Counter increase over each window, with counter resets handled as in
+        Prometheus (a drop means the counter restarted from zero). Unlike
+        Prometheus, the result is not extrapolated to the window edges: it is
+        the growth between the first and last sample inside the window.
+        """
+        sids, positions, owner, grid, lo, hi = self._windows(sids, window, step, start, end)
+        values = self.values[positions]
+        ts = self.timestamps[positions]
+        if values.size:
+            prev = np.concatenate([[np.nan], values[:-1]])
+            same_series = np.concatenate([[False], owner[1:] == owner[:-1]])
+            resets = same_series & (values < prev)
+            adjusted = values + np.cumsum(np.where(resets, prev, 0.0))
+        else:
+            adjusted = values
+        ok = (hi - lo) >= 2
+        first, last = np.where(ok, lo, 0), np.where(ok, hi - 1, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = np.where(ok, adjusted[last] - adjusted[first] if values.size else 0.0, np.nan)
+            if per_second:
+                out = out / np.where(ok, (ts[last] - ts[first]) / 1e9 if values.size else 1.0, np.nan)
+        return self._frame_of(sids, grid, out)
+
+    def rate(self, sids, window: str = "5m", step: str = "30s", start=None, end=None) -> pd.DataFrame:
+        """Per-second counter rate over each window (see `increase`)."""
+        return self.increase(sids, window, step, start, end, per_second=True)
+
+
+class PrometheusTableBuilder:
+    """
+    Accumulates batches of flat sample records and API result entries into
+    columnar (series id, timestamp, value) buffers. Each batch is converted
+    to arrays as it arrives, so the parsed JSON objects of only one batch are
+    alive at a time (see parsers.prometheus_parser.PrometheusParser._iter_batches).
+    """
+
+    def __init__(self):
+        self.series: List[Dict[str, Any]] = []
+        self._keys: Dict[Tuple, int] = {}
+        self._codes: List[np.ndarray] = []
+        self._stamps: List[np.ndarray] = []
+        self._values: List[np.ndarray] = []
+
+    def series_id(self, name: str, query: str, labels: Dict[str, str]) -> int:
+        key = (name, query, tuple(sorted(labels.items())))
+        if key not in self._keys:
+            self._keys[key] = len(self.series)
+            self.series.append({"name": name, "query": query, "labels": dict(key[2])})
+        return self._keys[key]
+
+    def add(self, samples: List[Dict[str, Any]], results: List[Tuple]):
+        if samples:
+            flat = pd.DataFrame.from_records(samples)
+            query = flat["query"].astype(str) if "query" in flat else pd.Series("unknown", index=flat.index)
+            # Label sets as item tuples (cheap to hash); key order is normalized once per series in series_id
+            labels = flat["labels"] if "labels" in flat else pd.Series(None, index=flat.index, dtype=object)
+            label_keys = pd.Series([tuple(d.items()) if isinstance(d, dict) else () for d in labels],
+                                   index=flat.index, dtype=object)
+            try:
+                pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([query, label_keys]))
+            except TypeError:  # unhashable (nested) label values
+                label_keys = label_keys.map(lambda items: json.dumps(items, sort_keys=True, default=str))
+                pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([query, label_keys]))
+                pairs = [(q, json.loads(lk)) for q, lk in pairs]
+            ids = np.array([self.series_id(q, q, {k: str(v) for k, v in items}) for q, items in pairs])
+            self._codes.append(ids[pair_codes])
+            self._stamps.append(_to_ns(flat["timestamp"]))
+            self._values.append(pd.to_numeric(flat["value"], errors="coerce").to_numpy(dtype=float))
+        for query, metric, points in results:
+            labels = {k: str(v) for k, v in metric.items() if k != "__name__"}
+            name = metric.get("__name__") or query or "unknown"
+            points = np.asarray(points, dtype=object).reshape(-1, 2)
+            self._codes.append(np.full(len(points), self.series_id(name, query or name, labels)))
+            try:
+                self._stamps.append((points[:, 0].astype(float) * 1e9).astype(np.int64))  # API responses: unix seconds
+            except (TypeError, ValueError):
+                self._stamps.append(_to_ns(points[:, 0]))
+            self._values.append(points[:, 1].astype(str).astype(float))
+
+    def build(self) -> PrometheusTable:
+        arrays = [np.concatenate(a) if a else np.zeros(0, dtype=d)
+                  for a, d in ((self._codes, np.int64), (self._stamps, np.int64), (self._values, float))]
+        self._codes, self._stamps, self._values = [], [], []
+        return PrometheusTable.from_arrays(self.series, *arrays)
+
+
+def as_prometheus_table(metrics) -> Optional[PrometheusTable]:
+    """PrometheusTable view of `ExperimentResult.prometheus_metrics` (raw JSON records or a table)."""
+    if metrics is None:
+        return None
+    if isinstance(metrics, PrometheusTable):
+        return metrics
+    return PrometheusTable.from_json(metrics)
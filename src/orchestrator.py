@@ -1,32 +1,87 @@
-from typing import Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional
 from .agents.fitness_agent import FitnessAgent
 from .agents.health_agent import HealthAgent
+from .agents.metrics_agent import MetricsAgent
 from .agents.slo_agent import SLOAgent
 from .agents.root_cause_agent import RootCauseAgent
+from .analytics.health_stream import analyze_health_csv, streams_health
 from .schema import ExperimentResult
 
 class Orchestrator:
     """
     Coordinates the multi-agent analysis workflow.
+
+    Agents declare a `name` and the names they `depends_on`; the orchestrator
+    runs them as a DAG on a thread pool, so independent agents execute
+    concurrently and each dependent agent starts as soon as its inputs exist.
+    When a health CSV is streamed, every agent that reads it (those with a
+    `stream_consumer`) is fed by one shared chunked pass, run as a single task.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, root_agent: Optional[RootCauseAgent] = None,
+                 stream_chunksize: Optional[int] = None, slo_definitions=None):
+        """
+        `stream_chunksize` lets Health/SLO/Metrics agents stream health CSVs that were not loaded into memory.
+        `slo_definitions` (list or YAML path) overrides per-experiment `slos.yaml` files.
+        """
         self.fitness_agent = FitnessAgent()
-        self.health_agent = HealthAgent()
-        self.slo_agent = SLOAgent()
-        self.root_agent = RootCauseAgent()
+        self.health_agent = HealthAgent(chunksize=stream_chunksize)
+        self.slo_agent = SLOAgent(chunksize=stream_chunksize, slo_definitions=slo_definitions)
+        self.metrics_agent = MetricsAgent(chunksize=stream_chunksize)
+        self.root_agent = root_agent or RootCauseAgent()
+        self.max_workers = max_workers
+        self.stream_chunksize = stream_chunksize
+        self.agents = [self.fitness_agent, self.health_agent, self.slo_agent, self.metrics_agent, self.root_agent]
+
+    @staticmethod
+    def _run_agent(agent, exp: ExperimentResult, upstream: Dict[str, Any]):
+        start = time.perf_counter()
+        kwargs = {f"{dep}_summary": result for dep, result in upstream.items()}
+        result = agent.analyze(exp, **kwargs)
+        return result, time.perf_counter() - start
+
+    def _run_stream_pass(self, agents, exp: ExperimentResult):
+        start = time.perf_counter()
+        return analyze_health_csv(exp, agents, self.stream_chunksize), time.perf_counter() - start
 
     def analyze_experiment(self, exp: ExperimentResult) -> Dict[str, Any]:
-        out = {}
-        out["fitness"] = self.fitness_agent.analyze(exp)
-        out["health"] = self.health_agent.analyze(exp)
-        out["slo"] = self.slo_agent.analyze(exp)
-        
-        # Pass health and fitness summaries to root cause agent
-        out["root_cause"] = self.root_agent.analyze(
-            exp, 
-            health_summary=out["health"], 
-            fitness_summary=out["fitness"]
-        )
-        
+        results: Dict[str, Any] = {}
+        agent_seconds: Dict[str, float] = {}
+        pending = {agent.name: agent for agent in self.agents}
+        running = {}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(self.agents)) as pool:
+            if self.stream_chunksize and streams_health(exp):
+                streamed = [a for a in self.agents if hasattr(a, "stream_consumer") and not a.depends_on]
+                if streamed:
+                    for agent in streamed:
+                        del pending[agent.name]
+                    running[pool.submit(self._run_stream_pass, streamed, exp)] = tuple(a.name for a in streamed)
+            while pending or running:
+                ready = [a for a in pending.values() if all(dep in results for dep in a.depends_on)]
+                for agent in ready:
+                    del pending[agent.name]
+                    upstream = {dep: results[dep] for dep in agent.depends_on}
+                    running[pool.submit(self._run_agent, agent, exp, upstream)] = agent.name
+                if not running:
+                    raise ValueError(f"Unresolvable agent dependencies: {sorted(pending)}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if isinstance(name, tuple):  # shared health CSV pass: each agent is charged its full time
+                        shared, seconds = future.result()
+                        results.update(shared)
+                        agent_seconds.update(dict.fromkeys(name, seconds))
+                    else:
+                        results[name], agent_seconds[name] = future.result()
+
+        # Keep registration order in the output regardless of completion order
+        out = {agent.name: results[agent.name] for agent in self.agents}
+        out["timings"] = {
+            "agents_seconds": {agent.name: agent_seconds[agent.name] for agent in self.agents},
+            "wall_seconds": time.perf_counter() - start,
+        }
         return out
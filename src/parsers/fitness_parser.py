@@ -1,34 +1,26 @@
-import json
 from pathlib import Path
-from typing import List
-from ..schema import FitnessRecord
+from ..models.fitness_table import FitnessTable
+from .json_stream import iter_document
 
 class FitnessParser:
     """
     Simple parser for JSON fitness dumps if present.
     For krkn best_scenarios.json most parsing happens in scenario_parser,
     but this keeps fitness parsing isolated if a separate file exists.
+    Large dumps are read one entry / generation at a time (see parsers.json_stream).
     """
-    def parse(self, json_path: Path) -> List[FitnessRecord]:
-        with open(json_path) as f:
-            data = json.load(f)
-        records = []
+    def parse(self, json_path: Path) -> FitnessTable:
+        generations, scenario_ids, scores = [], [], []
         # Support two shapes: list of dicts or dict by generation
-        if isinstance(data, list):
-            for item in data:
-                records.append(FitnessRecord(
-                    generation=int(item.get("generation", -1)),
-                    scenario_id=item.get("scenario_id", "unknown"),
-                    fitness_score=float(item.get("fitness_score", 1.0))
-                ))
-        elif isinstance(data, dict):
-            for key, items in data.items():
-                if key.startswith("generation_"):
-                    gen = int(key.split("_")[1])
-                    for item in items:
-                        records.append(FitnessRecord(
-                            generation=gen,
-                            scenario_id=item.get("scenario_id"),
-                            fitness_score=float(item.get("fitness_score", 1.0))
-                        ))
-        return records
+        for key, value in iter_document(json_path):
+            if key == "item":
+                generations.append(int(value.get("generation", -1)))
+                scenario_ids.append(value.get("scenario_id", "unknown"))
+                scores.append(float(value.get("fitness_score", 1.0)))
+            elif key.startswith("generation_"):
+                gen = int(key.split("_")[1])
+                for item in value:
+                    generations.append(gen)
+                    scenario_ids.append(item.get("scenario_id"))
+                    scores.append(float(item.get("fitness_score", 1.0)))
+        return FitnessTable.from_columns(generations, scenario_ids, scores)
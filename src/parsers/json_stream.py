@@ -0,0 +1,67 @@
+"""
+Incremental reading of very large JSON artifacts (best_scenarios.json, prometheus_metrics.json).
+
+With the optional `ijson` package, files of at least STREAM_THRESHOLD_BYTES
+(env KRKN_JSON_STREAM_BYTES, default 64 MB) are parsed by ijson's C backend
+one top-level entry at a time (a `generation_*` array, a sample record, one
+series of an API response), so peak memory follows the largest entry rather
+than the whole document and the first entries are available right away.
+Smaller files, or any file when ijson is missing, go through `json.load`
+with identical results.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+STREAM_THRESHOLD_BYTES = int(os.getenv("KRKN_JSON_STREAM_BYTES", str(64 * 1024 * 1024)))
+_warned = set()
+
+
+def should_stream(path: Path, threshold: Optional[int] = None) -> bool:
+    threshold = STREAM_THRESHOLD_BYTES if threshold is None else threshold
+    if Path(path).stat().st_size < threshold:
+        return False
+    if ijson is None:
+        if str(path) not in _warned:
+            _warned.add(str(path))
+            print(f"Warning: {path} is larger than {threshold} bytes; install ijson to parse it with bounded memory")
+        return False
+    return True
+
+
+def top_level_kind(f) -> str:
+    """'[' or '{' (or '' for an empty file): the first non-blank byte; rewinds `f`."""
+    while True:
+        block = f.read(4096)
+        stripped = block.lstrip()
+        if stripped or not block:
+            f.seek(0)
+            return stripped[:1].decode() if stripped else ""
+
+
+def iter_document(path: Path, threshold: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Top-level entries in file order: (key, value) for an object, ("item",
+    element) for an array. Only the current entry is held in memory when
+    streaming.
+    """
+    if not should_stream(path, threshold):
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            yield from data.items()
+        elif isinstance(data, list):
+            yield from (("item", item) for item in data)
+        return
+    with open(path, "rb") as f:
+        kind = top_level_kind(f)
+        if kind == "{":
+            yield from ijson.kvitems(f, "", use_float=True)
+        elif kind == "[":
+            yield from (("item", item) for item in ijson.items(f, "item", use_float=True))
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+from ..models.prometheus_table import PrometheusTable, PrometheusTableBuilder, collect_samples
+from .json_stream import ijson, should_stream, top_level_kind
+
+class PrometheusParser:
+    """
+    Parses prometheus_metrics.json (flat sample records or a Prometheus
+    query / query_range API dump) into an indexed PrometheusTable.
+
+    Files above the json_stream threshold are read incrementally with ijson
+    in batches of about `batch_size` points, each converted straight into
+    columnar buffers, so the parsed JSON of only one batch is alive at a time.
+    """
+    def __init__(self, batch_size: int = 100_000):
+        self.batch_size = batch_size
+
+    def parse(self, json_path: Path) -> PrometheusTable:
+        if not should_stream(json_path):
+            with open(json_path) as f:
+                return PrometheusTable.from_json(json.load(f))
+        builder = PrometheusTableBuilder()
+        for samples, results in self._iter_batches(json_path):
+            builder.add(samples, results)
+        return builder.build()
+
+    def iter_chunks(self, json_path: Path) -> Iterator[PrometheusTable]:
+        """Tables of consecutive batches, each available as soon as it is read (one table for small files)."""
+        if not should_stream(json_path):
+            yield self.parse(json_path)
+            return
+        for samples, results in self._iter_batches(json_path):
+            builder = PrometheusTableBuilder()
+            builder.add(samples, results)
+            yield builder.build()
+
+    def _iter_batches(self, json_path: Path) -> Iterator[Tuple[List[Dict[str, Any]], List[Tuple]]]:
+        """
+        (flat samples, API results) batches. A top-level array is read one
+        element at a time (a sample record, or a whole query-tagged
+        response); a single API response one result entry (series) at a
+        time.
+        """
+        samples, results, points = [], [], 0
+
+        with open(json_path, "rb") as f:
+            kind = top_level_kind(f)
+            if kind == "[":
+                entries = ((entry, None) for entry in ijson.items(f, "item", use_float=True))
+            elif kind == "{":
+                entries = self._response_entries(f)
+            else:
+                return
+            for entry, query in entries:
+                n_samples, n_results = len(samples), len(results)
+                collect_samples(entry, query, samples, results)
+                points += len(samples) - n_samples + sum(len(r[2]) for r in results[n_results:])
+                if points >= self.batch_size:
+                    yield samples, results
+                    samples, results, points = [], [], 0
+        if samples or results:
+            yield samples, results
+
+    @staticmethod
+    def _response_entries(f) -> Iterator[Tuple[Any, Any]]:
+        """
+        (result entry, query) of a single top-level API response, one series
+        at a time. Only the events before the result list are scanned for the
+        top-level "query" and the list's location, so the file is read once;
+        a "query" key written after the results is not applied to them.
+        """
+        query, prefix = None, None
+        for path, event, value in ijson.parse(f, use_float=True):
+            if path == "query" and event in ("string", "number"):
+                query = value
+            elif event == "start_array" and path in ("data.result", "result"):
+                prefix = f"{path}.item"
+                break
+        f.seek(0)
+        if prefix is None:
+            # No result list: a lone sample record or an empty response
+            yield json.load(f), None
+            return
+        for entry in ijson.items(f, prefix, use_float=True):
+            yield entry, query
@@ -1,55 +1,171 @@
-import json
+import gc
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import yaml
-from typing import List, Tuple
-from ..schema import Scenario, FitnessRecord
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..schema import Scenario
+from ..loaders.load_cache import CACHE_FORMAT_VERSION
+from ..models.fitness_table import FitnessTable
+from .json_stream import iter_document
+
+# libyaml's C loader is ~10x faster than the pure-Python one; fall back when PyYAML was built without it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml_files(paths: List[str]) -> List[Tuple[str, Any]]:
+    """(path, document) for each file; unreadable or invalid files yield an Exception as the document."""
+    out = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                out.append((path, yaml.load(fh, Loader=YAML_LOADER)))
+        except Exception as e:
+            out.append((path, e))
+    return out
+
 
 class ScenarioParser:
     """
     Parses best_scenarios.json and scenario YAML directories.
+
+    Scenario YAMLs are parsed with libyaml when available, fanned out over a
+    process pool once a tree has `parallel_threshold` or more changed files,
+    and kept in a per-tree cache keyed on each file's size and mtime
+    (`KRKN_SCENARIO_CACHE`, default `.cache/scenarios`), so re-loading a tree
+    only parses files that changed. `use_cache=False` disables the cache.
     """
 
-    def parse_best_scenarios(self, json_path: Path) -> Tuple[List[Scenario], List[FitnessRecord]]:
-        with open(json_path) as f:
-            data = json.load(f)
-        scenarios = []
-        fitness = []
-        for key, gen_items in data.items():
-            if key.startswith("generation_"):
-                gen_num = int(key.split("_")[1])
-                for item in gen_items:
-                    sid = item.get("scenario_id") or item.get("id") or f"gen{gen_num}_unknown"
-                    sc = Scenario(
-                        id=sid,
-                        generation=gen_num,
-                        scenario_type=item.get("scenario_type", "unknown"),
-                        target=item.get("config", {}).get("pod_name") or item.get("config", {}).get("label_selector"),
-                        raw_config=item.get("config", {}),
-                        source_file=str(json_path)
-                    )
-                    scenarios.append(sc)
-                    fitness.append(FitnessRecord(
-                        generation=gen_num,
-                        scenario_id=sid,
-                        fitness_score=float(item.get("fitness_score", 1.0))
-                    ))
-        return scenarios, fitness
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 256,
+                 cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.cache_dir = Path(cache_dir or os.getenv("KRKN_SCENARIO_CACHE", ".cache/scenarios")) if use_cache else None
 
-    def parse_generation_dir(self, yaml_root: Path) -> List[Scenario]:
-        scenarios = []
-        for gen_dir in yaml_root.glob("generation_*"):
-            gen_num = int(gen_dir.name.split("_")[1]) if "generation_" in gen_dir.name else -1
-            for f in gen_dir.glob("*.yaml"):
-                with open(f) as fh:
-                    doc = yaml.safe_load(fh)
-                sid = doc.get("name") or f.stem
-                sc = Scenario(
+    def parse_best_scenarios(self, json_path: Path) -> Tuple[List[Scenario], FitnessTable]:
+        scenarios, tables = [], []
+        for part, table in self.iter_best_scenarios(json_path):
+            scenarios.extend(part)
+            tables.append(table)
+        return scenarios, FitnessTable.concat(tables)
+
+    def iter_best_scenarios(self, json_path: Path, chunksize: int = 10_000
+                            ) -> Iterator[Tuple[List[Scenario], FitnessTable]]:
+        """
+        best_scenarios.json as (scenarios, fitness) chunks of up to `chunksize`
+        entries, in file order. Large files are read one generation at a time
+        (see parsers.json_stream), so the first chunk is ready before the
+        rest of the file has been read.
+        """
+        scenarios, generations, scenario_ids, scores = [], [], [], []
+        for key, gen_items in iter_document(json_path):
+            if not key.startswith("generation_"):
+                continue
+            gen_num = int(key.split("_")[1])
+            for item in gen_items:
+                sid = item.get("scenario_id") or item.get("id") or f"gen{gen_num}_unknown"
+                scenarios.append(Scenario(
                     id=sid,
                     generation=gen_num,
-                    scenario_type=doc.get("scenario_type", "pod-scenarios"),
-                    target=doc.get("label_selector") or doc.get("namespace"),
-                    raw_config=doc,
-                    source_file=str(f)
-                )
-                scenarios.append(sc)
+                    scenario_type=item.get("scenario_type", "unknown"),
+                    target=item.get("config", {}).get("pod_name") or item.get("config", {}).get("label_selector"),
+                    raw_config=item.get("config", {}),
+                    source_file=str(json_path)
+                ))
+                generations.append(gen_num)
+                scenario_ids.append(sid)
+                scores.append(float(item.get("fitness_score", 1.0)))
+                if len(scenarios) >= chunksize:
+                    yield scenarios, FitnessTable.from_columns(generations, scenario_ids, scores)
+                    scenarios, generations, scenario_ids, scores = [], [], [], []
+        if scenarios:
+            yield scenarios, FitnessTable.from_columns(generations, scenario_ids, scores)
+
+    def _cache_path(self, yaml_root: Path) -> Path:
+        key = f"v{CACHE_FORMAT_VERSION}|{yaml_root.resolve()}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.pkl"
+
+    def _read_cache(self, yaml_root: Path) -> Dict[str, Tuple[int, int, Scenario]]:
+        if self.cache_dir is None:
+            return {}
+        path = self._cache_path(yaml_root)
+        if path.exists():
+            gc_enabled = gc.isenabled()
+            gc.disable()  # unpickling tens of thousands of scenarios is dominated by GC passes otherwise
+            try:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:
+                print(f"Warning: ignoring unreadable scenario cache {path}: {e}")
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        return {}
+
+    def _write_cache(self, yaml_root: Path, entries: Dict[str, Tuple[int, int, Scenario]]):
+        if self.cache_dir is None:
+            return
+        path = self._cache_path(yaml_root)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: could not write scenario cache {path}: {e}")
+
+    def _load_documents(self, paths: List[str]) -> List[Tuple[str, Any]]:
+        workers = self.max_workers or os.cpu_count() or 1
+        if len(paths) < self.parallel_threshold or workers == 1:
+            return _load_yaml_files(paths)
+        # A few chunks per worker: enough to balance load without per-file IPC
+        size = max(1, -(-len(paths) // (workers * 4)))
+        chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [item for chunk in pool.map(_load_yaml_files, chunks) for item in chunk]
+
+    @staticmethod
+    def _to_scenario(path: str, gen_num: int, doc: Dict[str, Any]) -> Scenario:
+        return Scenario(
+            id=doc.get("name") or Path(path).stem,
+            generation=gen_num,
+            scenario_type=doc.get("scenario_type", "pod-scenarios"),
+            target=doc.get("label_selector") or doc.get("namespace"),
+            raw_config=doc,
+            source_file=path
+        )
+
+    def parse_generation_dir(self, yaml_root: Path) -> List[Scenario]:
+        files = []  # (path, generation, size, mtime_ns)
+        for gen_dir in sorted(yaml_root.glob("generation_*")):
+            gen_num = int(gen_dir.name.split("_")[1]) if "generation_" in gen_dir.name else -1
+            with os.scandir(gen_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".yaml") and entry.is_file():
+                        st = entry.stat()
+                        files.append((entry.path, gen_num, st.st_size, st.st_mtime_ns))
+        files.sort()
+
+        cached = self._read_cache(yaml_root)
+        stale = [path for path, _, size, mtime in files if cached.get(path, (None, None))[:2] != (size, mtime)]
+        parsed = dict(self._load_documents(stale)) if stale else {}
+
+        scenarios, entries = [], {}
+        for path, gen_num, size, mtime in files:
+            if path in parsed:
+                doc = parsed[path]
+                if not isinstance(doc, dict):
+                    reason = doc if isinstance(doc, Exception) else f"expected a mapping, got {type(doc).__name__}"
+                    print(f"Warning: skipping scenario file {path}: {reason}")
+                    continue
+                scenario = self._to_scenario(path, gen_num, doc)
+            else:
+                scenario = cached[path][2]
+            entries[path] = (size, mtime, scenario)
+            scenarios.append(scenario)
+        if stale or len(entries) != len(cached):
+            self._write_cache(yaml_root, entries)
         return scenarios
@@ -1,5 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+import hashlib
+import uuid
+from pathlib import Path
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from typing import List, Dict, Optional, Any, Union
+from .models.fitness_table import FitnessTable
+from .models.health_table import HealthTable
+from .models.prometheus_table import PrometheusTable
 
 class Scenario(BaseModel):
     id: str
@@ -29,13 +35,111 @@ class ExperimentMetadata(BaseModel):
     notes: Optional[str] = None
 
 class ExperimentResult(BaseModel):
+    """
+    Canonical experiment contract.
+
+    `fitness` and `health_events` are either plain lists of models or the
+    columnar FitnessTable / HealthTable produced by the parsers. Both behave as
+    sequences; use `fitness_frame()` / `health_frame()` for the shared
+    DataFrame view instead of rebuilding one from `.dict()` rows. Likewise
+    `prometheus_metrics` is raw JSON records or a PrometheusTable; use
+    `prometheus_table()` for the indexed time-series view.
+
+    Derived views are cached per field and rebuilt when the field is
+    reassigned or its length changes; after editing a list in place without
+    changing its length, call `invalidate()`.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     metadata: ExperimentMetadata
     scenarios: List[Scenario] = []
-    fitness: List[FitnessRecord] = []
-    health_events: List[HealthEvent] = []
-    prometheus_metrics: Optional[List[Dict[str, Any]]] = None
+    fitness: Union[FitnessTable, List[FitnessRecord]] = []
+    health_events: Union[HealthTable, List[HealthEvent]] = []
+    prometheus_metrics: Optional[Union[PrometheusTable, List[Dict[str, Any]]]] = None
     raw_files: Optional[Dict[str, str]] = None
 
+    _frames: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _versions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _token: str = PrivateAttr(default_factory=lambda: uuid.uuid4().hex)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.invalidate(name)
+
+    def invalidate(self, field: Optional[str] = None):
+        """Mark `field` (default: every field) as changed so derived views and the fingerprint are rebuilt."""
+        for name in [field] if field else type(self).model_fields:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False):
+        copy = super().model_copy(update=update, deep=deep)
+        # A copy is a new experiment: fresh identity and caches
+        copy._token, copy._frames, copy._versions = uuid.uuid4().hex, {}, {}
+        return copy
+
+    def _frame(self, name: str, field: str, build):
+        # Columnar tables already own a frame; lists are converted once and cached. The
+        # cache holds the records object itself, so it is compared by identity, never by id()
+        records = getattr(self, field)
+        key = (self._versions.get(field, 0), len(records))
+        cached = self._frames.get(name)
+        if cached is None or cached[0] is not records or cached[1] != key:
+            cached = (records, key, build(records))
+            self._frames[name] = cached
+        return cached[2]
+
+    def health_frame(self):
+        """Read-only DataFrame view of health events (zero-copy for HealthTable)."""
+        from .models.health_table import as_health_frame
+        return self._frame("health", "health_events", as_health_frame)
+
+    def fitness_frame(self):
+        """Read-only DataFrame view of fitness records (zero-copy for FitnessTable)."""
+        from .models.fitness_table import as_fitness_frame
+        return self._frame("fitness", "fitness", as_fitness_frame)
+
+    def prometheus_table(self):
+        """Indexed PrometheusTable of the Prometheus samples (None without metrics)."""
+        from .models.prometheus_table import as_prometheus_table
+        if self.prometheus_metrics is None:
+            return None
+        return self._frame("prometheus", "prometheus_metrics", as_prometheus_table)
+
+    def fingerprint(self) -> str:
+        """
+        Content key for memoized analytics: the source files' path/size/mtime
+        plus record counts, or, when it was not loaded from files, a random
+        per-instance token plus field versions (never reused, unlike id()).
+        """
+        from .loaders.load_cache import LoadCache
+        counts = f"{len(self.scenarios)}|{len(self.fitness)}|{len(self.health_events)}"
+        sources = [Path(p) for p in (self.raw_files or {}).values() if Path(p).exists()]
+        if not sources:
+            versions = ",".join(f"{name}={v}" for name, v in sorted(self._versions.items()))
+            return f"mem:{self._token}|{versions}|{counts}"
+        digest = hashlib.sha256(
+            f"{self.metadata.experiment_id}|{counts}|{LoadCache.fingerprint(sources)}".encode("utf-8")
+        ).hexdigest()
+        return f"files:{digest}"
+
+    def failure_matrix(self, bucket: str = "30s"):
+        """Service x time-bucket FailureMatrix of the health events, built once per bucket size."""
+        from .analytics.failure_matrix import FailureMatrix
+        return self._frame(f"failure_matrix:{bucket}", "health_events",
+                           lambda _: FailureMatrix.from_frame(self.health_frame(), bucket))
+
+class SLODefinition(BaseModel):
+    """Single service (or service + endpoint) SLO; unset targets are not checked"""
+    name: Optional[str] = None
+    service: str = Field(description="Service name, or '*' for every service")
+    url: Optional[str] = Field(None, description="Endpoint; None covers all endpoints of the service")
+    error_rate: Optional[float] = Field(None, ge=0.0, le=1.0, description="Max fraction of failed checks")
+    latency_ms: Optional[float] = Field(None, gt=0, description="Latency threshold at latency_quantile")
+    latency_quantile: float = Field(0.99, gt=0.0, lt=1.0)
+    availability: Optional[float] = Field(None, gt=0.0, lt=1.0, description="Availability target, e.g. 0.999")
+    window: str = Field("5m", description="Sliding window for burn-rate evaluation")
+
 class EvidenceItem(BaseModel):
     """Single piece of evidence with citation"""
     file: str = Field(description="Source file name")
@@ -0,0 +1,133 @@
+"""
+JSON serialization for reports, exports and LLM prompts.
+
+Uses orjson when installed (several times faster than the json module, with
+native numpy array/scalar support) and the stdlib json module otherwise.
+Both paths accept numpy and pandas values, pydantic models, datetimes, sets
+and paths, write UTF-8 rather than \\u escapes, and fall back to `str()` for
+anything else, as `json.dumps(default=str)` did. NaN and infinities become
+null on both paths, so the output is valid JSON whichever encoder runs.
+
+`dump` writes large documents to disk (optionally gzip-compressed) one
+top-level entry at a time instead of building the whole text first.
+"""
+import datetime
+import gzip
+import json
+import math
+from pathlib import Path
+from typing import Any, Union
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+GZIP_LEVEL = 6
+
+
+def to_jsonable(obj: Any) -> Any:
+    """`default` hook: JSON-ready form of values neither encoder handles natively."""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def _plain_keys(obj: Any) -> Any:
+    """Copy of `obj` with numpy dict keys (e.g. from groupby results) turned into Python scalars."""
+    if isinstance(obj, dict):
+        return {(k.item() if isinstance(k, np.generic) else k): _plain_keys(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain_keys(v) for v in obj]
+    return obj
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of `obj` with NaN / infinite floats replaced by None, as orjson writes them."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def _stdlib_default(obj: Any) -> Any:
+    return _finite(to_jsonable(obj))
+
+
+def _encode(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=to_jsonable, option=options)
+    options = dict(indent=2 if indent else None, sort_keys=sort_keys, default=_stdlib_default, ensure_ascii=False,
+                   separators=None if indent else (",", ":"), allow_nan=False)
+    try:
+        return json.dumps(obj, **options).encode()
+    except ValueError:  # a non-finite float outside any default() value: only pay for the copy when needed
+        return json.dumps(_finite(obj), **options).encode()
+
+
+def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False, compress: bool = False) -> bytes:
+    """UTF-8 JSON (2-space indented with `indent`); gzip-compressed with `compress`."""
+    try:
+        data = _encode(obj, indent, sort_keys)
+    except TypeError:
+        data = _encode(_plain_keys(obj), indent, sort_keys)  # only pay for the copy when needed
+    return gzip.compress(data, compresslevel=GZIP_LEVEL) if compress else data
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode()
+
+
+def dump(obj: Any, path: Union[str, Path], indent: bool = False, compress: bool = None) -> Path:
+    """
+    Write `obj` as JSON to `path`, gzip-compressed when `compress` (default:
+    the path ends in .gz). A dict is written one top-level value at a time,
+    so only the largest value is ever held as encoded text.
+    """
+    path = Path(path)
+    compress = path.suffix == ".gz" if compress is None else compress
+    with (gzip.open(path, "wb", compresslevel=GZIP_LEVEL) if compress else open(path, "wb")) as f:
+        if not isinstance(obj, dict) or not obj:
+            f.write(dumps_bytes(obj, indent=indent))
+            return path
+        newline = b"\n  " if indent else b""
+        f.write(b"{")
+        for i, (key, value) in enumerate(obj.items()):
+            encoded = dumps_bytes(value, indent=indent)
+            if indent:
+                encoded = encoded.replace(b"\n", newline)  # raw newlines only occur between tokens
+            f.write((b"," if i else b"") + newline + dumps_bytes(str(key)) + (b": " if indent else b":") + encoded)
+        f.write((b"\n" if indent else b"") + b"}")
+    return path
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def load(path: Union[str, Path]) -> Any:
+    """Parse a JSON file, transparently decompressing .gz files."""
+    path = Path(path)
+    data = gzip.decompress(path.read_bytes()) if path.suffix == ".gz" else path.read_bytes()
+    return loads(data)
@@ -0,0 +1,146 @@
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Default point budget per figure; keeps the browser payload bounded for any experiment size
+MAX_POINTS = 5000
+# Bucket widths the status aggregation rounds up to, so axis ticks land on readable boundaries
+NICE_STEPS = [pd.Timedelta(s).value for s in ("1s", "2s", "5s", "10s", "15s", "30s", "1min", "2min", "5min",
+                                              "10min", "15min", "30min", "1h", "2h", "6h", "12h", "1D")]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the `n_out` points Largest-Triangle-Three-Buckets keeps from a line.
+
+    The first and last points are always kept. Everything in between is split
+    into `n_out - 2` equal buckets, and each bucket keeps the point that forms
+    the largest triangle with the previously kept point and the mean of the
+    next bucket. That preserves spikes, which plain striding would drop.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < edges.size:
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def time_window(health: pd.DataFrame, time_range: Optional[Tuple] = None) -> pd.DataFrame:
+    """Health events with a valid timestamp inside `time_range` (inclusive; None = everything)."""
+    ts = pd.to_datetime(health["timestamp"])
+    mask = ts.notna()
+    if time_range is not None:
+        mask &= (ts >= pd.Timestamp(time_range[0])) & (ts <= pd.Timestamp(time_range[1]))
+    return health[mask.to_numpy()]
+
+
+def status_buckets(health: pd.DataFrame, max_points: int = MAX_POINTS) -> Tuple[pd.DataFrame, pd.Timedelta]:
+    """
+    Health events aggregated per (time bucket, service).
+
+    The bucket width is derived from the span of `health` so that at most
+    about `max_points` cells come out: zooming in to a shorter range gives
+    finer buckets. Returns the non-empty cells (bucket start, service,
+    checks, failed, failure_rate, mean/max latency) and the bucket width.
+    """
+    ts = pd.to_datetime(health["timestamp"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    codes, services = pd.factorize(health["service"], use_na_sentinel=False)
+    n_services = max(len(services), 1)
+    span = int(ts.max() - ts.min()) if ts.size else 0
+    buckets_wanted = max(max_points // n_services, 1)
+    step = span // buckets_wanted + 1
+    step = next((nice for nice in NICE_STEPS if nice >= step), -(-step // NICE_STEPS[-1]) * NICE_STEPS[-1])
+    origin = (ts.min() // step) * step if ts.size else 0
+    rows = (ts - origin) // step
+    cell = rows * n_services + codes
+    uniq, inverse = np.unique(cell, return_inverse=True)
+
+    failed = (health["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+    latency = health["latency_ms"].to_numpy(dtype=float, na_value=np.nan)
+    has_latency = ~np.isnan(latency)
+    checks = np.bincount(inverse, minlength=uniq.size)
+    n_failed = np.bincount(inverse, weights=failed, minlength=uniq.size)
+    lat_sum = np.bincount(inverse[has_latency], weights=latency[has_latency], minlength=uniq.size)
+    lat_n = np.bincount(inverse[has_latency], minlength=uniq.size)
+    lat_max = np.full(uniq.size, -np.inf)
+    np.maximum.at(lat_max, inverse[has_latency], latency[has_latency])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frame = pd.DataFrame({
+            "bucket": pd.to_datetime(origin + (uniq // n_services) * step),
+            "service": np.asarray(services, dtype=object)[uniq % n_services] if len(services) else [],
+            "checks": checks,
+            "failed": n_failed.astype(np.int64),
+            "failure_rate": n_failed / checks,
+            "latency_mean": np.where(lat_n > 0, lat_sum / lat_n, np.nan),
+            "latency_max": np.where(lat_n > 0, lat_max, np.nan),
+        })
+    return frame, pd.Timedelta(step, unit="ns")
+
+
+def latency_lines(health: pd.DataFrame, max_points: int = MAX_POINTS,
+                  max_series: int = 20) -> pd.DataFrame:
+    """
+    Per-service latency lines reduced with LTTB.
+
+    The `max_series` services with the highest peak latency are kept and
+    share the `max_points` budget evenly. Returns timestamp / service /
+    latency_ms rows, time-ordered within each service.
+    """
+    latency = health["latency_ms"].to_numpy(dtype=float, na_value=np.nan)
+    health = health[~np.isnan(latency)]
+    if len(health) == 0:
+        return pd.DataFrame(columns=["timestamp", "service", "latency_ms"])
+    peaks = health.groupby("service", observed=True)["latency_ms"].max().nlargest(max_series)
+    health = health[health["service"].isin(peaks.index).to_numpy()]
+
+    ts = pd.to_datetime(health["timestamp"]).to_numpy(dtype="datetime64[ns]")
+    codes, services = pd.factorize(health["service"], use_na_sentinel=False)
+    order = np.lexsort((ts, codes))
+    ts, codes = ts[order], codes[order]
+    values = health["latency_ms"].to_numpy(dtype=float)[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    budget = max(max_points // len(services), 3)
+
+    parts = []
+    for lo, hi in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [codes.size]])):
+        keep = lo + lttb(ts[lo:hi].astype(np.int64), values[lo:hi], budget)
+        parts.append(keep)
+    keep = np.concatenate(parts)
+    return pd.DataFrame({
+        "timestamp": ts[keep],
+        "service": np.asarray(services, dtype=object)[codes[keep]],
+        "latency_ms": values[keep],
+    })
+
+
+def fitness_envelope(fitness: pd.DataFrame, max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """
+    Per-generation min / mean / max fitness and scenario count.
+
+    With more than `max_points` generations, consecutive generations are
+    merged so that at most `max_points` rows remain (labelled by the first
+    generation of each group).
+    """
+    generation = fitness["generation"]
+    codes, generations = pd.factorize(generation, sort=True)
+    group_size = -(-len(generations) // max_points) if len(generations) > max_points else 1
+    first = np.asarray(generations)[(codes // group_size) * group_size]
+    summary = fitness["fitness_score"].groupby(first).agg(["min", "mean", "max", "count"])
+    return summary.rename_axis("generation").reset_index()
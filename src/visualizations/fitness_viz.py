@@ -1,14 +1,16 @@
 import pandas as pd
 import plotly.graph_objects as go
+from ..models.fitness_table import as_fitness_frame
+from .downsample import MAX_POINTS, fitness_envelope
 
 def fitness_evolution_chart(fitness_records):
     """
     Plot best / avg / worst fitness per generation.
     """
-    if not fitness_records:
+    if fitness_records is None or len(fitness_records) == 0:
         return None
 
-    df = pd.DataFrame([f.dict() for f in fitness_records])
+    df = as_fitness_frame(fitness_records)
     grouped = df.groupby("generation")["fitness_score"]
 
     summary = grouped.agg(["min", "mean", "max"]).reset_index()
@@ -34,3 +36,52 @@ def fitness_evolution_chart(fitness_records):
         template="plotly_white"
     )
     return fig
+
+
+def fitness_scatter_chart(fitness_records, max_points: int = MAX_POINTS):
+    """
+    Fitness of every scenario per generation as WebGL markers.
+
+    Above `max_points` scenarios the individual points are replaced by a
+    per-generation min/max envelope with the mean as a line, so the figure
+    size no longer grows with the experiment.
+    """
+    if fitness_records is None or len(fitness_records) == 0:
+        return None
+
+    df = as_fitness_frame(fitness_records)
+    fig = go.Figure()
+    if len(df) <= max_points:
+        fig.add_trace(go.Scattergl(
+            x=df["generation"], y=df["fitness_score"], mode="markers", name="Scenario",
+            marker=dict(color=df["fitness_score"], colorscale="RdYlGn_r", showscale=True,
+                        colorbar=dict(title="Fitness")),  # Red = bad, Green = good
+            customdata=df["scenario_id"].astype(str),
+            hovertemplate="Scenario %{customdata}<br>Generation %{x}<br>Fitness %{y}<extra></extra>",
+        ))
+        title = "Fitness Scores Across All Scenarios"
+    else:
+        envelope = fitness_envelope(df, max_points)
+        fig.add_trace(go.Scattergl(
+            x=envelope["generation"], y=envelope["max"], mode="lines", name="Worst (Highest)",
+            line=dict(width=0.5, color="indianred"),
+        ))
+        fig.add_trace(go.Scattergl(
+            x=envelope["generation"], y=envelope["min"], mode="lines", name="Best (Lowest)",
+            line=dict(width=0.5, color="seagreen"), fill="tonexty", fillcolor="rgba(128,128,128,0.2)",
+        ))
+        fig.add_trace(go.Scattergl(
+            x=envelope["generation"], y=envelope["mean"], mode="lines", name="Average",
+            line=dict(color="steelblue"), customdata=envelope["count"],
+            hovertemplate="Generation %{x}<br>Average %{y:.3f} over %{customdata} scenarios<extra></extra>",
+        ))
+        title = f"Fitness Range per Generation ({len(df):,} scenarios)"
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Generation",
+        yaxis_title="Fitness Score (lower = more effective chaos)",
+        hovermode="closest",
+        template="plotly_white"
+    )
+    return fig
@@ -1,34 +1,25 @@
 import plotly.graph_objects as go
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
+from ..analytics.failure_matrix import FailureMatrix
+from ..models.health_table import as_health_frame
 
-def create_failure_correlation_heatmap(health_events: List[Dict]) -> go.Figure:
+def create_failure_correlation_heatmap(health_events: Union[List[Dict], pd.DataFrame],
+                                       matrix: Optional[FailureMatrix] = None) -> go.Figure:
     """Create heatmap showing which services fail together"""
     
-    if not health_events:
+    if health_events is None or len(health_events) == 0:
         return None
     
-    df = pd.DataFrame(health_events)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['failed'] = (df['status_code'] >= 400).astype(int)
+    # rows=30s time buckets, cols=service, values=failure(0/1); reuse the experiment's cached matrix if given
+    if matrix is None:
+        matrix = FailureMatrix.from_frame(as_health_frame(health_events))
     
-    # Create time buckets
-    df['time_bucket'] = df['timestamp'].dt.floor('30s')
-    
-    # Pivot: rows=time, cols=service, values=failure(0/1)
-    pivot = df.pivot_table(
-        index='time_bucket',
-        columns='service',
-        values='failed',
-        aggfunc='max',
-        fill_value=0
-    )
-    
-    if len(pivot.columns) < 2:
+    if len(matrix.services) < 2:
         return None
     
     # Calculate correlation
-    corr_matrix = pivot.corr()
+    corr_matrix = matrix.correlation()
     
     # Create heatmap
     fig = go.Figure(data=go.Heatmap(
@@ -1,60 +1,68 @@
+import warnings
 import plotly.graph_objects as go
 import networkx as nx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 import pandas as pd
+from ..analytics.cascade_engine import CascadeEngine
+from ..analytics.failure_matrix import FailureMatrix
+from ..models.health_table import as_health_frame
 
 class ServiceDependencyGraph:
     """Build interactive network graphs from health events"""
     
-    def build_graph_from_cascades(self, health_events: List[Dict], cascades: List[Dict]) -> go.Figure:
-        """Create network graph showing service dependencies"""
-        
-        # Build directed graph
-        G = nx.DiGraph()
+    def build_dependency_graph(self, health_events: Union[List[Dict], pd.DataFrame],
+                               graph: Optional[nx.DiGraph] = None,
+                               matrix: Optional[FailureMatrix] = None) -> go.Figure:
+        """
+        Create network graph showing service dependencies.
+
+        Edges come from CascadeEngine (lagged cross-correlation and failure
+        precedence), so a -> b means b tends to fail shortly after a. Pass a
+        prebuilt `graph`, or a cached `matrix` to build one from.
+        """
         
-        # Add all services as nodes
-        services = set(e['service'] for e in health_events)
-        for service in services:
-            G.add_node(service)
+        df = as_health_frame(health_events)
         
-        # Add edges based on cascade patterns
-        edge_weights = {}
-        for cascade in cascades:
-            services_in_cascade = cascade['services']
-            # Assume first service failure triggers others
-            if len(services_in_cascade) > 1:
-                source = services_in_cascade[0]
-                for target in services_in_cascade[1:]:
-                    edge = (source, target)
-                    edge_weights[edge] = edge_weights.get(edge, 0) + 1
+        if graph is None:
+            if matrix is None:
+                matrix = FailureMatrix.from_frame(df, bucket="10s")
+            graph = CascadeEngine().graph(matrix)
         
-        for (source, target), weight in edge_weights.items():
-            G.add_edge(source, target, weight=weight)
+        # Directed, weighted graph over every service
+        G = nx.DiGraph(graph)
+        G.add_nodes_from(str(s) for s in df['service'].unique())
         
         # Calculate failure counts for node sizing
-        df = pd.DataFrame(health_events)
-        failure_counts = df[df['status_code'] >= 400].groupby('service').size().to_dict()
+        failure_counts = df[df['status_code'] >= 400].groupby('service', observed=True).size().to_dict()
         
         # Layout
         pos = nx.spring_layout(G, k=1, iterations=50)
         
-        # Create edge traces
+        # Create edge traces (width = correlation, arrow = direction)
         edge_trace = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            weight = G[edge[0]][edge[1]]['weight']
+        arrows = []
+        for source, target, data in G.edges(data=True):
+            x0, y0 = pos[source]
+            x1, y1 = pos[target]
+            weight = data.get('weight', 1.0)
             
             edge_trace.append(
                 go.Scatter(
                     x=[x0, x1, None],
                     y=[y0, y1, None],
                     mode='lines',
-                    line=dict(width=weight * 2, color='#888'),
+                    line=dict(width=1 + weight * 4, color='#888'),
                     hoverinfo='none',
                     showlegend=False
                 )
             )
+            arrows.append(dict(
+                x=x1, y=y1, ax=x0, ay=y0,
+                xref='x', yref='y', axref='x', ayref='y',
+                showarrow=True, arrowhead=3, arrowsize=1.5, arrowwidth=1, arrowcolor='#888',
+                standoff=12,
+                hovertext=f"{source} → {target}<br>corr {weight:.2f}, lag {data.get('lag_seconds', 0):.0f}s",
+            ))
         
         # Create node trace
         node_x = []
@@ -107,7 +115,18 @@ class ServiceDependencyGraph:
             xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
             yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
             plot_bgcolor='rgba(0,0,0,0)',
-            height=500
+            height=500,
+            annotations=arrows
         )
         
-        return fig
\ No newline at end of file
+        return fig
+
+    def build_graph_from_cascades(self, health_events: Union[List[Dict], pd.DataFrame],
+                                  cascades: Optional[List[Dict]] = None) -> go.Figure:
+        """
+        Deprecated alias of `build_dependency_graph`. Edges now come from
+        CascadeEngine over the health events, so `cascades` is ignored.
+        """
+        warnings.warn("build_graph_from_cascades is deprecated; use build_dependency_graph",
+                      DeprecationWarning, stacklevel=2)
+        return self.build_dependency_graph(health_events)
@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional, Tuple, Union
+import plotly.graph_objects as go
+import pandas as pd
+from ..models.health_table import as_health_frame
+from .downsample import MAX_POINTS, latency_lines, status_buckets, time_window
+
+
+def health_timeline_chart(health_events: Union[List[Dict], pd.DataFrame], time_range: Optional[Tuple] = None,
+                          max_points: int = MAX_POINTS) -> Optional[go.Figure]:
+    """
+    Service health over time as WebGL markers, at most about `max_points` of them.
+
+    When the selected `time_range` holds no more than `max_points` checks,
+    every check is drawn (green healthy / red failed, sized by latency).
+    Otherwise checks are aggregated per (time bucket, service): marker color
+    is the bucket's failure rate and size its mean latency, with the bucket
+    width picked from the range so zooming in shows finer detail.
+    """
+    health = time_window(as_health_frame(health_events), time_range)
+    if len(health) == 0:
+        return None
+
+    fig = go.Figure()
+    if len(health) <= max_points:
+        failed = (health["status_code"] >= 400).fillna(False).to_numpy(dtype=bool)
+        latency = health["latency_ms"].fillna(0)
+        size = 6 + 24 * latency / max(latency.max(), 1)
+        for label, mask, color in (("Healthy", ~failed, "green"), ("Failed", failed, "red")):
+            fig.add_trace(go.Scattergl(
+                x=health["timestamp"][mask], y=health["service"].astype(str)[mask],
+                mode="markers", name=label,
+                marker=dict(color=color, size=size[mask], opacity=0.7),
+                customdata=health[["status_code", "latency_ms"]][mask].to_numpy(),
+                hovertemplate="%{y}<br>%{x}<br>Status %{customdata[0]} | %{customdata[1]} ms<extra></extra>",
+            ))
+        title = "Service Health Over Time"
+    else:
+        cells, step = status_buckets(health, max_points)
+        latency = cells["latency_mean"].fillna(0)
+        fig.add_trace(go.Scattergl(
+            x=cells["bucket"], y=cells["service"],
+            mode="markers", name="Failure rate",
+            marker=dict(color=cells["failure_rate"], colorscale=[[0, "green"], [1, "red"]], cmin=0, cmax=1,
+                        size=6 + 24 * latency / max(latency.max(), 1), opacity=0.8,
+                        colorbar=dict(title="Failure rate")),
+            customdata=cells[["checks", "failed", "latency_mean", "latency_max"]].to_numpy(),
+            hovertemplate=("%{y}<br>%{x}<br>%{customdata[1]} / %{customdata[0]} checks failed"
+                           "<br>Latency mean %{customdata[2]:.0f} ms, max %{customdata[3]:.0f} ms<extra></extra>"),
+        ))
+        title = f"Service Health Over Time ({len(health):,} checks in {step.total_seconds():g}s buckets)"
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Time",
+        yaxis_title="Service",
+        template="plotly_white"
+    )
+    return fig
+
+
+def latency_chart(health_events: Union[List[Dict], pd.DataFrame], time_range: Optional[Tuple] = None,
+                  max_points: int = MAX_POINTS, max_series: int = 20) -> Optional[go.Figure]:
+    """Per-service latency lines (LTTB-downsampled, WebGL) for the slowest `max_series` services."""
+    health = time_window(as_health_frame(health_events), time_range)
+    lines = latency_lines(health, max_points, max_series)
+    if len(lines) == 0:
+        return None
+
+    fig = go.Figure()
+    for service, line in lines.groupby("service", sort=True):
+        fig.add_trace(go.Scattergl(x=line["timestamp"], y=line["latency_ms"], mode="lines", name=str(service)))
+    fig.update_layout(
+        title="Latency Over Time",
+        xaxis_title="Time",
+        yaxis_title="Latency (ms)",
+        template="plotly_white"
+    )
+    return fig
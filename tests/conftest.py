@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Point the default loader and RCA caches at the test's tmp_path instead of ./.cache."""
+    monkeypatch.setenv("KRKN_LOAD_CACHE", str(tmp_path / "cache" / "loader"))
+    monkeypatch.setenv("KRKN_RCA_CACHE", str(tmp_path / "cache" / "rca_cache.sqlite"))
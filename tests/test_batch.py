@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path
+from src.batch import BatchRunner
+from src.serialization import load
+
+SYNTHETIC = Path(__file__).resolve().parents[1] / "data" / "synthetic"
+
+
+def _runner(root: Path, out: Path, **kwargs) -> BatchRunner:
+    return BatchRunner(str(root), str(out), workers=1, stub_llm=True, **kwargs)
+
+
+def test_resume_skips_unchanged_experiments(tmp_path):
+    root, out = tmp_path / "runs", tmp_path / "reports"
+    for name in ("experiment_1", "experiment_2"):
+        shutil.copytree(SYNTHETIC / name, root / name)
+
+    first = _runner(root, out).run()
+    assert first["last_run"]["analyzed"] == 2 and first["last_run"]["skipped"] == 0
+    assert {e["status"] for e in first["experiments"].values()} == {"ok"}
+    report = out / "experiment_1.json"
+    written = report.stat().st_mtime_ns
+
+    second = _runner(root, out).run()
+    assert second["last_run"]["analyzed"] == 0 and second["last_run"]["skipped"] == 2
+    assert report.stat().st_mtime_ns == written
+
+    with open(root / "experiment_2" / "health_check_report.csv", "a", encoding="utf-8") as f:
+        f.write("2025-02-11T11:01:00,cart,/cart/add,500,900,error\n")
+    third = _runner(root, out).run()
+    assert third["last_run"]["analyzed"] == 1 and third["last_run"]["skipped"] == 1
+    assert load(out / "index.json")["experiments"]["experiment_2"]["fingerprint"] != \
+        first["experiments"]["experiment_2"]["fingerprint"]
+
+    forced = _runner(root, out, force=True).run()
+    assert forced["last_run"]["analyzed"] == 2 and forced["last_run"]["skipped"] == 0
+    assert not (tmp_path / "cache" / "loader").exists()  # no loader cache without cache_dir
+
+
+def test_cache_dir_holds_loader_and_rca_caches(tmp_path):
+    root, out, cache = tmp_path / "runs", tmp_path / "reports", tmp_path / "batch-cache"
+    shutil.copytree(SYNTHETIC / "experiment_1", root / "experiment_1")
+    _runner(root, out, cache_dir=str(cache)).run()
+    assert list((cache / "loader").glob("*.pkl"))
+    assert (cache / "rca_cache.sqlite").exists()
+
+    _runner(root, out, force=True, cache_dir=str(tmp_path / "unused"), use_cache=False).run()
+    assert not (tmp_path / "unused").exists()
+
+
+def test_failed_experiment_is_retried(tmp_path):
+    root, out = tmp_path / "runs", tmp_path / "reports"
+    shutil.copytree(SYNTHETIC / "experiment_1", root / "experiment_1")
+    (root / "broken").mkdir()
+    (root / "broken" / "best_scenarios.json").write_text("{not json", encoding="utf-8")
+
+    first = _runner(root, out).run()
+    assert first["experiments"]["broken"]["status"] == "error"
+    second = _runner(root, out).run()
+    assert second["last_run"]["skipped"] == 1
+    assert second["last_run"]["failed"] == 1
@@ -0,0 +1,28 @@
+from pathlib import Path
+import numpy as np
+from src.analytics.comparison import ComparisonEngine, analysis_digest, load_analyses
+
+SYNTHETIC = Path(__file__).resolve().parents[1] / "data" / "synthetic"
+
+
+def test_missing_and_empty_folders_rank_last(tmp_path):
+    (tmp_path / "empty").mkdir()
+    paths = [SYNTHETIC / "experiment_1", SYNTHETIC / "experiment_2", tmp_path / "nonexist", tmp_path / "empty"]
+    analyses = load_analyses(paths, workers=1, stub_llm=True)
+    assert "load_error" in analyses["nonexist"] and "load_error" in analyses["empty"]
+    assert "load_error" not in analyses["experiment_1"]
+
+    result = ComparisonEngine().compare(analyses)
+    assert list(result["ranks"].index[-2:]) == ["nonexist", "empty"]
+    assert result["ranks"].loc["nonexist", "overall"] > result["ranks"].loc[["experiment_1", "experiment_2"], "overall"].max()
+    assert result["metrics"].loc["empty", "slo_status"] == "load_error"
+    assert np.isnan(result["metrics"].loc["empty", "failures"])
+    assert result["baseline"] == "experiment_1"
+
+
+def test_analysis_digest_follows_content():
+    analysis = {"health": {"failure_counts": {"cart": 1}}}
+    same = {"health": {"failure_counts": {"cart": 1}}}
+    assert analysis_digest(analysis) == analysis_digest(same)
+    same["health"]["failure_counts"]["cart"] = 2
+    assert analysis_digest(analysis) != analysis_digest(same)
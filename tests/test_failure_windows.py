@@ -0,0 +1,50 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.analytics.failure_windows import failure_windows, mttr_stats
+from src.loaders.krkn_loader import KrknResultsLoader
+
+SYNTHETIC = Path(__file__).resolve().parents[1] / "data" / "synthetic"
+
+
+def _health(name: str) -> pd.DataFrame:
+    return KrknResultsLoader(str(SYNTHETIC / name), use_cache=False).load().health_frame()
+
+
+@pytest.mark.parametrize("name, expected", [
+    # cart 10:00:30 -> 10:01:10, checkout 10:00:40 -> 10:01:20
+    ("experiment_1", {"cart": 40.0, "checkout": 40.0}),
+    # catalogue 11:00:20 -> 11:00:30
+    ("experiment_2", {"catalogue": 10.0}),
+])
+def test_mttr_on_sample_csvs(name, expected):
+    stats = mttr_stats(failure_windows(_health(name)))
+    assert {svc: s["mean"] for svc, s in stats.items()} == expected
+    assert all(s["windows"] == 1 for s in stats.values())
+
+
+def test_unrecovered_failure_is_open_window():
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime(["2025-01-01T00:00:00", "2025-01-01T00:00:10", "2025-01-01T00:00:20",
+                                     "2025-01-01T00:00:30", "2025-01-01T00:00:40"]),
+        "service": ["a", "a", "a", "b", "a"],
+        "status_code": [500, 503, 200, 500, 500],
+    })
+    windows = failure_windows(df)
+    closed = windows[windows["end"].notna()]
+    assert closed[["service", "duration_seconds"]].values.tolist() == [["a", 20.0]]
+    assert sorted(windows.loc[windows["end"].isna(), "service"]) == ["a", "b"]
+    assert mttr_stats(windows) == {"a": {"windows": 1, "mean": 20.0, "median": 20.0, "p95": 20.0, "max": 20.0}}
+
+
+def test_chunked_windows_match_whole_frame():
+    df = _health("experiment_1")
+    whole = failure_windows(df)
+    parts, open_since = [], {}
+    for start in range(0, len(df), 3):
+        windows = failure_windows(df.iloc[start:start + 3], open_since)
+        is_open = windows["end"].isna().to_numpy()
+        open_since = dict(zip(windows["service"][is_open], windows["start"][is_open]))
+        parts.append(windows[~is_open])
+    chunked = pd.concat(parts, ignore_index=True).sort_values("service", ignore_index=True)
+    pd.testing.assert_frame_equal(chunked, whole.sort_values("service", ignore_index=True))
@@ -0,0 +1,25 @@
+from src.agents.fitness_agent import FitnessAgent
+from src.models.fitness_table import FitnessTable
+from src.schema import ExperimentMetadata, ExperimentResult
+
+
+def _experiment(levels):
+    generations = [g for g in range(len(levels)) for _ in range(3)]
+    scores = [levels[g] + 0.01 * (i % 3) for i, g in enumerate(generations)]
+    table = FitnessTable.from_columns(generations, [f"s{i}" for i in range(len(scores))], scores)
+    return ExperimentResult(metadata=ExperimentMetadata(experiment_id="fitness"), fitness=table)
+
+
+def test_fitness_regime_change_is_reported():
+    result = FitnessAgent().analyze(_experiment([0.8] * 6 + [0.3] * 6))
+    for metric in ("best", "avg"):
+        regimes = result["regimes"][metric]
+        assert regimes["breakpoints"] == [6]
+        assert [(r["start"], r["end"]) for r in regimes["regimes"]] == [(0, 5), (6, 11)]
+    assert abs(result["regimes"]["avg"]["regimes"][1]["mean"] - 0.31) < 1e-9
+
+
+def test_short_runs_have_a_single_regime():
+    result = FitnessAgent().analyze(_experiment([0.6, 0.4]))
+    assert result["regimes"]["avg"]["breakpoints"] == []
+    assert len(result["regimes"]["avg"]["regimes"]) == 1
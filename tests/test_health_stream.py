@@ -0,0 +1,34 @@
+from pathlib import Path
+from src.agents.root_cause_agent import RootCauseAgent
+from src.agents.stub_llm import StubLLM
+from src.loaders.krkn_loader import KrknResultsLoader
+from src.orchestrator import Orchestrator
+from src.parsers.health_parser import HealthParser
+
+EXPERIMENT_1 = Path(__file__).resolve().parents[1] / "data" / "synthetic" / "experiment_1"
+
+
+def _analyze(stream_chunksize=None):
+    exp = KrknResultsLoader(str(EXPERIMENT_1), use_cache=False, stream_health=stream_chunksize is not None).load()
+    orchestrator = Orchestrator(root_agent=RootCauseAgent(llm=StubLLM(), use_cache=False),
+                                stream_chunksize=stream_chunksize)
+    return orchestrator.analyze_experiment(exp)
+
+
+def test_streamed_health_csv_is_read_once(monkeypatch):
+    passes = []
+    iter_chunks = HealthParser.iter_chunks
+
+    def counting(self, *args, **kwargs):
+        passes.append(args)
+        return iter_chunks(self, *args, **kwargs)
+
+    monkeypatch.setattr(HealthParser, "iter_chunks", counting)
+    streamed = _analyze(stream_chunksize=2)
+    assert len(passes) == 1
+
+    in_memory = _analyze()
+    assert streamed["health"] == in_memory["health"]
+    assert streamed["metrics"] == in_memory["metrics"]
+    assert streamed["slo"]["error_rate"] == in_memory["slo"]["error_rate"]
+    assert streamed["slo"]["slo_results"]["summary"] == in_memory["slo"]["slo_results"]["summary"]
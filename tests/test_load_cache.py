@@ -0,0 +1,55 @@
+import os
+from src.loaders.load_cache import LoadCache
+
+
+def _artifacts(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"artifact_{i}.csv"
+        path.write_text("x" * 100, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _age(cache: LoadCache, artifact, kind, seconds):
+    slot = cache._slot(artifact, kind)
+    st = slot.stat()
+    os.utime(slot, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def test_least_recently_used_slot_is_evicted(tmp_path):
+    cache = LoadCache(str(tmp_path / "cache"), max_entries=2)
+    a, b, c = _artifacts(tmp_path, 3)
+    cache.get_or_parse(a, "health", [a], lambda: "a")
+    _age(cache, a, "health", 20)
+    cache.get_or_parse(b, "health", [b], lambda: "b")
+    _age(cache, b, "health", 10)
+    assert cache.get_or_parse(a, "health", [a], lambda: "reparsed") == "a"  # hit: a is now the newest
+
+    cache.get_or_parse(c, "health", [c], lambda: "c")
+    assert sorted(p.name for p in (tmp_path / "cache").glob("*.pkl")) == \
+        sorted(cache._slot(x, "health").name for x in (a, c))
+    assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 1}
+
+
+def test_byte_bound_keeps_newest_slot(tmp_path):
+    cache = LoadCache(str(tmp_path / "cache"), max_bytes=1)
+    a, b = _artifacts(tmp_path, 2)
+    cache.get_or_parse(a, "health", [a], lambda: "a")
+    cache.get_or_parse(b, "health", [b], lambda: "b")
+    assert [p.name for p in (tmp_path / "cache").glob("*.pkl")] == [cache._slot(b, "health").name]
+
+
+def test_rewrite_drops_older_format_versions(tmp_path):
+    cache = LoadCache(str(tmp_path / "cache"))
+    (a,) = _artifacts(tmp_path, 1)
+    slot = cache._slot(a, "health")
+    slot.parent.mkdir(parents=True)
+    old = slot.with_name(slot.name.split(".", 1)[0] + ".v0.pkl")
+    old.write_bytes(b"not a pickle")
+    assert cache.get_or_parse(a, "health", [a], lambda: "a") == "a"
+    assert not old.exists() and slot.exists()
+
+    a.write_text("changed", encoding="utf-8")
+    assert cache.get_or_parse(a, "health", [a], lambda: "a2") == "a2"
+    assert list((tmp_path / "cache").glob("*.pkl")) == [slot]
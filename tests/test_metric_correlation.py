@@ -0,0 +1,32 @@
+from pathlib import Path
+import pandas as pd
+from src.agents.metrics_agent import MetricsAgent
+from src.analytics.metric_correlation import correlate_metrics_with_failures
+from src.loaders.krkn_loader import KrknResultsLoader
+from src.models.prometheus_table import PrometheusTable
+
+EXPERIMENT_1 = Path(__file__).resolve().parents[1] / "data" / "synthetic" / "experiment_1"
+
+
+def test_restart_spike_at_failure_start_counts_as_during():
+    exp = KrknResultsLoader(str(EXPERIMENT_1), use_cache=False).load()
+    summary = MetricsAgent().analyze(exp)
+    top = summary["ranked"][0]
+    assert top["metric"] == "pod_restart_count"
+    assert top["mean_shift"] > 0
+    # cart fails at 10:00:30, exactly when restarts spike to 6: before = [1], during = [6, 2]
+    cart = summary["per_service"]["cart"][0]
+    assert cart["shift"] > 0
+    assert "cart" in top["services"]
+
+
+def test_shift_matches_hand_computation():
+    samples = [{"query": "m", "timestamp": f"2025-01-01T00:0{i}:00Z", "value": v}
+               for i, v in enumerate([1.0, 1.0, 5.0, 5.0, 1.0])]
+    table = PrometheusTable.from_json(samples)
+    windows = pd.DataFrame({"service": ["a"], "start": [pd.Timestamp("2025-01-01T00:02:00")],
+                            "end": [pd.Timestamp("2025-01-01T00:03:00")]})
+    result = correlate_metrics_with_failures(table, windows, lookback="5m", min_during="1m")
+    values = pd.Series([1.0, 1.0, 5.0, 5.0, 1.0])
+    expected = (5.0 - 1.0) / values.std(ddof=0)
+    assert abs(result["ranked"][0]["mean_shift"] - expected) < 1e-9
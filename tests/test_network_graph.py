@@ -0,0 +1,15 @@
+from pathlib import Path
+import pytest
+from src.loaders.krkn_loader import KrknResultsLoader
+from src.visualizations.network_graph import ServiceDependencyGraph
+
+EXPERIMENT_1 = Path(__file__).resolve().parents[1] / "data" / "synthetic" / "experiment_1"
+
+
+def test_build_graph_from_cascades_still_works():
+    events = [e.model_dump() for e in KrknResultsLoader(str(EXPERIMENT_1), use_cache=False).load().health_events]
+    cascades = [{"timestamp": "2025-02-10T10:00:30", "services": ["cart", "checkout"], "count": 2}]
+    with pytest.warns(DeprecationWarning):
+        fig = ServiceDependencyGraph().build_graph_from_cascades(events, cascades)
+    nodes = [trace for trace in fig.data if trace.mode == "markers+text"][0]
+    assert sorted(nodes.text) == ["cart", "checkout"]
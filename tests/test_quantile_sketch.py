@@ -0,0 +1,47 @@
+import numpy as np
+from src.analytics.quantile_sketch import DDSketch
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+def _nearest_rank(values: np.ndarray, q: float) -> float:
+    ordered = np.sort(values)
+    return float(ordered[min(int(ordered.size * q), ordered.size - 1)])
+
+
+def test_quantiles_within_relative_accuracy():
+    values = np.random.default_rng(7).lognormal(mean=4.0, sigma=1.5, size=50_000)
+    sketch = DDSketch(relative_accuracy=0.01)
+    sketch.add(values)
+    assert sketch.count == values.size
+    for q in QUANTILES:
+        exact = _nearest_rank(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact, q
+
+
+def test_zero_and_negative_values_use_zero_bin():
+    sketch = DDSketch()
+    sketch.add([0.0, -1.0, 0.0, 10.0, np.nan])
+    assert sketch.count == 4
+    assert sketch.quantile(0.5) == 0.0
+    assert abs(sketch.quantile(0.99) - 10.0) <= 0.1
+
+
+def test_merge_equals_sketch_of_combined_data():
+    rng = np.random.default_rng(11)
+    a, b = rng.exponential(200.0, size=20_000), rng.exponential(20.0, size=5_000) + 1000.0
+    left, right, combined = DDSketch(), DDSketch(), DDSketch()
+    left.add(a)
+    right.add(b)
+    combined.add(np.concatenate([a, b]))
+    left.merge(right)
+    assert left.to_dict() == combined.to_dict()
+    for q in QUANTILES:
+        assert left.quantile(q) == combined.quantile(q)
+
+
+def test_round_trips_through_dict():
+    sketch = DDSketch(relative_accuracy=0.02)
+    sketch.add(np.arange(1, 1001, dtype=float))
+    restored = DDSketch.from_dict(sketch.to_dict())
+    assert restored.quantiles({"p50": 0.5, "p99": 0.99}) == sketch.quantiles({"p50": 0.5, "p99": 0.99})
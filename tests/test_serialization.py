@@ -0,0 +1,38 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src import serialization
+
+DOCUMENT = {
+    "nan": float("nan"),
+    "inf": [1.5, float("inf"), -float("inf")],
+    "numpy": {"f64": np.float64("nan"), "f32": np.float32("inf"), "int": np.int64(3)},
+    "array": np.array([1.0, np.nan]),
+    "frame": pd.DataFrame({"x": [1.0, np.nan], "t": pd.to_datetime(["2025-01-01", None])}),
+    "tuple": (2.0, float("nan")),
+    "text": "ünïcode",
+}
+
+
+def _stdlib(monkeypatch, **kwargs) -> bytes:
+    monkeypatch.setattr(serialization, "orjson", None)
+    return serialization.dumps_bytes(DOCUMENT, **kwargs)
+
+
+def test_stdlib_path_writes_valid_json_for_non_finite_floats(monkeypatch):
+    data = _stdlib(monkeypatch)
+    parsed = json.loads(data, parse_constant=lambda token: pytest.fail(f"non-JSON token {token}"))
+    assert parsed["nan"] is None
+    assert parsed["inf"] == [1.5, None, None]
+    assert parsed["numpy"] == {"f64": None, "f32": None, "int": 3}
+    assert parsed["array"] == [1.0, None]
+    assert parsed["frame"][1]["x"] is None and parsed["frame"][1]["t"] is None
+    assert parsed["tuple"] == [2.0, None]
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_orjson_and_stdlib_paths_agree(monkeypatch, indent):
+    pytest.importorskip("orjson")
+    fast = serialization.dumps_bytes(DOCUMENT, indent=indent)
+    assert json.loads(_stdlib(monkeypatch, indent=indent)) == json.loads(fast)
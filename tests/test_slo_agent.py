@@ -0,0 +1,32 @@
+from pathlib import Path
+import pandas as pd
+from src.agents.slo_agent import SLOAgent
+from src.loaders.krkn_loader import KrknResultsLoader
+from src.models.health_table import HealthTable
+from src.schema import ExperimentMetadata, ExperimentResult
+
+EXPERIMENT_1 = Path(__file__).resolve().parents[1] / "data" / "synthetic" / "experiment_1"
+
+
+def _experiment(events):
+    return ExperimentResult(metadata=ExperimentMetadata(experiment_id="slo"), health_events=events)
+
+
+def test_error_responses_count_without_healthy_column():
+    # health_check_report.csv has no `healthy` column: 2 of 6 checks are 5xx
+    exp = KrknResultsLoader(str(EXPERIMENT_1), use_cache=False).load()
+    result = SLOAgent().analyze(exp)
+    assert abs(result["error_rate"] - 2 / 6) < 1e-12
+    assert result["violations"][0]["type"] == "error_rate"
+
+
+def test_error_is_status_code_or_unhealthy():
+    raw = pd.DataFrame({
+        "timestamp": [f"2025-01-01T00:00:{s:02d}" for s in (0, 10, 20, 30)],
+        "service": "a",
+        "url": "/",
+        "status_code": [200, 503, 200, 500],
+        "latency_ms": 10.0,
+        "healthy": [True, True, False, False],
+    })
+    assert SLOAgent().analyze(_experiment(HealthTable.from_raw(raw)))["error_rate"] == 0.75
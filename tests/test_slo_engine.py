@@ -0,0 +1,55 @@
+import pandas as pd
+from src.analytics.slo_engine import SLOEngine
+from src.schema import SLODefinition
+
+
+def _events() -> pd.DataFrame:
+    # Six 30s buckets with two checks each; bucket 1 has one failure, bucket 3 two
+    status = [200, 200, 200, 500, 200, 200, 503, 503, 200, 200, 200, 200]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01T10:00:00", periods=12, freq="15s"),
+        "service": "cart",
+        "url": "/cart/add",
+        "status_code": status,
+        "latency_ms": [float(10 * (i + 1)) for i in range(12)],
+        "healthy": [code < 400 for code in status],
+    })
+
+
+def test_burn_rate_matches_hand_computation():
+    engine = SLOEngine([SLODefinition(service="cart", availability=0.9, window="1m")], bucket="30s")
+    slo = engine.evaluate(_events())["slos"][0]
+    assert (slo["events"], slo["bad_events"]) == (12, 3)
+    assert slo["error_rate"] == 0.25
+    # 1m windows = 2 buckets: bad fractions 1/4, 1/4, 2/4, 2/4, 0/4 over a 0.1 budget
+    assert slo["burn_rate"]["windows"] == 5
+    assert abs(slo["burn_rate"]["max"] - 5.0) < 1e-9
+    assert slo["burn_rate"]["windows_over_budget"] == 4
+    assert slo["status"] == "violated"
+
+
+def test_unhealthy_check_counts_as_bad():
+    events = _events()
+    events.loc[0, "healthy"] = False
+    slo = SLOEngine([SLODefinition(service="cart", error_rate=0.5)]).evaluate(events)["slos"][0]
+    assert slo["bad_events"] == 4
+    assert slo["status"] == "passed"
+
+
+def test_accumulator_matches_in_memory_counts():
+    engine = SLOEngine([
+        SLODefinition(service="*", availability=0.9, window="1m"),
+        SLODefinition(service="cart", url="/cart/add", error_rate=0.1, latency_ms=100.0, latency_quantile=0.5),
+    ])
+    events = _events()
+    acc = engine.accumulator()
+    for start in range(0, len(events), 5):
+        acc.update(events.iloc[start:start + 5])
+    streamed, in_memory = acc.result(), engine.evaluate(events)
+    assert streamed["summary"] == in_memory["summary"]
+    for got, want in zip(streamed["slos"], in_memory["slos"]):
+        assert (got["events"], got["bad_events"], got["status"]) == (want["events"], want["bad_events"], want["status"])
+        assert got.get("burn_rate") == want.get("burn_rate")
+    latency = streamed["slos"][1]["latency"]
+    exact = in_memory["slos"][1]["latency"]["value"]
+    assert abs(latency["value"] - exact) <= 0.01 * exact
@@ -0,0 +1,76 @@
+import pandas as pd
+from src.analytics.anomaly_detection import AnomalyDetector
+from src.analytics.sparse_cascades import detect_sparse_cascades
+
+SERVICES = [f"svc-{i}" for i in range(8)]
+# Failure bursts that start on a 30s bucket boundary and stay inside it, so the
+# anchored sparse windows and the dense 30s buckets see the same groups
+BURSTS = {
+    "2025-01-01T10:00:00": {"svc-0": 0, "svc-1": 5, "svc-2": 12},
+    "2025-01-01T10:02:00": {"svc-3": 0, "svc-4": 20},
+    "2025-01-01T10:05:00": {"svc-5": 3},
+    "2025-01-01T10:07:30": {"svc-0": 0, "svc-1": 9, "svc-6": 29},
+    "2025-01-01T10:09:00": {"svc-1": 0, "svc-0": 4},
+}
+
+
+def _fleet() -> pd.DataFrame:
+    # Every service is checked healthy every 30s (offset 15s) plus the failed checks above
+    rows = [(ts, svc, 200) for ts in pd.date_range("2025-01-01T10:00:15", periods=24, freq="30s")
+            for svc in SERVICES]
+    for start, failures in BURSTS.items():
+        rows += [(pd.Timestamp(start) + pd.Timedelta(seconds=s), svc, 503) for svc, s in failures.items()]
+    df = pd.DataFrame(rows, columns=["timestamp", "service", "status_code"])
+    df["url"] = "/health"
+    return df.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def _groups(result):
+    return {(pd.Timestamp(c["timestamp"]), frozenset(c["services"])) for c in result["cascades"]}
+
+
+def test_sparse_matches_dense_on_small_fleet():
+    detector = AnomalyDetector()
+    df = _fleet()
+    dense = detector.detect_cascade_failures(df, method="dense")
+    sparse = detector.detect_cascade_failures(df, method="sparse")
+    assert _groups(sparse) == _groups(dense)
+    assert sparse["total_cascade_events"] == len(dense["cascades"]) == 4
+    assert sparse["failures"] == sum(len(f) for f in BURSTS.values())
+
+    expected_pairs = {}
+    for _, services in _groups(dense):
+        for a in services:
+            for b in services:
+                if a < b:
+                    expected_pairs[(a, b)] = expected_pairs.get((a, b), 0) + 1
+    assert {tuple(p["services"]): p["count"] for p in sparse["co_failures"]} == expected_pairs
+    assert sparse["co_failures"][0] == {"services": ["svc-0", "svc-1"], "count": 3}
+
+
+def test_services_listed_in_order_of_first_failure():
+    result = detect_sparse_cascades(_fleet())
+    assert result["cascades"][0]["services"] == ["svc-0", "svc-1", "svc-2"]
+    assert result["cascades"][-1]["services"] == ["svc-1", "svc-0"]
+    assert detect_sparse_cascades(_fleet(), min_services=3)["total_cascade_events"] == 2
+
+
+def _failures(seconds_by_service):
+    start = pd.Timestamp("2025-01-01T10:00:00")
+    return pd.DataFrame([(start + pd.Timedelta(seconds=s), svc, 503) for svc, s in seconds_by_service],
+                        columns=["timestamp", "service", "status_code"])
+
+
+def test_burst_across_bucket_boundary_is_one_cascade():
+    # 10:00:20 and 10:00:40 fall in different dense 30s buckets but within one anchored window
+    df = _failures([("a", 20), ("b", 40)])
+    assert AnomalyDetector().detect_cascade_failures(df.assign(url="/"), method="dense")["cascades"] == []
+    cascades = detect_sparse_cascades(df)["cascades"]
+    assert [(c["timestamp"], c["services"]) for c in cascades] == [("2025-01-01 10:00:20", ["a", "b"])]
+
+
+def test_failure_after_window_end_starts_a_new_window():
+    # c is 10s after b but 35s after the anchor a, so it is not grouped with a and b
+    result = detect_sparse_cascades(_failures([("a", 0), ("b", 25), ("c", 35), ("d", 50)]))
+    assert [c["services"] for c in result["cascades"]] == [["a", "b"], ["c", "d"]]
+    assert {tuple(p["services"]) for p in result["co_failures"]} == {("a", "b"), ("c", "d")}